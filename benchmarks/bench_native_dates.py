@@ -0,0 +1,120 @@
+"""
+Checks the native date reader against ExifTool and compares their speed.
+
+For every file, the tags read_date_tags() returns must equal ExifTool's
+values for the same tags, and the Date Taken chosen from either must be
+the same; files it leaves to ExifTool are counted, not compared. Then
+batch date extraction (no metadata index) is timed with and without the
+native reader.
+
+    python benchmarks/bench_native_dates.py                      # synthetic corpus (see bench_suite.py)
+    python benchmarks/bench_native_dates.py --media ~/Pictures --output native.json
+
+Exits with status 1 if any file disagrees. The synthetic clips come from
+OpenCV without a creation time, so they all go to ExifTool; use --media
+with camera and phone files for coverage that means something.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import make_corpus, _files, _rate
+from src.core.exif_handler import ExifHandler, DATES
+from src.core.native_dates import read_date_tags
+from src.core.paths import get_exiftool_path, normalize_path
+
+
+def compare(handler, files, batch):
+    """
+    Returns (per-extension counts, mismatches).
+    """
+    counts = {}
+    mismatches = []
+    for i in range(0, len(files), batch):
+        chunk = files[i:i + batch]
+        with handler.pool.session(timeout=handler._batch_timeout(len(chunk))) as et:
+            metadata_list, _ = handler._read_metadata(et, chunk, DATES)
+        by_key = {normalize_path(meta["SourceFile"]): meta for meta in metadata_list}
+        for path in chunk:
+            extension = os.path.splitext(path)[1].lower()
+            count = counts.setdefault(extension, {"files": 0, "native": 0, "mismatches": 0})
+            count["files"] += 1
+            native = read_date_tags(path)
+            if native is None:
+                continue
+            count["native"] += 1
+            reference = by_key.get(normalize_path(path), {})
+            differing = {tag: (value, reference.get(tag)) for tag, value in native.items()
+                         if tag != "SourceFile" and reference.get(tag) != value}
+            chosen = handler.extract_date_info(native), handler.extract_date_info(reference)
+            if differing or chosen[0] != chosen[1]:
+                count["mismatches"] += 1
+                mismatches.append({"path": path, "tags": differing,
+                                   "native": chosen[0], "exiftool": chosen[1]})
+    return counts, mismatches
+
+
+def time_dates(exiftool, files, native):
+    handler = ExifHandler(exiftool, native_dates=native)
+    try:
+        start = time.perf_counter()
+        for _ in handler.iter_batch_date_info(files):
+            pass
+        return time.perf_counter() - start
+    finally:
+        handler.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", help="Check the files in this folder instead of a synthetic corpus")
+    parser.add_argument("--files", type=int, default=2000, help="Synthetic corpus size (default 2000)")
+    parser.add_argument("--batch", type=int, default=200, help="Files per ExifTool run (default 200)")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "exifeditor-bench"),
+                        help="Where corpora are built and kept (shared with bench_suite.py)")
+    parser.add_argument("--exiftool", help="ExifTool executable (default: as the application finds it)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    exiftool = args.exiftool or get_exiftool_path()
+    if not exiftool:
+        parser.error("ExifTool not found. Install it or pass --exiftool.")
+
+    if args.media:
+        files = _files(args.media)
+    else:
+        corpus, _ = make_corpus(os.path.join(args.corpus_dir, f"n{args.files}"), args.files)
+        files = _files(corpus)
+
+    handler = ExifHandler(exiftool)
+    try:
+        counts, mismatches = compare(handler, files, args.batch)
+    finally:
+        handler.close()
+
+    # Both runs read warm files: the comparison above touched them all.
+    timings = {}
+    for name, native in (("exiftool", False), ("native", True)):
+        seconds = time_dates(exiftool, files, native)
+        timings[name] = {"seconds": round(seconds, 3), "files_per_s": _rate(len(files), seconds)}
+        print(f"  {name}: {timings[name]}", file=sys.stderr)
+
+    report = {"source": args.media or "synthetic", "files": len(files), "by_extension": counts,
+              "dates": timings, "mismatches": mismatches}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
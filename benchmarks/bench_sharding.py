@@ -0,0 +1,109 @@
+"""
+Scaling of sharded ExifTool batches with the number of processes.
+
+Reads the dates of a synthetic corpus (see bench_suite.py) and writes
+dates to copies of a sample, once per process count, and reports files/s
+and speed-up over one process as JSON. With photo-sized files the
+speed-up should stay close to linear up to the core count.
+
+    python benchmarks/bench_sharding.py                       # 10k files, 1..cores processes
+    python benchmarks/bench_sharding.py --files 100000 --processes 1,2,4,8 --output scaling.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import make_corpus, _files, _sample, _rate
+from src.core.exif_handler import ExifHandler
+from src.core.paths import get_exiftool_path
+
+
+def _process_counts(text):
+    if text:
+        return [int(n) for n in text.split(",")]
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def measure_reads(exiftool, files, processes):
+    handler = ExifHandler(exiftool, processes=processes)
+    try:
+        start = time.perf_counter()
+        for _ in handler.iter_batch_date_info(files):
+            pass
+        return time.perf_counter() - start
+    finally:
+        handler.close()
+
+
+def measure_writes(exiftool, files, processes):
+    with tempfile.TemporaryDirectory() as tmp:
+        copies = []
+        for i, path in enumerate(files):
+            copy = os.path.join(tmp, f"{i:06d}_{os.path.basename(path)}")
+            shutil.copyfile(path, copy)
+            copies.append(copy)
+
+        handler = ExifHandler(exiftool, processes=processes)
+        try:
+            start = time.perf_counter()
+            handler.update_dates({path: "2022:03:04 05:06:07" for path in copies})
+            return time.perf_counter() - start
+        finally:
+            handler.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=10000, help="Corpus size for reads (default 10000)")
+    parser.add_argument("--write-sample", type=int, default=2000, help="Files written per run (default 2000)")
+    parser.add_argument("--processes", help="Comma-separated process counts (default 1, 2, 4, ... cores)")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "exifeditor-bench"),
+                        help="Where corpora are built and kept (shared with bench_suite.py)")
+    parser.add_argument("--exiftool", help="ExifTool executable (default: as the application finds it)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    exiftool = args.exiftool or get_exiftool_path()
+    if not exiftool:
+        parser.error("ExifTool not found. Install it or pass --exiftool.")
+
+    corpus, kinds = make_corpus(os.path.join(args.corpus_dir, f"n{args.files}"), args.files)
+    files = _files(corpus)
+    sample = _sample(files, args.write_sample)
+
+    report = {"cpus": os.cpu_count(), "files": len(files), "kinds": kinds, "write_sample": len(sample),
+              "runs": []}
+    base = {}
+    for processes in _process_counts(args.processes):
+        run = {"processes": processes}
+        for name, measure, count in (("read", measure_reads, len(files)),
+                                     ("write", measure_writes, len(sample))):
+            seconds = measure(exiftool, files if name == "read" else sample, processes)
+            base.setdefault(name, seconds)
+            run[name] = {"seconds": round(seconds, 3), "files_per_s": _rate(count, seconds),
+                         "speedup": round(base[name] / seconds, 2)}
+        print(f"  {run}", file=sys.stderr)
+        report["runs"].append(run)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+End-to-end benchmark suite: folder load, thumbnails and metadata I/O.
+
+Builds a synthetic corpus per size N (JPEGs of several resolutions with
+EXIF, PNGs, and short MP4/MOV clips), then runs each stage in its own
+subprocess so peak RSS belongs to that stage alone:
+
+    scan        recursive discovery (iter_media_files)
+    thumbnails  per-file thumbnail latency, by file kind, over a sample
+    read        single-file ExifTool reads (what the metadata panel does)
+    dates       batch date extraction, without and with the metadata index
+    write       batch date writes (update_dates) on copies of a sample
+    load        MainWindow.load_files offscreen, until dates are shown
+
+    python benchmarks/bench_suite.py --sizes 100,10000 --output base.json
+    python benchmarks/bench_suite.py --stages scan,dates --corpus-dir D:/bench
+
+Corpora are kept in --corpus-dir and reused by later runs. Files of the
+same kind are hard links to a few templates where the filesystem allows,
+so 100k files don't take 100k files' worth of disk; repeat reads are
+therefore served from the page cache. The report is JSON with the commit,
+platform and one record per (N, stage), so runs can be diffed.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_thumbnail_tiers import peak_rss_mb
+
+STAGES = ("scan", "thumbnails", "read", "dates", "write", "load")
+
+# Corpus mix: kind -> (share of files, (width, height)).
+CORPUS_MIX = {
+    "jpg_small": (0.40, (640, 480)),
+    "jpg_medium": (0.30, (2000, 1500)),
+    "jpg_large": (0.10, (4000, 3000)),
+    "png": (0.10, (1024, 768)),
+    "mp4": (0.05, (320, 240)),
+    "mov": (0.05, (320, 240)),
+}
+TEMPLATES_PER_KIND = 4
+FILES_PER_FOLDER = 500
+# Bump when the generated files change, so old corpora are rebuilt.
+CORPUS_VERSION = 1
+
+
+def _noise_image(width, height, seed):
+    from PIL import Image
+
+    # Plain colours compress and decode unrealistically fast.
+    noise = Image.effect_noise((width, height), 48 + seed * 8)
+    return Image.merge("RGB", (noise, noise.rotate(180), noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+
+def _write_template(kind, size, path, seed):
+    from PIL import Image
+
+    width, height = size
+    if kind.startswith("jpg"):
+        exif = Image.Exif()
+        exif[0x010F] = "BenchCam"  # Make
+        exif[0x0110] = f"Model {seed}"  # Model
+        exif[0x0112] = 6 if seed % 2 else 1  # Orientation
+        exif_ifd = exif.get_ifd(0x8769)
+        exif_ifd[0x9003] = f"2021:0{seed + 1}:1{seed} 12:34:56"  # DateTimeOriginal
+        exif_ifd[0x8827] = 100 * (seed + 1)  # ISO
+        _noise_image(width, height, seed).save(path, "JPEG", quality=90, exif=exif)
+        return True
+    if kind == "png":
+        _noise_image(width, height, seed).save(path, "PNG")
+        return True
+
+    import cv2
+    import numpy as np
+
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+    writer = cv2.VideoWriter(path, fourcc, 10, (width, height))
+    if not writer.isOpened():
+        return False
+    frame = np.asarray(_noise_image(width, height, seed))[:, :, ::-1]
+    for i in range(20):
+        writer.write(np.roll(frame, i * 4, axis=1))
+    writer.release()
+    return os.path.getsize(path) > 0
+
+
+def _place(template, path):
+    try:
+        os.link(template, path)
+    except OSError:
+        shutil.copyfile(template, path)
+
+
+def make_corpus(directory, count):
+    """
+    Fills `directory`/media with `count` media files in year/month
+    folders, reusing an earlier build. Returns (media folder, {kind: files}).
+    """
+    media = os.path.join(directory, "media")
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") == CORPUS_VERSION and manifest.get("count") == count:
+            return media, manifest["kinds"]
+    shutil.rmtree(directory, ignore_errors=True)
+
+    template_dir = os.path.join(directory, "templates")
+    os.makedirs(template_dir)
+    templates = {}
+    for kind, (_, size) in CORPUS_MIX.items():
+        extension = "." + kind.split("_")[0]
+        paths = []
+        for seed in range(TEMPLATES_PER_KIND):
+            path = os.path.join(template_dir, f"{kind}_{seed}{extension}")
+            try:
+                if _write_template(kind, size, path, seed):
+                    paths.append(path)
+            except ImportError as e:
+                print(f"Skipping {kind} files: {e}", file=sys.stderr)
+                break
+        if paths:
+            templates[kind] = paths
+
+    # Interleave kinds so every folder (and every sample) gets the mix.
+    shares = {kind: CORPUS_MIX[kind][0] for kind in templates}
+    total_share = sum(shares.values())
+    plan = []
+    for kind, share in shares.items():
+        n = round(count * share / total_share)
+        plan.extend((i / max(n, 1), kind) for i in range(n))
+    plan.sort()
+    plan = [kind for _, kind in plan][:count]
+    while len(plan) < count:
+        plan.append("jpg_small")
+
+    kinds = {}
+    for i, kind in enumerate(plan):
+        folder = os.path.join(media, f"{2000 + i // (FILES_PER_FOLDER * 12)}",
+                              f"{(i // FILES_PER_FOLDER) % 12 + 1:02d}")
+        os.makedirs(folder, exist_ok=True)
+        template = templates[kind][i % len(templates[kind])]
+        _place(template, os.path.join(folder, f"{kind}_{i:06d}{os.path.splitext(template)[1]}"))
+        kinds[kind] = kinds.get(kind, 0) + 1
+
+    with open(manifest_path, "w") as f:
+        json.dump({"version": CORPUS_VERSION, "count": count, "kinds": kinds}, f)
+    return media, kinds
+
+
+def _files(corpus):
+    from src.core.scanner import iter_media_files
+
+    return sorted(path for path, _ in iter_media_files(corpus))
+
+
+def _sample(files, size):
+    if len(files) <= size:
+        return list(files)
+    step = len(files) / size
+    return [files[int(i * step)] for i in range(size)]
+
+
+def _kind(path):
+    return os.path.basename(path).rsplit("_", 1)[0]
+
+
+def _stats(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.mean(values), 2),
+        "median_ms": round(statistics.median(values), 2),
+        "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 2),
+        "max_ms": round(values[-1], 2),
+    }
+
+
+def _rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+def _handler(args, index=None):
+    from src.core.exif_handler import ExifHandler
+
+    return ExifHandler(args.exiftool, index=index)
+
+
+def stage_scan(args):
+    start = time.perf_counter()
+    files = _files(args.corpus)
+    seconds = time.perf_counter() - start
+    return {"files": len(files), "seconds": round(seconds, 3), "files_per_s": _rate(len(files), seconds)}
+
+
+def stage_thumbnails(args):
+    from src.core.thumbnail_generator import generate_thumbnail
+
+    latencies = {}
+    failed = 0
+    for path in _sample(_files(args.corpus), args.thumb_sample):
+        start = time.perf_counter()
+        img = generate_thumbnail(path, (args.size, args.size))
+        elapsed = (time.perf_counter() - start) * 1000
+        if img is None:
+            failed += 1
+            continue
+        latencies.setdefault(_kind(path), []).append(elapsed)
+
+    everything = [v for values in latencies.values() for v in values]
+    return {"all": _stats(everything), "by_kind": {k: _stats(v) for k, v in sorted(latencies.items())},
+            "failed": failed}
+
+
+def stage_read(args):
+    handler = _handler(args)
+    try:
+        latencies = []
+        for path in _sample(_files(args.corpus), args.read_sample):
+            start = time.perf_counter()
+            handler.get_metadata(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        handler.close()
+    return _stats(latencies)
+
+
+def stage_dates(args):
+    from src.core.metadata_index import MetadataIndex
+
+    files = _files(args.corpus)
+    result = {"files": len(files)}
+    with tempfile.TemporaryDirectory() as tmp:
+        index = MetadataIndex(os.path.join(tmp, "metadata.db"))
+        runs = [("exiftool", None), ("index_cold", index), ("index_warm", index)]
+        for name, run_index in runs:
+            handler = _handler(args, run_index)
+            try:
+                start = time.perf_counter()
+                found = handler.get_batch_date_info(files)
+                seconds = time.perf_counter() - start
+            finally:
+                handler.close()
+            result[name] = {"seconds": round(seconds, 3), "files_per_s": _rate(len(files), seconds),
+                            "with_date": len(found)}
+        index.close()
+    return result
+
+
+def stage_write(args):
+    sample = _sample(_files(args.corpus), args.write_sample)
+    with tempfile.TemporaryDirectory() as tmp:
+        copies = []
+        for i, path in enumerate(sample):
+            copy = os.path.join(tmp, f"{i:06d}_{os.path.basename(path)}")
+            shutil.copyfile(path, copy)
+            copies.append(copy)
+        assignments = {path: f"2022:03:{i % 28 + 1:02d} 10:{i % 60:02d}:00" for i, path in enumerate(copies)}
+
+        handler = _handler(args)
+        try:
+            start = time.perf_counter()
+            results = handler.update_dates(assignments)
+            seconds = time.perf_counter() - start
+        finally:
+            handler.close()
+    errors = sum(1 for error in results.values() if error)
+    return {"files": len(copies), "seconds": round(seconds, 3), "files_per_s": _rate(len(copies), seconds),
+            "errors": errors}
+
+
+def stage_load(args):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication([])
+    from src.gui.main_window import MainWindow
+
+    window = MainWindow(args.exiftool)
+    window.resize(1280, 800)
+    window.show()
+    app.processEvents()
+
+    marks = {}
+    start = time.perf_counter()
+    window.load_files(args.corpus)
+    deadline = start + args.timeout
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        now = time.perf_counter() - start
+        if "first_row_s" not in marks and window.model.rowCount():
+            marks["first_row_s"] = now
+        if "scanned_s" not in marks and window.scan_worker is None:
+            marks["scanned_s"] = now
+        if ("first_thumbnail_s" not in marks and window.model.rowCount()
+                and window.model.has_thumbnail(0)):
+            marks["first_thumbnail_s"] = now
+        if "scanned_s" in marks and not window.date_workers:
+            marks["dates_s"] = now
+            break
+        time.sleep(0.002)
+    else:
+        marks["timed_out"] = True
+
+    result = {key: round(value, 3) if isinstance(value, float) else value for key, value in marks.items()}
+    result["rows"] = window.model.rowCount()
+    window.close()
+    return result
+
+
+def run_stage(args):
+    result = globals()[f"stage_{args.stage}"](args)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _exiftool_version(exiftool):
+    try:
+        return subprocess.run([exiftool, "-ver"], capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,10000,100000", help="Corpus sizes N (default 100,10000,100000)")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {', '.join(STAGES)}")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "exifeditor-bench"),
+                        help="Where corpora are built and kept")
+    parser.add_argument("--exiftool", help="ExifTool executable (default: as the application finds it)")
+    parser.add_argument("--size", type=int, default=200, help="Thumbnail bounding box (default 200)")
+    parser.add_argument("--thumb-sample", type=int, default=500, help="Files thumbnailed per N (default 500)")
+    parser.add_argument("--read-sample", type=int, default=200, help="Files read one by one per N (default 200)")
+    parser.add_argument("--write-sample", type=int, default=500, help="Files written per N (default 500)")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-stage time limit in seconds")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.exiftool:
+        from src.core.paths import get_exiftool_path
+
+        args.exiftool = get_exiftool_path()
+
+    if args.stage:
+        print(json.dumps(run_stage(args)))
+        return
+
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+    if not args.exiftool and set(stages) & {"read", "dates", "write", "load"}:
+        parser.error("ExifTool not found. Install it or pass --exiftool.")
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "exiftool": _exiftool_version(args.exiftool) if args.exiftool else None,
+        "results": [],
+    }
+    for n in (int(size) for size in args.sizes.split(",")):
+        start = time.perf_counter()
+        corpus, kinds = make_corpus(os.path.join(args.corpus_dir, f"n{n}"), n)
+        print(f"Corpus N={n} ready in {time.perf_counter() - start:.1f}s: {kinds}", file=sys.stderr)
+
+        for stage in stages:
+            # Each stage gets fresh caches and settings, so nothing is warm
+            # from an earlier stage or from the user's own use of the app.
+            with tempfile.TemporaryDirectory() as home:
+                env = dict(os.environ, XDG_CACHE_HOME=home, XDG_CONFIG_HOME=home, LOCALAPPDATA=home)
+                command = [sys.executable, os.path.abspath(__file__), "--stage", stage, "--corpus", corpus,
+                           "--size", str(args.size), "--thumb-sample", str(args.thumb_sample),
+                           "--read-sample", str(args.read_sample), "--write-sample", str(args.write_sample),
+                           "--timeout", str(args.timeout)]
+                if args.exiftool:
+                    command += ["--exiftool", args.exiftool]
+                record = {"n": n, "stage": stage}
+                try:
+                    out = subprocess.run(command, env=env, capture_output=True, text=True,
+                                         timeout=args.timeout + 60)
+                    if out.returncode:
+                        lines = out.stderr.strip().splitlines()
+                        record["error"] = lines[-1] if lines else f"exit {out.returncode}"
+                    else:
+                        record.update(json.loads(out.stdout.strip().splitlines()[-1]))
+                except subprocess.TimeoutExpired:
+                    record["error"] = "timed out"
+            print(f"  {stage}: {record}", file=sys.stderr)
+            report["results"].append(record)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Cost of ExifTool reads per tag profile, for JPEG and MP4/MOV files.
+
+Reads a sample of each file type in batches, once per profile ('dates',
+'panel', 'full'; see TAG_PROFILES in src/core/exif_handler.py), with the
+same arguments the application uses, and reports per file the JSON bytes
+ExifTool sends back and the time per read, plus what each narrow profile
+saves over 'full'. Every batch is read once to warm the page cache and
+then timed --repeat times; the best run counts.
+
+    python benchmarks/bench_tag_profiles.py                    # synthetic corpus (see bench_suite.py)
+    python benchmarks/bench_tag_profiles.py --media ~/Pictures --sample 500 --output profiles.json
+
+The synthetic JPEGs carry a bare EXIF block and the clips come from
+OpenCV, so camera files (maker notes, previews, XMP) save more; use
+--media for numbers that mean something.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_suite import make_corpus, _files, _sample
+from src.core.exif_handler import ExifHandler, TAG_PROFILES, FULL, read_args
+from src.core.paths import get_exiftool_path
+
+# Reported file types -> extensions.
+FILE_TYPES = {
+    "jpeg": (".jpg", ".jpeg"),
+    "mp4": (".mp4", ".mov"),
+}
+
+
+def measure(et, profile, files, batch, repeat):
+    """
+    Returns (JSON bytes, best seconds) for reading `files` with `profile`.
+    """
+    batches = [files[i:i + batch] for i in range(0, len(files), batch)]
+    total_bytes = 0
+    best = None
+    for attempt in range(repeat + 1):
+        start = time.perf_counter()
+        size = 0
+        for chunk in batches:
+            for args, paths in read_args(profile, chunk):
+                if paths:
+                    size += len(et.execute("-j", "-charset", "filename=utf8", *args, *paths).encode("utf-8"))
+        seconds = time.perf_counter() - start
+        total_bytes = size
+        # The first pass only warms the page cache.
+        if attempt and (best is None or seconds < best):
+            best = seconds
+    return total_bytes, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", help="Measure the files in this folder instead of a synthetic corpus")
+    parser.add_argument("--files", type=int, default=2000, help="Synthetic corpus size (default 2000)")
+    parser.add_argument("--sample", type=int, default=200, help="Files per type (default 200)")
+    parser.add_argument("--batch", type=int, default=200, help="Files per ExifTool run (default 200, like the date loader)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per profile (default 3)")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "exifeditor-bench"),
+                        help="Where corpora are built and kept (shared with bench_suite.py)")
+    parser.add_argument("--exiftool", help="ExifTool executable (default: as the application finds it)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    exiftool = args.exiftool or get_exiftool_path()
+    if not exiftool:
+        parser.error("ExifTool not found. Install it or pass --exiftool.")
+
+    if args.media:
+        files = _files(args.media)
+    else:
+        corpus, _ = make_corpus(os.path.join(args.corpus_dir, f"n{args.files}"), args.files)
+        files = _files(corpus)
+
+    report = {"source": args.media or "synthetic", "batch": args.batch, "types": {}}
+    handler = ExifHandler(exiftool, pool_size=1)
+    try:
+        with handler.pool.session(timeout=600) as et:
+            for name, extensions in FILE_TYPES.items():
+                sample = _sample([p for p in files if p.lower().endswith(extensions)], args.sample)
+                if not sample:
+                    print(f"No {name} files, skipping", file=sys.stderr)
+                    continue
+                profiles = {}
+                for profile in TAG_PROFILES:
+                    size, seconds = measure(et, profile, sample, args.batch, args.repeat)
+                    profiles[profile] = {
+                        "bytes_per_file": round(size / len(sample)),
+                        "ms_per_file": round(seconds * 1000 / len(sample), 3),
+                    }
+                full = profiles[FULL]
+                for profile, result in profiles.items():
+                    if profile != FULL:
+                        result["bytes_saved_per_file"] = full["bytes_per_file"] - result["bytes_per_file"]
+                        result["ms_saved_per_file"] = round(full["ms_per_file"] - result["ms_per_file"], 3)
+                print(f"  {name}: {profiles}", file=sys.stderr)
+                report["types"][name] = {"files": len(sample), "profiles": profiles}
+    finally:
+        handler.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
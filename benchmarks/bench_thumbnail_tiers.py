@@ -0,0 +1,144 @@
+"""
+Per-tier JPEG thumbnail benchmark.
+
+Runs each decode tier (embedded preview, draft, full) in its own
+subprocess so peak RSS is attributable to that tier alone, and reports
+per-image latency plus peak RSS as JSON.
+
+    python benchmarks/bench_thumbnail_tiers.py                 # synthetic corpus
+    python benchmarks/bench_thumbnail_tiers.py --corpus D:/DCIM --output tiers.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.thumbnail_generator import generate_image_thumbnail, IMAGE_TIERS
+
+
+def peak_rss_mb():
+    # VmHWM is per address space; ru_maxrss survives fork+exec on Linux and
+    # would report the parent's peak (e.g. from building the corpus).
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+def make_corpus(directory, megapixels=(24, 48), count=3):
+    """
+    Writes noisy JPEGs (plain colours decode unrealistically fast), with and
+    without an MPF preview and with a rotated orientation tag.
+    """
+    from PIL import Image
+
+    files = []
+    for mp in megapixels:
+        width = int((mp * 1_000_000 * 3 / 2) ** 0.5)
+        height = width * 2 // 3
+        noise = Image.effect_noise((width, height), 64)
+        img = Image.merge("RGB", (noise, noise.rotate(180), noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotated 90 CW
+        preview = img.resize((1920, 1280), Image.Resampling.BILINEAR)
+
+        for i in range(count):
+            plain = os.path.join(directory, f"plain_{mp}mp_{i}.jpg")
+            img.save(plain, "JPEG", quality=90, exif=exif)
+            files.append(plain)
+
+            mpo = os.path.join(directory, f"mpf_{mp}mp_{i}.jpg")
+            img.save(mpo, "MPO", quality=90, exif=exif, save_all=True, append_images=[preview])
+            files.append(mpo)
+    return files
+
+
+def run_tier(tier, files, size):
+    """
+    Worker mode: thumbnail every file with a single tier.
+    """
+    latencies = {}
+    skipped = []
+    for path in files:
+        start = time.perf_counter()
+        img, used = generate_image_thumbnail(path, size, tiers=(tier,))
+        elapsed = (time.perf_counter() - start) * 1000
+        if img is None:
+            skipped.append(os.path.basename(path))
+        else:
+            latencies[os.path.basename(path)] = round(elapsed, 2)
+    return {"tier": tier, "latency_ms": latencies, "skipped": skipped, "peak_rss_mb": peak_rss_mb()}
+
+
+def summarize(result):
+    values = list(result["latency_ms"].values())
+    if values:
+        result["summary"] = {
+            "images": len(values),
+            "mean_ms": round(statistics.mean(values), 2),
+            "median_ms": round(statistics.median(values), 2),
+            "max_ms": round(max(values), 2),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Folder of JPEGs to use instead of a synthetic corpus")
+    parser.add_argument("--size", type=int, default=200, help="Thumbnail bounding box (default 200)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--worker", choices=IMAGE_TIERS, help=argparse.SUPPRESS)
+    parser.add_argument("files", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    size = (args.size, args.size)
+
+    if args.worker:
+        print(json.dumps(run_tier(args.worker, args.files, size)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            files = [os.path.join(args.corpus, f) for f in sorted(os.listdir(args.corpus))
+                     if f.lower().endswith((".jpg", ".jpeg"))]
+        else:
+            files = make_corpus(tmp)
+
+        report = {"size": args.size, "files": len(files), "tiers": []}
+        for tier in IMAGE_TIERS:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", tier, "--size", str(args.size)] + files,
+                check=True, capture_output=True, text=True).stdout
+            report["tiers"].append(summarize(json.loads(out)))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
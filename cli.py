@@ -0,0 +1,342 @@
+"""
+Headless command line interface for bulk metadata work (no Qt required).
+
+    python cli.py scan PATH...
+    python cli.py dates PATH...
+    python cli.py set-date "2024:05:01 12:00:00" PATH...
+    python cli.py shift --by=-1:00 [--offset +09:00] [--dry-run] PATH...
+    python cli.py thumbs [--size 200] [--out DIR] PATH...
+    python cli.py history
+    python cli.py rollback BATCH
+
+Directories are processed recursively. Results are streamed to stdout as
+JSON Lines, one object per file; diagnostics go to stderr. The exit status
+is 1 if any file failed. `--trace FILE` records timings (ExifTool round
+trips, thumbnail decodes, ...) and writes them as a Chrome trace.
+"""
+import sys
+import os
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+
+# Add src to python path to handle imports correctly if run from root
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.paths import get_exiftool_path, normalize_path
+from src.core.scanner import iter_media_files
+from src.core.dates import parse_exif_datetime, parse_shift, parse_offset, format_offset
+from src.core.instrumentation import instruments
+
+# Files handed to ExifTool per round; bounds memory on very large trees.
+BATCH_SIZE = 2000
+
+
+class JsonLinesWriter:
+    """
+    Writes one JSON object per line and keeps count of failures.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.errors = 0
+
+    def emit(self, **record):
+        if record.get("error"):
+            self.errors += 1
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _scan(args):
+    return iter_media_files(args.paths, recursive=not args.no_recursive)
+
+
+def _exif_handler(args):
+    from src.core.exif_handler import ExifHandler
+    from src.core.metadata_index import MetadataIndex
+    from src.core.write_journal import WriteJournal
+
+    exiftool_path = args.exiftool or get_exiftool_path()
+    if not exiftool_path:
+        raise SystemExit("ExifTool not found. Install it or pass --exiftool.")
+    index = None if args.no_index else MetadataIndex()
+    journal = None if args.no_journal else WriteJournal()
+    return ExifHandler(exiftool_path, pool_size=args.jobs, index=index, journal=journal, processes=args.jobs,
+                       quicktime_utc=args.quicktime_utc)
+
+
+def _close_handler(handler):
+    handler.close()
+    if handler.index:
+        handler.index.close()
+    if handler.journal:
+        handler.journal.close()
+
+
+def cmd_scan(args, out):
+    for path, st in _scan(args):
+        out.emit(path=path, size=st.st_size, mtime=st.st_mtime)
+
+
+def cmd_dates(args, out):
+    handler = _exif_handler(args)
+    try:
+        for batch in _batched(_scan(args), BATCH_SIZE):
+            paths = {normalize_path(path): path for path, _ in batch}
+            for dates, errors in handler.iter_batch_date_info(list(paths.values())):
+                for key, date in dates.items():
+                    out.emit(path=paths.get(key, key), date=date)
+                for key, message in errors.items():
+                    out.emit(path=paths.get(key, key), error=message)
+            out.flush()
+    finally:
+        _close_handler(handler)
+
+
+def cmd_set_date(args, out):
+    if parse_exif_datetime(args.date) is None:
+        raise SystemExit(f"Invalid date '{args.date}', expected 'YYYY:MM:DD HH:MM:SS'.")
+
+    handler = _exif_handler(args)
+    try:
+        for batch in _batched(_scan(args), BATCH_SIZE):
+            results = handler.update_dates({path: args.date for path, _ in batch})
+            for path, error in results.items():
+                if error:
+                    out.emit(path=path, error=error)
+                else:
+                    out.emit(path=path, date=args.date)
+            out.flush()
+    finally:
+        _close_handler(handler)
+
+
+def cmd_shift(args, out):
+    delta = parse_shift(args.by)
+    if delta is None:
+        raise SystemExit(f"Invalid shift '{args.by}', expected '[+-][D ]H:M[:S]'.")
+    offset = None
+    if args.offset:
+        tz = parse_offset(args.offset)
+        if tz is None:
+            raise SystemExit(f"Invalid offset '{args.offset}', expected '+HH:MM'.")
+        offset = format_offset(tz)
+
+    handler = _exif_handler(args)
+    try:
+        for batch in _batched(_scan(args), BATCH_SIZE):
+            paths = [path for path, _ in batch]
+            if args.dry_run:
+                for path, tag, old, new in handler.preview_shift(paths, delta, offset):
+                    out.emit(path=path, tag=tag, old=old, new=new)
+            else:
+                for path, error in handler.shift_dates(paths, delta, offset).items():
+                    if error:
+                        out.emit(path=path, error=error)
+                    else:
+                        out.emit(path=path, shifted=True)
+            out.flush()
+    finally:
+        _close_handler(handler)
+
+
+def cmd_history(args, out):
+    from src.core.write_journal import WriteJournal
+
+    journal = WriteJournal()
+    try:
+        for batch in journal.batches(limit=args.limit):
+            out.emit(**batch)
+    finally:
+        journal.close()
+
+
+def cmd_rollback(args, out):
+    args.no_journal = False
+    handler = _exif_handler(args)
+    try:
+        if handler.journal.batch(args.batch) is None:
+            raise SystemExit(f"No write batch {args.batch} in the journal.")
+        for path, error in handler.rollback(args.batch).items():
+            if error:
+                out.emit(path=path, error=error)
+            else:
+                out.emit(path=path, restored=True)
+    finally:
+        _close_handler(handler)
+
+
+def _thumbnail_task(path, size):
+    # Runs in a worker process; imported here so other commands skip cv2.
+    # Also returns how the image was made and how long that took, for --trace.
+    from src.core.thumbnail_generator import thumbnail_with_tier, encode_thumbnail
+    start = time.perf_counter()
+    try:
+        img, tier = thumbnail_with_tier(path, size)
+        if img is None:
+            return path, None, "Could not generate thumbnail", None, 0.0
+        return path, encode_thumbnail(img), None, tier, time.perf_counter() - start
+    except Exception as e:
+        return path, None, str(e), None, 0.0
+
+
+def _thumbnail_file(out_dir, path, data):
+    name = hashlib.blake2b(normalize_path(path).encode("utf-8"), digest_size=16).hexdigest()
+    ext = ".png" if data.startswith(b"\x89PNG") else ".jpg"
+    return os.path.join(out_dir, name + ext)
+
+
+def _bounded_map(executor, fn, items, window):
+    """
+    executor.map without materialising `items`; at most `window` tasks are
+    in flight. Results come back in completion order.
+    """
+    pending = set()
+    for item in items:
+        pending.add(executor.submit(fn, *item))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in as_completed(pending):
+        yield future.result()
+
+
+def cmd_thumbs(args, out):
+    size = (args.size, args.size)
+    cache = None
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    else:
+        from src.core.thumbnail_cache import ThumbnailCache
+        cache = ThumbnailCache()
+
+    stats = {}
+
+    def todo():
+        for path, st in _scan(args):
+            if cache and not args.force and cache.get(path, size, stat=st):
+                out.emit(path=path, cached=True)
+                continue
+            stats[path] = st
+            yield path, size
+
+    jobs = args.jobs or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for path, data, error, tier, seconds in _bounded_map(executor, _thumbnail_task, todo(), jobs * 4):
+                st = stats.pop(path)
+                if tier:
+                    instruments.add_time(f"thumbnail.decode.{tier}", seconds)
+                if error:
+                    out.emit(path=path, error=error)
+                elif cache:
+                    cache.put(path, size, data, stat=st)
+                    out.emit(path=path, bytes=len(data))
+                else:
+                    target = _thumbnail_file(args.out, path, data)
+                    with open(target, "wb") as f:
+                        f.write(data)
+                    out.emit(path=path, thumbnail=target)
+    finally:
+        if cache:
+            cache.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless EXIF Editor.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--no-recursive", action="store_true", help="do not descend into sub-folders")
+    common.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    common.add_argument("--exiftool", help="path to the ExifTool executable")
+    common.add_argument("--no-index", action="store_true", help="bypass the persistent metadata index")
+    common.add_argument("--no-journal", action="store_true", help="do not journal original values before writing")
+    common.add_argument("--quicktime-utc", action="store_true",
+                        help="QuickTime dates are UTC: report them with 'Z' and write given local times as UTC")
+    common.add_argument("--trace", metavar="FILE", help="write timings and counters to FILE as a Chrome trace")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("scan", parents=[common], help="list supported files")
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("dates", parents=[common], help="print 'Date Taken'")
+    p.set_defaults(func=cmd_dates)
+
+    p = sub.add_parser("set-date", parents=[common], help="set 'Date Taken'")
+    p.add_argument("date", help="'YYYY:MM:DD HH:MM:SS'")
+    p.set_defaults(func=cmd_set_date)
+
+    p = sub.add_parser("shift", parents=[common], help="shift all date/time tags")
+    p.add_argument("--by", required=True, help="'[+-][D ]H:M[:S]'; use --by=-1:00 for negative shifts")
+    p.add_argument("--offset", help="also set OffsetTime* to this timezone, e.g. +09:00")
+    p.add_argument("--dry-run", action="store_true", help="print the changes without writing")
+    p.set_defaults(func=cmd_shift)
+
+    p = sub.add_parser("thumbs", parents=[common], help="generate thumbnails")
+    p.add_argument("--size", type=int, default=200, help="bounding box in pixels (default 200)")
+    p.add_argument("--out", help="write files here instead of the application's thumbnail cache")
+    p.add_argument("--force", action="store_true", help="regenerate cached thumbnails")
+    p.set_defaults(func=cmd_thumbs)
+
+    for p in sub.choices.values():
+        p.add_argument("paths", nargs="+", help="files and/or directories")
+
+    # Journal commands work on recorded batches, not on paths.
+    p = sub.add_parser("history", help="list journaled write batches, newest first")
+    p.add_argument("--limit", type=int, default=20, help="number of batches (default 20)")
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser("rollback", parents=[common], help="restore the values a write batch replaced")
+    p.add_argument("batch", type=int, help="batch id, as listed by 'history'")
+    p.set_defaults(func=cmd_rollback)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    trace = getattr(args, "trace", None)
+    if trace:
+        instruments.enable(trace=True)
+
+    # Core modules print diagnostics; keep stdout for the JSON Lines.
+    out = JsonLinesWriter(sys.stdout)
+    sys.stdout = sys.stderr
+    try:
+        args.func(args, out)
+        out.flush()
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Reader went away (e.g. `| head`); nothing more to say.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.stream.fileno())
+        return 1
+    finally:
+        sys.stdout = out.stream
+        if trace:
+            instruments.export(trace)
+            print(f"Trace written to {trace}", file=sys.stderr)
+
+    if out.errors:
+        print(f"{out.errors} file(s) failed.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,33 +2,12 @@
 import sys
 import os
 from PyQt6.QtWidgets import QApplication, QMessageBox
-import shutil
 
 # Add src to python path to handle imports correctly if run from root
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.gui.main_window import MainWindow
-
-def get_exiftool_path():
-    # 1. Check if exiftool is in the system PATH
-    img_ext = shutil.which("exiftool")
-    if img_ext:
-        return img_ext
-    
-    # 2. Check local 'libs' or 'core' or current dir
-    #    (Common pattern: rename 'exiftool(-k).exe' to 'exiftool.exe')
-    potential_paths = [
-        "exiftool.exe",
-        "src/core/exiftool.exe",
-        "src/libs/exiftool.exe",
-        "libs/exiftool.exe"
-    ]
-    
-    for p in potential_paths:
-        if os.path.exists(p):
-            return os.path.abspath(p)
-            
-    return None
+from src.core.paths import get_exiftool_path
 
 def main():
     app = QApplication(sys.argv)
@@ -46,19 +25,19 @@ def main():
         font-family: 'Segoe UI', sans-serif;
         font-size: 14px;
     }
-    QListWidget {
+    QListView {
         background-color: #181825;
         border: 1px solid #313244;
         border-radius: 8px;
         padding: 10px;
     }
-    QListWidget::item {
+    QListView::item {
         background-color: #1e1e2e;
         border-radius: 6px;
         padding: 5px;
         margin: 5px;
     }
-    QListWidget::item:selected {
+    QListView::item:selected {
         background-color: #45475a;
         border: 1px solid #89b4fa;
     }
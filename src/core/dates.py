@@ -0,0 +1,182 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+# ExifTool date/time values: "YYYY:MM:DD HH:MM:SS[.fff][+HH:MM|Z]",
+# date-only "YYYY:MM:DD" or time-only "HH:MM:SS[+HH:MM]" (IPTC).
+_DATETIME_RE = re.compile(
+    r"^(?P<date>\d{4}:\d{2}:\d{2})?"
+    r"(?:\s*(?P<time>\d{2}:\d{2}:\d{2})(?P<frac>\.\d+)?)?"
+    r"(?P<tz>Z|[+-]\d{2}:?\d{2})?\s*$")
+
+
+class ExifDateTime:
+    """
+    A parsed ExifTool date value that remembers its textual shape
+    (date/time parts, sub-seconds, offset), so it can be written back the
+    way it came in.
+    """
+
+    __slots__ = ("value", "has_date", "has_time", "frac", "tz")
+
+    def __init__(self, value, has_date, has_time, frac="", tz=""):
+        self.value = value
+        self.has_date = has_date
+        self.has_time = has_time
+        self.frac = frac
+        self.tz = tz
+
+    def shifted(self, delta):
+        """
+        Applies `delta` the way ExifTool's `-TAG+=` does: date-only values
+        take just the day part, time-only values wrap around midnight.
+        """
+        if self.has_date and not self.has_time:
+            sign = -1 if delta < timedelta(0) else 1
+            delta = timedelta(days=sign * abs(delta).days)
+        return ExifDateTime(self.value + delta, self.has_date, self.has_time, self.frac, self.tz)
+
+    def format(self):
+        parts = []
+        if self.has_date:
+            parts.append(self.value.strftime("%Y:%m:%d"))
+        if self.has_time:
+            parts.append(self.value.strftime("%H:%M:%S") + self.frac)
+        return " ".join(parts) + self.tz
+
+
+def parse_exif_datetime(value):
+    """
+    Parses an ExifTool date/time string. Returns ExifDateTime or None.
+    All-zero placeholders ("0000:00:00 00:00:00") are treated as missing.
+    """
+    if not isinstance(value, str):
+        return None
+    match = _DATETIME_RE.match(value.strip())
+    if not match or not (match.group("date") or match.group("time")):
+        return None
+
+    date = match.group("date") or "1970:01:01"
+    time = match.group("time") or "00:00:00"
+    try:
+        parsed = datetime.strptime(f"{date} {time}", "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
+    return ExifDateTime(parsed, bool(match.group("date")), bool(match.group("time")),
+                        match.group("frac") or "", match.group("tz") or "")
+
+
+class DateTaken:
+    """
+    A file's Date Taken, parsed once: `timestamp` (POSIX seconds) orders
+    files, `local` (naive wall-clock datetime) groups and searches them,
+    `text` displays it.
+    """
+
+    __slots__ = ("timestamp", "local", "text")
+
+    def __init__(self, timestamp, local, text):
+        self.timestamp = timestamp
+        self.local = local
+        self.text = text
+
+
+def parse_date_taken(value):
+    """
+    Parses a Date Taken string into a DateTaken, or None.
+
+    A value with an offset is placed exactly and keeps the wall-clock time
+    it was taken at; a UTC value ('Z', e.g. QuickTime) is shown in this
+    machine's zone; a value without a zone is taken as local time here,
+    like most camera clocks.
+    """
+    parsed = parse_exif_datetime(value)
+    if parsed is None or not parsed.has_date:
+        return None
+
+    local = parsed.value
+    tz = parse_offset(parsed.tz) if parsed.tz else None
+    try:
+        if tz is None:
+            timestamp = local.timestamp()
+        else:
+            aware = local.replace(tzinfo=tz)
+            timestamp = aware.timestamp()
+            if parsed.tz == "Z":
+                local = aware.astimezone().replace(tzinfo=None)
+    except (OverflowError, OSError, ValueError):
+        # Out of the platform's range (e.g. year 1 on Windows).
+        timestamp = (local - datetime(1970, 1, 1)).total_seconds()
+
+    text = local.strftime("%Y-%m-%d %H:%M:%S" if parsed.has_time else "%Y-%m-%d")
+    if tz is not None and parsed.tz != "Z":
+        text += f" {format_offset(tz)}"
+    return DateTaken(timestamp, local, text)
+
+
+def parse_offset(text):
+    """
+    Parses '+09:00', '-0530' or 'Z' into a timezone, or None.
+    """
+    match = re.fullmatch(r"\s*(Z|([+-])(\d{2}):?(\d{2}))\s*", text or "")
+    if not match:
+        return None
+    if match.group(1) == "Z":
+        return timezone.utc
+    minutes = int(match.group(3)) * 60 + int(match.group(4))
+    if minutes > 14 * 60:
+        return None
+    sign = -1 if match.group(2) == "-" else 1
+    return timezone(timedelta(minutes=sign * minutes))
+
+
+def to_utc(value):
+    """
+    Converts a date/time value for a tag stored in UTC (QuickTime): one
+    with an offset by that offset, one without as local time here. Other
+    values are returned unchanged.
+    """
+    parsed = parse_exif_datetime(value)
+    if parsed is None or not parsed.has_date or not parsed.has_time:
+        return value
+    tz = parse_offset(parsed.tz) if parsed.tz else None
+    try:
+        aware = parsed.value.replace(tzinfo=tz) if tz else parsed.value.astimezone()
+        utc = aware.astimezone(timezone.utc).replace(tzinfo=None)
+    except (OverflowError, OSError, ValueError):
+        return value
+    return ExifDateTime(utc, True, True, parsed.frac).format()
+
+
+def format_offset(tz):
+    """
+    Formats a fixed-offset timezone the way EXIF OffsetTime tags store it.
+    """
+    minutes = int(tz.utcoffset(None).total_seconds() // 60)
+    sign = "-" if minutes < 0 else "+"
+    minutes = abs(minutes)
+    return f"{sign}{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_shift(delta):
+    """
+    Returns (operator, shift) for ExifTool, e.g. ('+=', '0:0:1 2:30:0').
+    """
+    op = "-=" if delta < timedelta(0) else "+="
+    delta = abs(delta)
+    hours, rest = divmod(delta.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return op, f"0:0:{delta.days} {hours}:{minutes}:{seconds}"
+
+
+def parse_shift(text):
+    """
+    Parses a shift such as '+1:30', '-2 03:00:00' or '+0 0:0:45'
+    ([sign][days ]hours:minutes[:seconds]) into a timedelta, or None.
+    """
+    match = re.fullmatch(r"\s*([+-]?)(?:(\d+)\s+)?(\d+):(\d+)(?::(\d+))?\s*", text or "")
+    if not match:
+        return None
+    sign, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(days=int(days or 0), hours=int(hours), minutes=int(minutes),
+                      seconds=int(seconds or 0))
+    return -delta if sign == "-" else delta
@@ -1,23 +1,176 @@
 
 import os
-import exiftool
+import json
+import base64
+import tempfile
 from datetime import datetime
+from functools import partial
+
+from exiftool.exceptions import ExifToolExecuteError
+
+from src.core.exiftool_pool import ExifToolPool
+from src.core.sharded_executor import ShardedExecutor, plan_chunks, plan_processes, file_sizes
+from src.core.paths import normalize_path
+from src.core.dates import parse_exif_datetime, parse_offset, format_offset, format_shift, to_utc
+from src.core.search_index import TEXT_FIELDS, NUMERIC_FIELDS
+from src.core.native_dates import read_date_tags
+from src.core.instrumentation import instruments
+
+# Date/time tags moved by a time shift, across the metadata families
+# cameras and phones write.
+SHIFT_TAGS = [
+    'EXIF:DateTimeOriginal',
+    'EXIF:CreateDate',
+    'EXIF:ModifyDate',
+    'QuickTime:CreateDate',
+    'QuickTime:ModifyDate',
+    'QuickTime:MediaCreateDate',
+    'QuickTime:MediaModifyDate',
+    'QuickTime:TrackCreateDate',
+    'QuickTime:TrackModifyDate',
+    'XMP:DateTimeOriginal',
+    'XMP:DateCreated',
+    'XMP:CreateDate',
+    'XMP:ModifyDate',
+    'IPTC:DateCreated',
+    'IPTC:TimeCreated',
+]
+
+OFFSET_TAGS = [
+    'EXIF:OffsetTime',
+    'EXIF:OffsetTimeOriginal',
+    'EXIF:OffsetTimeDigitized',
+]
+
+# Offset tags giving the zone of a date tag's local time, in order.
+DATE_OFFSET_TAGS = {
+    'EXIF:DateTimeOriginal': ['EXIF:OffsetTimeOriginal', 'EXIF:OffsetTime'],
+}
+
+# Tag names (in any group) whose original values are journaled before a
+# write, i.e. everything update_dates and shift_dates may touch.
+JOURNAL_TAGS = sorted({tag.split(':')[-1] for tag in SHIFT_TAGS + OFFSET_TAGS})
+
+# Embedded images usable as a video thumbnail, by tag name in any group,
+# in order of preference.
+PREVIEW_TAGS = ['CoverArt', 'PreviewImage', 'ThumbnailImage']
+
+# Candidate 'Date Taken' tags, in order of preference.
+DATE_TAGS = [
+    'EXIF:DateTimeOriginal',
+    'QuickTime:CreateDate',
+    'QuickTime:MediaCreateDate',
+    'XMP:DateCreated',
+    'IPTC:DateCreated',
+    'File:FileModifyDate',
+]
+
+# Tags the metadata panel shows, by tag name in any group.
+PANEL_TAGS = ['Make', 'Model', 'LensID', 'LensModel', 'ISO', 'FNumber', 'ExposureTime',
+              'FocalLength', 'ImageWidth', 'ImageHeight', 'GPSPosition', 'MIMEType']
+
+# Tag profiles: names of what a read asks ExifTool for, so it can skip
+# maker notes, binary blobs and composites nobody looks at. 'dates' is
+# what extract_date_info needs; 'panel' is everything the GUI shows,
+# searches, sorts or shifts; 'full' (None) is every tag.
+DATES, PANEL, FULL = 'dates', 'panel', 'full'
+_DATE_NAMES = {tag.split(':')[-1] for tag in DATE_TAGS + OFFSET_TAGS}
+TAG_PROFILES = {
+    DATES: sorted(_DATE_NAMES),
+    PANEL: sorted(_DATE_NAMES
+                  | {tag.split(':')[-1] for tag in SHIFT_TAGS}
+                  | set(PANEL_TAGS) | set(PREVIEW_TAGS)
+                  | {tag for tags in TEXT_FIELDS.values() for tag in tags}
+                  | {tag for tags in NUMERIC_FIELDS.values() for tag in tags}
+                  | {'FileType', 'GPSLatitude', 'GPSLongitude'}),
+    FULL: None,
+}
+
+# Files whose dates -fast2 cannot miss: it skips maker notes (never a
+# date source) but also stops QuickTime parsing at the media data, which
+# many cameras write before the 'moov' atom holding the dates, and PNG
+# parsing at the image data.
+FAST2_EXTENSIONS = ('.jpg', '.jpeg')
+
+
+def read_args(profile, filepaths):
+    """
+    Splits a read of `filepaths` with tag `profile` into ExifTool runs.
+    Returns a list of (args, paths); each run is `-j *args *paths`.
+
+    Narrow profiles add `-fast`, which only skips scanning to the end of
+    a JPEG for trailers; dates of JPEG files are read with `-fast2`.
+    """
+    tags = TAG_PROFILES[profile]
+    if tags is None:
+        return [([], list(filepaths))]
+    args = [f"-{tag}" for tag in tags]
+    if profile != DATES:
+        return [(["-fast", *args], list(filepaths))]
+    fast2 = [p for p in filepaths if p.lower().endswith(FAST2_EXTENSIONS)]
+    other = [p for p in filepaths if not p.lower().endswith(FAST2_EXTENSIONS)]
+    return [(["-fast2", *args], fast2), (["-fast", *args], other)]
+
 
 class ExifHandler:
-    def __init__(self, exiftool_path=None):
+    def __init__(self, exiftool_path=None, pool_size=None, index=None, journal=None, processes=None,
+                 native_dates=True, quicktime_utc=False):
         self.exiftool_path = exiftool_path
+        self.pool = ExifToolPool(exiftool_path, size=pool_size)
+        # Optional MetadataIndex; when set, unchanged files skip ExifTool.
+        self.index = index
+        # Optional WriteJournal; when set, writes can be rolled back.
+        self.journal = journal
+        # ExifTool processes a large batch is sharded over; None picks as
+        # many as the core count and file sizes warrant.
+        self.processes = processes
+        # Read the 'dates' profile of plain JPEG/MP4/MOV files without
+        # ExifTool (see native_dates).
+        self.native_dates = native_dates
+        # Like ExifTool's QuickTimeUTC option: QuickTime dates are UTC (as
+        # the spec and Apple devices have it), not the camera's local time.
+        self.quicktime_utc = quicktime_utc
 
-    def get_metadata(self, filepath):
+    def close(self):
+        """
+        Shuts down the pooled ExifTool processes.
+        """
+        self.pool.close()
+
+    def _batch_timeout(self, count):
+        # Large folders legitimately take a while; scale the watchdog.
+        return self.pool.timeout + 0.5 * count
+
+    def get_metadata(self, filepath, use_index=True, profile=FULL):
         """
         Reads metadata from the given file using ExifTool.
-        Returns a dictionary of tags.
+        Returns a dictionary of the tags in `profile` (see TAG_PROFILES).
+
+        With use_index=False the index is bypassed (but still updated).
         """
-        try:
-            with exiftool.ExifToolHelper(executable=self.exiftool_path) as et:
-                metadata = et.get_metadata(filepath)[0]
+        if self.index and use_index:
+            cached = self.index.get(filepath, profile)
+            instruments.count("metadata_index.hit" if cached is not None else "metadata_index.miss")
+            if cached is not None:
+                return cached
+
+        if profile == DATES and self.native_dates:
+            metadata = read_date_tags(filepath)
+            if metadata is not None:
+                self._index_metadata([(filepath, metadata)], profile)
                 return metadata
+
+        try:
+            with self.pool.session() as et:
+                metadata_list, errors = self._read_metadata(et, [filepath], profile)
+            if not metadata_list:
+                raise ValueError(next(iter(errors.values()), "No metadata returned"))
+            metadata = metadata_list[0]
+            self._index_metadata([(filepath, metadata)], profile)
+            return metadata
         except Exception as e:
             print(f"Error reading metadata for {filepath}: {e}")
+            instruments.count("exif.read_errors")
             return None
 
     def get_date_info(self, filepath):
@@ -25,77 +178,560 @@ class ExifHandler:
         Extracts the most relevant 'Date Taken' AND its source tag.
         Returns (date_str, source_tag) or (None, None).
         """
-        meta = self.get_metadata(filepath)
+        meta = self.get_metadata(filepath, profile=DATES)
         if not meta:
             return None, None
         
-        return self._extract_date_from_meta(meta)
+        return self.extract_date_info(meta)
 
-    def get_batch_date_info(self, filepaths):
+    def get_batch_date_info(self, filepaths, profile=DATES):
         """
         Batch fetches date info for multiple files.
-        Returns dict: {norm_lower_path: date_str}
-        Keys are normalized absolute lower-case paths for robust matching.
+        Returns dict: {normalize_path(path): date_str}
         """
         results = {}
+        for dates, _ in self.iter_batch_date_info(filepaths, profile=profile):
+            results.update((key, date) for key, date in dates.items() if date)
+        return results
+
+    def iter_batch_date_info(self, filepaths, chunk_size=200, first_chunk=48,
+                             workers=None, cancel_event=None, sizes=None, profile=DATES,
+                             exiftool_profile=None):
+        """
+        Streams date info as it becomes available.
+
+        Yields (dates, errors) per chunk, both keyed by normalize_path():
+        dates maps to the date string (None when the file has no date),
+        errors maps to a message for files ExifTool could not read. Indexed
+        files come first in a single chunk; the rest is read in chunks, in
+        input order (a small first one, so the first screen fills quickly),
+        sharded over `workers` ExifTool processes (by default as many as
+        the core count and file sizes warrant). `sizes` optionally maps
+        path -> bytes. Read tags are indexed under `profile`, which the
+        caller widens when it wants them for more than the date. With
+        native date reads, `exiftool_profile` (default: `profile`) is read
+        for the files left to ExifTool instead, so a caller that will want
+        their other tags too gets them from the same pass.
+        """
         if not filepaths:
-            return results
-        
+            return
+
+        to_read = filepaths
+        if self.index:
+            cached, to_read = self.index.get_dates(filepaths, profile)
+            instruments.count("metadata_index.hit", len(cached))
+            instruments.count("metadata_index.miss", len(to_read))
+            if cached:
+                yield {normalize_path(p): d for p, (d, _) in cached.items()}, {}
+        if not to_read:
+            return
+
+        chunks = plan_chunks(to_read, chunk_size, first_chunk, sizes)
+        processes = workers or self.processes or plan_processes(to_read, sizes)
+        # Leave one process free so the metadata panel stays responsive.
+        executor = ShardedExecutor(self.pool, processes, reserve=1)
+        profiles = {"profile": profile, "exiftool_profile": exiftool_profile}
+        results = executor.map(partial(self._read_dates, **profiles), chunks, cancel_event=cancel_event,
+                               on_failure=partial(self._split_dates_chunk, cancel_event=cancel_event,
+                                                  **profiles))
+        for chunk, result in results:
+            if result is None:
+                break
+            yield result
+
+    def _read_dates_chunk(self, chunk, cancel_event=None, profile=DATES, exiftool_profile=None):
+        """
+        Reads one chunk; a bad file only costs itself, not the chunk.
+        Returns (dates, errors) like iter_batch_date_info.
+        """
+        if cancel_event and cancel_event.is_set():
+            return {}, {}
         try:
-            with exiftool.ExifToolHelper(executable=self.exiftool_path) as et:
-                metadata_list = et.get_metadata(filepaths)
-                
-                for meta in metadata_list:
-                    src = meta.get("SourceFile")
-                    date_val, _ = self._extract_date_from_meta(meta)
-                    
-                    if src and date_val:
-                        # Normalize to help matching across systems/formats
-                        # We use absolute path lowercased
-                        abs_path = os.path.abspath(src)
-                        norm_key = abs_path.lower()
-                        results[norm_key] = date_val
-                        
+            return self._read_dates(chunk, profile, exiftool_profile)
         except Exception as e:
-            print(f"Error in batch metadata: {e}")
-            
-        return results
+            return self._split_dates_chunk(chunk, e, cancel_event, profile, exiftool_profile)
 
-    def _extract_date_from_meta(self, meta):
-        # Candidate tags in order of preference
-        tags = [
-            'EXIF:DateTimeOriginal',
-            'QuickTime:CreateDate',
-            'QuickTime:MediaCreateDate',
-            'XMP:DateCreated',
-            'IPTC:DateCreated',
-            'File:FileModifyDate'
-        ]
-        
-        for tag in tags:
+    def _split_dates_chunk(self, chunk, error, cancel_event=None, profile=DATES, exiftool_profile=None):
+        """
+        Output unusable (crash, garbled JSON): bisect to isolate the file.
+        """
+        if len(chunk) == 1:
+            return {}, {normalize_path(chunk[0]): str(error)}
+        dates, errors = {}, {}
+        mid = len(chunk) // 2
+        for half in (chunk[:mid], chunk[mid:]):
+            d, err = self._read_dates_chunk(half, cancel_event, profile, exiftool_profile)
+            dates.update(d)
+            errors.update(err)
+        return dates, errors
+
+    def _read_dates(self, chunk, profile=DATES, exiftool_profile=None):
+        """
+        Reads one chunk; raises if ExifTool's output is unusable.
+        """
+        dates, errors = {}, {}
+        metadata_list, to_read = [], chunk
+        read_profile = profile
+        if profile == DATES and self.native_dates:
+            read_profile = exiftool_profile or profile
+            # Plain files cost a few page reads here instead of an ExifTool
+            # parse; only the rest goes to ExifTool.
+            with instruments.timer("native_dates.chunk"):
+                native = [read_date_tags(path) for path in chunk]
+            metadata_list = [meta for meta in native if meta is not None]
+            to_read = [path for path, meta in zip(chunk, native) if meta is None]
+            instruments.count("native_dates.hit", len(metadata_list))
+            instruments.count("native_dates.miss", len(to_read))
+        native_keys = {normalize_path(meta["SourceFile"]) for meta in metadata_list}
+        if to_read:
+            with instruments.timer(f"exif.read_chunk.{read_profile}"), \
+                    self.pool.session(timeout=self._batch_timeout(len(to_read))) as et:
+                read, read_errors = self._read_metadata(et, to_read, read_profile)
+            metadata_list.extend(read)
+            errors.update(read_errors)
+
+        # Native reads and a profile's separate runs come back out of
+        # order; report in chunk order all the same.
+        by_key = {normalize_path(meta["SourceFile"]): meta
+                  for meta in metadata_list if meta.get("SourceFile")}
+        from_headers, from_exiftool = [], []
+        for path in chunk:
+            key = normalize_path(path)
+            meta = by_key.get(key)
+            if meta is not None:
+                (from_headers if key in native_keys else from_exiftool).append((meta["SourceFile"], meta))
+                dates[key] = self.extract_date_info(meta)[0]
+            elif key not in errors:
+                errors[key] = "No metadata returned"
+        self._index_metadata(from_headers, profile)
+        self._index_metadata(from_exiftool, read_profile)
+        instruments.count("exif.read_errors", len(errors))
+        return dates, errors
+
+    def _read_metadata(self, et, filepaths, profile=FULL):
+        """
+        Reads the tags in `profile` (see read_args), tolerating individual
+        bad files. Returns (metadata_list, {normalize_path(file): error}).
+        """
+        metadata_list, errors = [], {}
+        for args, paths in read_args(profile, filepaths):
+            if not paths:
+                continue
+            try:
+                metadata_list.extend(et.execute_json("-charset", "filename=utf8", *args, *paths))
+            except ExifToolExecuteError as e:
+                # Non-zero status means at least one file failed; the JSON
+                # for the others is still on stdout.
+                metadata_list.extend(json.loads(e.stdout) if e.stdout else [])
+                errors.update(self._parse_file_errors(e.stderr))
+        return metadata_list, errors
+
+    def _parse_file_errors(self, stderr):
+        """
+        Maps ExifTool's per-file 'Error: <message> - <file>' lines to
+        {normalize_path(file): message}.
+        """
+        errors = {}
+        for line in (stderr or "").splitlines():
+            if line.startswith("Error:") and " - " in line:
+                message, path = line[len("Error:"):].rsplit(" - ", 1)
+                errors[normalize_path(path.strip())] = message.strip()
+        return errors
+
+    def _index_metadata(self, entries, profile=FULL):
+        """
+        Records freshly read (filepath, tags) pairs in the metadata index.
+        """
+        if not self.index or not entries:
+            return
+        rows = []
+        for path, meta in entries:
+            date_val, date_tag = self.extract_date_info(meta)
+            rows.append((path, meta, date_val, date_tag))
+        self.index.put_many(rows, profile)
+
+    def _refresh_index(self, et, filepaths):
+        """
+        Re-reads just-written files on the session that wrote them, so the
+        index never serves pre-write values. The panel profile is all the
+        GUI reads back.
+        """
+        if not self.index or not filepaths:
+            return
+        try:
+            metadata_list, _ = self._read_metadata(et, filepaths, PANEL)
+            self._index_metadata([(meta["SourceFile"], meta) for meta in metadata_list], PANEL)
+        except Exception as e:
+            print(f"Error refreshing metadata index: {e}")
+            for path in filepaths:
+                self.index.remove(path)
+
+    def get_embedded_preview(self, filepath):
+        """
+        Extracts an embedded preview image (cover art, preview or thumbnail
+        image) with `-b`. Files whose indexed tags list none are skipped
+        without running ExifTool; files not indexed yet take that single
+        `-b` read. Returns the image bytes or None.
+        """
+        tags = PREVIEW_TAGS
+        meta = self.index.get(filepath, PANEL) if self.index else None
+        if meta is not None:
+            found = {key.split(":")[-1]: key for key in meta if key.split(":")[-1] in PREVIEW_TAGS}
+            tags = [found[name] for name in PREVIEW_TAGS if name in found]
+            if not tags:
+                return None
+
+        try:
+            with self.pool.session() as et:
+                result = et.get_tags(filepath, tags, params=["-b"])[0]
+        except Exception as e:
+            print(f"Error reading preview of {filepath}: {e}")
+            return None
+        # Keys come back group-qualified; prefer tags in PREVIEW_TAGS order.
+        found = {key.split(":")[-1]: value for key, value in result.items()}
+        for name in PREVIEW_TAGS:
+            value = found.get(name)
+            # -b in JSON output: binary values come as 'base64:...'.
+            if isinstance(value, str) and value.startswith("base64:"):
+                return base64.b64decode(value[len("base64:"):])
+        return None
+
+    def extract_date_info(self, meta):
+        """
+        Picks 'Date Taken' from an already-read tag dict.
+        Returns (date_str, source_tag) or (None, None).
+        """
+        for tag in DATE_TAGS:
             if tag in meta:
-                return meta[tag], tag
+                return self._zoned_date(meta, tag), tag
         
         return None, None
 
+    def _zoned_date(self, meta, tag):
+        """
+        Appends the time zone to a zone-less date value when the file says
+        what it is: EXIF offset tags, or UTC for QuickTime dates when
+        `quicktime_utc` is set.
+        """
+        value = meta[tag]
+        parsed = parse_exif_datetime(value)
+        if parsed is None or parsed.tz or not parsed.has_time:
+            return value
+        if tag.startswith('QuickTime:'):
+            return value + 'Z' if self.quicktime_utc else value
+        for offset_tag in DATE_OFFSET_TAGS.get(tag, ()):
+            tz = parse_offset(meta.get(offset_tag))
+            if tz is not None:
+                return value + format_offset(tz)
+        return value
+
     def update_date(self, filepath, new_date_str):
         """
         Updates the creation date tags to the new date.
         """
+        error = self.update_dates({filepath: new_date_str}).get(filepath)
+        if error:
+            print(f"Error updating metadata for {filepath}: {error}")
+            return False
+        return True
+
+    def update_dates(self, assignments, progress_callback=None, cancel_event=None, chunk_size=200):
+        """
+        Writes {filepath: new_date_str} for many files.
+
+        Each chunk is a single ExifTool command on a pooled process: the file
+        list goes in a `-@` argfile and the per-file values in a `-json=`
+        import, so one date or a different date per file costs the same.
+        Returns {filepath: None on success, else an error message}.
+        """
+        paths = list(assignments)
+        dates = sorted(set(assignments.values()))
+        batch = self._begin_batch(f"Set date to {dates[0]}" if len(dates) == 1 else "Set dates", len(paths))
+
+        def write(chunk):
+            values = [dict(SourceFile=path, **self._date_tags(path, assignments[path])) for path in chunk]
+            return self._write_values(chunk, values, ["-overwrite_original"], batch)
+
+        try:
+            return self._run_chunks(paths, write, chunk_size, progress_callback, cancel_event)
+        finally:
+            self._finish_batch(batch)
+
+    def shift_dates(self, filepaths, delta, offset=None, progress_callback=None,
+                    cancel_event=None, chunk_size=500):
+        """
+        Shifts every date/time tag in SHIFT_TAGS by `delta` (a timedelta)
+        and, if `offset` is given (e.g. '+09:00'), sets the OffsetTime*
+        tags to it. ExifTool applies the shift itself (`-TAG+=`), so each
+        chunk is one command with no read-modify-write round trip; tags a
+        file doesn't have are left alone.
+        Returns {filepath: None on success, else an error message}.
+        """
+        op, shift = format_shift(delta)
+        params = ["-overwrite_original"]
+        if delta:
+            params += [f"-{tag}{op}{shift}" for tag in SHIFT_TAGS]
+        if offset:
+            params += [f"-{tag}={offset}" for tag in OFFSET_TAGS]
+
+        paths = list(filepaths)
+        description = f"Shift dates by {op[0]}{abs(delta)}" if delta else "Set time zone"
+        if delta and offset:
+            description += f", zone {offset}"
+        batch = self._begin_batch(description, len(paths))
         try:
-            params = [
-                f"-AllDates={new_date_str}",
-                "-overwrite_original"
-            ]
-            
-            lower_path = filepath.lower()
-            if lower_path.endswith(('.mp4', '.mov', '.m4v')):
-                 params.append(f"-QuickTime:CreateDate={new_date_str}")
-                 params.append(f"-QuickTime:MediaCreateDate={new_date_str}")
-
-            with exiftool.ExifToolHelper(executable=self.exiftool_path) as et:
-                et.execute(*params, filepath)
-            return True
+            return self._run_chunks(paths, lambda chunk: self._write_values(chunk, None, params, batch),
+                                    chunk_size, progress_callback, cancel_event)
+        finally:
+            self._finish_batch(batch)
+
+    def rollback(self, batch_id, progress_callback=None, cancel_event=None, chunk_size=500):
+        """
+        Restores the journaled original values of a write batch.
+
+        Each chunk costs one read of the current values and (usually) one
+        write: originals are imported with `-json=`, and tags the batch
+        created are deleted. Files still holding their original values are
+        left untouched. Files that fail (or are cancelled) can be restored
+        by running it again. Returns {filepath: None on success, else an
+        error message}.
+        """
+        if not self.journal:
+            raise ValueError("No write journal configured")
+        originals = self.journal.originals(batch_id)
+        paths = list(originals)
+        results = self._run_chunks(paths, lambda chunk: self._restore_chunk(chunk, originals),
+                                   chunk_size, progress_callback, cancel_event)
+        # Files not restored (failed or cancelled) still hold the batch's
+        # values: they stay in the journal for the next attempt, and the
+        # batch stays undoable until none is left.
+        self.journal.mark(batch_id, results, success_state=self.journal.RESTORED, failure_state=None)
+        remaining = self.journal.batch(batch_id)
+        if remaining is not None and not remaining["files"]:
+            self.journal.finish(batch_id, self.journal.ROLLED_BACK)
+        return results
+
+    def _run_chunks(self, paths, write_chunk, chunk_size, progress_callback=None, cancel_event=None):
+        """
+        Runs `write_chunk(chunk)` -> {filepath: None or error} over `paths`,
+        sharded over as many ExifTool processes as the batch warrants.
+        Chunks are also capped in bytes, since writing rewrites the whole
+        file. Writes are not retried: a shift applied twice is not undone
+        by trying again. Returns the merged results in input order.
+        """
+        sizes = file_sizes(paths)
+        chunks = plan_chunks(paths, chunk_size, sizes=sizes)
+        executor = ShardedExecutor(self.pool, self.processes or plan_processes(paths, sizes), reserve=1)
+        results = {}
+        for chunk, chunk_results in executor.map(write_chunk, chunks, retries=0, cancel_event=cancel_event):
+            if chunk_results is None:
+                chunk_results = {path: "Cancelled" for path in chunk}
+            results.update(chunk_results)
+            if progress_callback:
+                progress_callback(len(results), len(paths))
+        return results
+
+    def _restore_chunk(self, chunk, originals):
+        results = {}
+        try:
+            with self.pool.session(timeout=self._batch_timeout(len(chunk))) as et:
+                current, errors = self._read_journal_tags(et, chunk)
         except Exception as e:
-            print(f"Error updating metadata for {filepath}: {e}")
-            return False
+            return {path: str(e) for path in chunk}
+
+        # Files needing the same tags deleted share one ExifTool run; the
+        # deletions are command-line assignments, the values per-file JSON.
+        groups = {}
+        for path in chunk:
+            if path not in current:
+                results[path] = errors.get(normalize_path(path), "Could not read file")
+                continue
+            original = originals[path]
+            created = tuple(sorted(tag for tag in current[path] if tag not in original))
+            if not created and all(current[path].get(tag) == value for tag, value in original.items()):
+                results[path] = None
+                continue
+            # A write killed mid-way leaves ExifTool's temp file behind,
+            # which would make it refuse to write the file again.
+            try:
+                os.remove(path + "_exiftool_tmp")
+            except OSError:
+                pass
+            groups.setdefault(created, []).append(path)
+
+        for created, paths in groups.items():
+            values = [dict(SourceFile=path, **originals[path]) for path in paths]
+            params = ["-overwrite_original"] + [f"-{tag}=" for tag in created]
+            results.update(self._write_values(paths, values, params))
+        return results
+
+    def _begin_batch(self, description, count):
+        if not self.journal:
+            return None
+        try:
+            return self.journal.begin(f"{description} ({count} file(s))")
+        except Exception as e:
+            print(f"Write journal error: {e}")
+            return None
+
+    def _finish_batch(self, batch):
+        if batch is not None:
+            try:
+                self.journal.finish(batch)
+            except Exception as e:
+                print(f"Write journal error: {e}")
+
+    def _read_journal_tags(self, et, filepaths):
+        """
+        Reads every instance of the JOURNAL_TAGS, keyed by family 1 group
+        (e.g. 'ExifIFD:DateTimeOriginal'), so each one can be restored.
+        Returns ({filepath: {tag: value}}, {normalize_path(file): error}).
+        """
+        params = ["-charset", "filename=utf8", "-a", "-G1", *[f"-{tag}" for tag in JOURNAL_TAGS], *filepaths]
+        try:
+            entries, errors = et.execute_json(*params), {}
+        except ExifToolExecuteError as e:
+            entries = json.loads(e.stdout) if e.stdout else []
+            errors = self._parse_file_errors(e.stderr)
+
+        by_key = {normalize_path(path): path for path in filepaths}
+        tags = {}
+        for entry in entries:
+            path = by_key.get(normalize_path(entry.pop("SourceFile", "")))
+            if path is not None:
+                tags[path] = entry
+        return tags, errors
+
+    def preview_shift(self, filepaths, delta, offset=None, cancel_event=None):
+        """
+        Dry run of shift_dates computed from the panel tags: indexed ones,
+        or a batched read of the files not indexed yet.
+        Returns a list of (filepath, tag, old_value, new_value), or None if
+        `cancel_event` was set first.
+        """
+        metadata = self._panel_metadata(filepaths, cancel_event)
+        if metadata is None:
+            return None
+        rows = []
+        for path in filepaths:
+            meta = metadata.get(path)
+            if not meta:
+                continue
+            for tag in SHIFT_TAGS:
+                parsed = parse_exif_datetime(meta.get(tag))
+                if parsed is not None and delta:
+                    rows.append((path, tag, meta[tag], parsed.shifted(delta).format()))
+            if offset:
+                for tag in OFFSET_TAGS:
+                    old = meta.get(tag)
+                    if old != offset:
+                        rows.append((path, tag, old, offset))
+        return rows
+
+    def _panel_metadata(self, filepaths, cancel_event=None):
+        """
+        Returns {filepath: panel-profile tags} from the index, reading the
+        files it lacks one chunk per ExifTool run (and indexing them).
+        Unreadable files are left out; None if cancelled.
+        """
+        found = {}
+        if self.index:
+            found = {path: tags for path, (tags, _) in self.index.get_many(filepaths, PANEL).items()}
+        missing = [path for path in filepaths if path not in found]
+        for chunk in plan_chunks(missing):
+            if cancel_event and cancel_event.is_set():
+                return None
+            try:
+                with self.pool.session(timeout=self._batch_timeout(len(chunk))) as et:
+                    metadata_list, _ = self._read_metadata(et, chunk, PANEL)
+            except Exception as e:
+                print(f"Error reading metadata of {len(chunk)} file(s): {e}")
+                continue
+            by_key = {normalize_path(meta["SourceFile"]): meta
+                      for meta in metadata_list if meta.get("SourceFile")}
+            fresh = [(path, by_key[normalize_path(path)]) for path in chunk
+                     if normalize_path(path) in by_key]
+            found.update(fresh)
+            self._index_metadata(fresh, PANEL)
+        return found
+
+    def _date_tags(self, filepath, new_date_str):
+        # The tags -AllDates stands for, plus the QuickTime media dates.
+        tags = {
+            "DateTimeOriginal": new_date_str,
+            "CreateDate": new_date_str,
+            "ModifyDate": new_date_str,
+        }
+        if filepath.lower().endswith(('.mp4', '.mov', '.m4v')):
+            # A local time is shown for UTC QuickTime dates; store it as UTC.
+            quicktime_date = to_utc(new_date_str) if self.quicktime_utc else new_date_str
+            tags["QuickTime:CreateDate"] = quicktime_date
+            tags["QuickTime:MediaCreateDate"] = quicktime_date
+        return tags
+
+    def _write_values(self, filepaths, values, params, batch=None):
+        """
+        Runs one ExifTool write over `filepaths` with `params`, importing
+        per-file tag values from `values` (a list of dicts with SourceFile)
+        when given. Returns {filepath: None or error message}.
+
+        With a journal `batch`, the files' original values are journaled
+        first, on the same ExifTool process; files that cannot be read are
+        not written. `-overwrite_original` keeps ExifTool's write-to-temp-
+        file-then-rename, so a killed write never leaves a half-written file.
+        """
+        results = {}
+        tmp_files = []
+        try:
+            params = list(params)
+            with instruments.timer("exif.write_chunk"), \
+                    self.pool.session(timeout=self.pool.timeout + 2 * len(filepaths)) as et:
+                if batch is not None:
+                    originals, read_errors = self._read_journal_tags(et, filepaths)
+                    for path in filepaths:
+                        if path not in originals:
+                            results[path] = read_errors.get(normalize_path(path), "Could not read original values")
+                    filepaths = [path for path in filepaths if path in originals]
+                    if not filepaths:
+                        return results
+                    self.journal.record(batch, originals)
+                    if values is not None:
+                        values = [entry for entry in values if entry["SourceFile"] in originals]
+
+                if values is not None:
+                    json_path = self._temp_file(".json", json.dumps(values, ensure_ascii=False))
+                    tmp_files.append(json_path)
+                    params.insert(0, f"-json={json_path}")
+                args_path = self._temp_file(".args", "\n".join(filepaths) + "\n")
+                tmp_files.append(args_path)
+
+                errors = {}
+                try:
+                    et.execute("-charset", "filename=utf8", *params, "-@", args_path)
+                except ExifToolExecuteError as e:
+                    errors = self._parse_file_errors(e.stderr)
+                    if not errors:
+                        raise
+
+                for path in filepaths:
+                    results[path] = errors.get(normalize_path(path))
+                if batch is not None:
+                    self.journal.mark(batch, {path: results[path] for path in filepaths})
+                self._refresh_index(et, [p for p in filepaths if results[p] is None])
+        except Exception as e:
+            print(f"Error in batch write: {e}")
+            for path in filepaths:
+                results[path] = results.get(path) or str(e)
+        finally:
+            for path in tmp_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return results
+
+    def _temp_file(self, suffix, text):
+        fd, path = tempfile.mkstemp(prefix="exifeditor_", suffix=suffix)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
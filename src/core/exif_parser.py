@@ -0,0 +1,129 @@
+import struct
+
+# TIFF field types we decode: BYTE, ASCII, SHORT, LONG, RATIONAL, UNDEFINED,
+# SLONG, SRATIONAL -> (struct code, size in bytes)
+_TYPES = {
+    1: ("B", 1),
+    2: ("s", 1),
+    3: ("H", 2),
+    4: ("L", 4),
+    5: ("LL", 8),
+    7: ("s", 1),
+    9: ("l", 4),
+    10: ("ll", 8),
+}
+
+TAG_ORIENTATION = 0x0112
+TAG_EXIF_IFD = 0x8769
+TAG_JPEG_OFFSET = 0x0201
+TAG_JPEG_LENGTH = 0x0202
+
+
+class TiffReader:
+    """
+    Minimal reader for the TIFF structure inside an EXIF block.
+
+    `data` is any bytes-like object (bytes, memoryview, mmap); `base` is the
+    offset of the TIFF header ("II*\\0" / "MM\\0*") within it. Only the
+    entries that are asked for are decoded.
+    """
+
+    def __init__(self, data, base=0):
+        self.data = data
+        self.base = base
+        order = bytes(data[base:base + 2])
+        if order == b"II":
+            self.endian = "<"
+        elif order == b"MM":
+            self.endian = ">"
+        else:
+            raise ValueError("Not a TIFF header")
+        magic, self.ifd0_offset = struct.unpack_from(self.endian + "HL", data, base + 2)
+        if magic != 42:
+            raise ValueError("Not a TIFF header")
+
+    def read_ifd(self, offset):
+        """
+        Returns ({tag: (type, count, value_or_offset_pos)}, next_ifd_offset).
+        Offsets are relative to the TIFF header.
+        """
+        pos = self.base + offset
+        if offset <= 0 or pos + 2 > len(self.data):
+            return {}, 0
+        (count,) = struct.unpack_from(self.endian + "H", self.data, pos)
+        end = pos + 2 + count * 12
+        if end + 4 > len(self.data):
+            return {}, 0
+
+        entries = {}
+        for i in range(count):
+            entry = pos + 2 + i * 12
+            tag, typ, n = struct.unpack_from(self.endian + "HHL", self.data, entry)
+            entries[tag] = (typ, n, entry + 8)
+        (next_offset,) = struct.unpack_from(self.endian + "L", self.data, end)
+        return entries, next_offset
+
+    def raw(self, entry):
+        """
+        Returns the bytes of an IFD entry's value as stored, or None if the
+        type is unknown or the value lies outside the data.
+        """
+        typ, count, field = entry
+        if typ not in _TYPES:
+            return None
+        total = _TYPES[typ][1] * count
+        if total > 4:
+            (offset,) = struct.unpack_from(self.endian + "L", self.data, field)
+            field = self.base + offset
+        if field + total > len(self.data):
+            return None
+        return bytes(self.data[field:field + total])
+
+    def value(self, entry):
+        """
+        Decodes an IFD entry: str for ASCII, bytes for UNDEFINED, an int or
+        tuple of ints for the numeric types. Returns None if it can't.
+        """
+        raw = self.raw(entry)
+        if raw is None:
+            return None
+        typ, count, _ = entry
+
+        if typ in (2, 7):
+            if typ == 2:
+                return raw.split(b"\0", 1)[0].decode("latin-1").strip()
+            return raw
+
+        code = _TYPES[typ][0]
+        per = len(code)
+        values = struct.unpack(self.endian + code * count, raw)
+        if per == 2:
+            values = tuple(zip(values[0::2], values[1::2]))
+        return values[0] if count == 1 else values
+
+    def get(self, ifd, tag):
+        entry = ifd.get(tag)
+        return None if entry is None else self.value(entry)
+
+
+def exif_thumbnail_bytes(exif_block):
+    """
+    Returns the JPEG thumbnail stored in IFD1 of an APP1 EXIF payload
+    (as found in Pillow's `info['exif']`), or None.
+    """
+    base = 6 if exif_block[:6] == b"Exif\0\0" else 0
+    try:
+        reader = TiffReader(exif_block, base)
+        _, ifd1_offset = reader.read_ifd(reader.ifd0_offset)
+        ifd1, _ = reader.read_ifd(ifd1_offset)
+    except (ValueError, struct.error):
+        return None
+
+    offset = reader.get(ifd1, TAG_JPEG_OFFSET)
+    length = reader.get(ifd1, TAG_JPEG_LENGTH)
+    if not isinstance(offset, int) or not isinstance(length, int) or length <= 0:
+        return None
+    start = base + offset
+    if start + length > len(exif_block):
+        return None
+    return bytes(exif_block[start:start + length])
@@ -0,0 +1,259 @@
+import os
+import time
+import threading
+import subprocess
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+import exiftool
+import exiftool.exiftool
+from exiftool.exceptions import ExifToolExecuteError, ExifToolTagNameError, ExifToolNotRunning
+
+from src.core.instrumentation import instruments
+
+
+def _read_fd_endswith(fd, b_endswith, block_size):
+    """
+    PyExifTool's pipe reader, except that it raises at end of file (the
+    process exited or was killed) instead of polling the closed pipe
+    forever.
+    """
+    chunks = []
+    tail = b""
+    keep = len(b_endswith) + 4
+    while not tail.strip().endswith(b_endswith):
+        chunk = os.read(fd, block_size)
+        if not chunk:
+            raise ExifToolNotRunning("exited before finishing the command")
+        chunks.append(chunk)
+        tail = (tail + chunk)[-keep:]
+    return b"".join(chunks)
+
+
+# execute() looks the reader up as a module global.
+exiftool.exiftool._read_fd_endswith = _read_fd_endswith
+
+
+class _ExifTool(exiftool.ExifToolHelper):
+    """
+    ExifToolHelper whose round trips are timed; every higher-level call
+    (get_tags, execute_json, ...) goes through execute().
+    """
+
+    def execute(self, *params, **kwargs):
+        with instruments.timer("exiftool.round_trip"):
+            return super().execute(*params, **kwargs)
+
+    @property
+    def running(self):
+        # Dead processes are expected here (crashes, watchdog kills); reset
+        # the state quietly instead of warning like the base class.
+        if self._running and self._process.poll() is not None:
+            self._flag_running_false()
+        return self._running
+
+
+def default_pool_size():
+    # ExifTool is single-threaded Perl; a couple of processes is enough to
+    # keep the panel responsive while a folder is being indexed.
+    return max(2, min(4, (os.cpu_count() or 2) // 2))
+
+
+class ExifToolPool:
+    """
+    A small pool of long-lived `-stay_open` ExifTool processes.
+
+    Callers borrow a process with `session()`; only one thread uses a given
+    process at a time, so the pool can be shared between worker threads and
+    the GUI thread. Processes that crash or exceed the session timeout are
+    killed and replaced on the next request.
+    """
+
+    def __init__(self, exiftool_path=None, size=None, timeout=60.0):
+        self.exiftool_path = exiftool_path
+        self.size = size or default_pool_size()
+        self.timeout = timeout
+        self._base_size = self.size
+        self._demands = []  # sizes requested through expanded()
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._busy = {}  # process -> lease of the session using it
+        self._killed = set()
+        self._created = 0
+        self._closed = False
+        # On Linux PyExifTool starts the child with PR_SET_PDEATHSIG, which
+        # fires when the *thread* that started it exits. Spawn from one
+        # long-lived thread so retiring worker threads don't take their
+        # processes with them.
+        self._spawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="exiftool-spawn")
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Yields a running ExifToolHelper for exclusive use.
+        `timeout` (seconds) overrides the pool default; None keeps it,
+        0 disables the watchdog for long batch jobs.
+        """
+        start = time.perf_counter()
+        et, lease = self._acquire()
+        instruments.add_time("exiftool.wait", time.perf_counter() - start, start)
+        limit = self.timeout if timeout is None else timeout
+
+        watchdog = None
+        if limit:
+            watchdog = threading.Timer(limit, self._expire, args=(et, lease))
+            watchdog.daemon = True
+            watchdog.start()
+
+        healthy = False
+        try:
+            yield et
+            healthy = True
+        except (ExifToolExecuteError, ExifToolTagNameError):
+            # ExifTool answered, it just didn't like the command/file.
+            healthy = True
+            raise
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            self._release(et, healthy)
+
+    @contextmanager
+    def expanded(self, size):
+        """
+        Lets the pool grow to at least `size` processes for the duration,
+        e.g. while a large batch is sharded. Extra processes are started
+        on demand and stopped once no longer wanted.
+        """
+        with self._cond:
+            self._demands.append(size)
+            self.size = max([self._base_size, *self._demands])
+            self._cond.notify_all()
+        try:
+            yield self
+        finally:
+            surplus = []
+            with self._cond:
+                self._demands.remove(size)
+                self.size = max([self._base_size, *self._demands])
+                while self._idle and self._created > self.size:
+                    surplus.append(self._idle.pop(0))
+                    self._created -= 1
+            for et in surplus:
+                self._stop(et)
+
+    def close(self):
+        """
+        Stops every process. Idle ones are asked to exit, busy ones are killed
+        so that blocked sessions return immediately.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            for et in self._busy:
+                self._kill(et)
+            self._cond.notify_all()
+
+        for et in idle:
+            self._stop(et)
+        self._spawner.shutdown(wait=False)
+
+    def _acquire(self):
+        dead = []
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("ExifTool pool is closed")
+                if self._idle:
+                    et = self._idle.pop()
+                    if not self._alive(et):
+                        # Crashed while idle; replace it.
+                        self._created -= 1
+                        dead.append(et)
+                        continue
+                    lease = self._busy[et] = object()
+                    instruments.gauge("exiftool.busy", len(self._busy))
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    et = None
+                    break
+                self._cond.wait()
+
+        for old in dead:
+            self._stop(old)
+        if et is not None:
+            return et, lease
+
+        try:
+            et = self._spawner.submit(self._spawn).result()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            lease = self._busy[et] = object()
+            instruments.gauge("exiftool.busy", len(self._busy))
+        return et, lease
+
+    def _spawn(self):
+        with instruments.timer("exiftool.spawn"):
+            et = _ExifTool(executable=self.exiftool_path)
+            et.run()
+        return et
+
+    def _release(self, et, healthy):
+        healthy = healthy and self._alive(et)
+        with self._cond:
+            self._busy.pop(et, None)
+            if et in self._killed:
+                self._killed.discard(et)
+                healthy = False
+            instruments.gauge("exiftool.busy", len(self._busy))
+            keep = healthy and not self._closed and self._created <= self.size
+            if keep:
+                self._idle.append(et)
+            else:
+                self._created -= 1
+            self._cond.notify()
+
+        if not keep:
+            self._stop(et)
+
+    def _alive(self, et):
+        proc = getattr(et, "_process", None)
+        return proc is not None and proc.poll() is None
+
+    def _stop(self, et):
+        try:
+            if et.running:
+                et.terminate(timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            with self._cond:
+                self._kill(et)
+
+    def _expire(self, et, lease):
+        # Watchdog: only kill the process if the session that armed it still
+        # holds it; the timer can fire just as the session releases it.
+        with self._cond:
+            if self._busy.get(et) is lease:
+                self._kill(et)
+
+    def _kill(self, et):
+        # Called with the lock held. PyExifTool has no public way to abort a
+        # blocked read, so kill the child directly; the session's reader
+        # then hits end of file (see _read_fd_endswith) and raises, and the
+        # process is marked so it is never handed out again.
+        proc = getattr(et, "_process", None)
+        if proc is None or proc.poll() is not None:
+            return
+        instruments.count("exiftool.killed")
+        try:
+            proc.kill()
+        except OSError:
+            pass
+        if et in self._busy:
+            self._killed.add(et)
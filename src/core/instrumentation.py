@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+
+# Durations kept per timer for percentiles.
+_SAMPLES = 512
+# Trace events kept (oldest dropped first) while tracing.
+_TRACE_EVENTS = 200000
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.add_time(self.name, time.perf_counter() - self.start, self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Process-wide timers, counters and gauges for the hot paths.
+
+    Disabled by default; every call then returns after one attribute check
+    (timer() hands out a shared no-op context manager). Once enabled,
+    timers keep count, total, maximum and a window of recent durations for
+    percentiles; with `trace` on, each timing and gauge change is also
+    kept as a Chrome trace event, so export() writes a file that
+    chrome://tracing or ui.perfetto.dev opens. Names are dotted,
+    e.g. 'thumbnail.decode.draft'; counters named '<cache>.hit' and
+    '<cache>.miss' are reported as hit rates.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.tracing = False
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.reset()
+
+    def enable(self, trace=False):
+        self.tracing = trace
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self.tracing = False
+
+    def reset(self):
+        with self._lock:
+            self._timers = {}  # name -> [count, total, max, recent durations]
+            self._counters = {}
+            self._gauges = {}
+            self._events = deque(maxlen=_TRACE_EVENTS)
+            self._threads = {}  # thread id -> name, for the trace
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """
+        Records the current level of something, e.g. a queue depth.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._gauges.get(name) == value:
+                return
+            self._gauges[name] = value
+            if self.tracing:
+                self._event({"name": name, "ph": "C", "ts": self._ts(time.perf_counter()),
+                             "args": {"value": value}})
+
+    def timer(self, name):
+        """
+        Context manager timing its block under `name`.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """
+        Decorator timing every call of a function, e.g. a GUI slot.
+        """
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Timer(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def add_time(self, name, seconds, start=None):
+        """
+        Records a duration measured elsewhere; `start` (a perf_counter
+        value) places it on the trace.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = [0, 0.0, 0.0, deque(maxlen=_SAMPLES)]
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+            timer[3].append(seconds)
+            if self.tracing and start is not None:
+                self._event({"name": name, "cat": name.split(".", 1)[0], "ph": "X",
+                             "ts": self._ts(start), "dur": round(seconds * 1e6, 1)})
+
+    def snapshot(self):
+        """
+        Current figures as a JSON-able dict: timers (count, total, mean,
+        p95 of recent calls and max, in ms), counters, gauges and hit rates.
+        """
+        with self._lock:
+            timers = {name: (count, total, peak, sorted(recent))
+                      for name, (count, total, peak, recent) in self._timers.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        report = {"timers": {}, "counters": counters, "gauges": gauges, "hit_rates": {}}
+        for name, (count, total, peak, recent) in sorted(timers.items()):
+            report["timers"][name] = {
+                "count": count,
+                "total_ms": round(total * 1000, 2),
+                "mean_ms": round(total * 1000 / count, 3),
+                "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 3),
+                "max_ms": round(peak * 1000, 3),
+            }
+        for name in counters:
+            if name.endswith(".hit"):
+                prefix = name[:-len(".hit")]
+                total = counters[name] + counters.get(prefix + ".miss", 0)
+                report["hit_rates"][prefix] = round(counters[name] / total, 3)
+        return report
+
+    def export(self, path):
+        """
+        Writes the trace events (if tracing) and a snapshot as a Chrome
+        trace-event JSON file.
+        """
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        names = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                 for tid, name in threads.items()]
+        for event in events:
+            event.setdefault("pid", pid)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms",
+                       "otherData": self.snapshot()}, f)
+
+    def _event(self, event):
+        # Called with the lock held.
+        thread = threading.current_thread()
+        event["tid"] = thread.ident
+        self._threads.setdefault(thread.ident, thread.name)
+        self._events.append(event)
+
+    def _ts(self, perf_counter):
+        return round((perf_counter - self._origin) * 1e6, 1)
+
+
+instruments = Instrumentation()
+# Lets a field install capture a trace from startup.
+if os.environ.get("EXIFEDITOR_TRACE"):
+    instruments.enable(trace=True)
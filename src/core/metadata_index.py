@@ -0,0 +1,182 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from src.core.paths import app_cache_dir, normalize_path
+
+# SQLite's default host-parameter limit is 999 on older builds.
+_QUERY_CHUNK = 500
+
+
+class MetadataIndex:
+    """
+    Persistent store of the parsed ExifTool tag dict per file.
+
+    Rows are keyed by path and only trusted while the file's size and mtime
+    still match, so anything new or changed falls through to ExifTool. The
+    extracted 'Date Taken' is kept in its own columns, letting folder loads
+    fetch dates without deserialising every tag dict. Each row records the
+    tag profile it was read with and serves lookups for that profile or a
+    narrower one.
+    """
+
+    # Tag profiles, narrowest first (see TAG_PROFILES in exif_handler).
+    PROFILES = ("dates", "panel", "full")
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS metadata (
+            path TEXT PRIMARY KEY,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            date_value TEXT,
+            date_tag TEXT,
+            tags TEXT NOT NULL,
+            indexed_at REAL NOT NULL,
+            profile TEXT NOT NULL DEFAULT 'full'
+        );
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(app_cache_dir(), "metadata.db")
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(metadata)")]
+        if "profile" not in columns:
+            # Indexes from before tag profiles hold complete reads.
+            self._conn.execute("ALTER TABLE metadata ADD COLUMN profile TEXT NOT NULL DEFAULT 'full'")
+            self._conn.commit()
+
+    def get(self, filepath, profile="full"):
+        """
+        Returns the cached tag dict if the file is unchanged and was read
+        with `profile` or a wider one, else None.
+        """
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT file_size, mtime_ns, tags, profile FROM metadata WHERE path = ?",
+                (self._key(filepath),)).fetchone()
+
+        if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+            return None
+        if not self.covers(row[3], profile):
+            return None
+        return json.loads(row[2])
+
+    def covers(self, stored, wanted):
+        """
+        True if a read with profile `stored` has every tag `wanted` asks for.
+        """
+        if stored not in self.PROFILES or wanted not in self.PROFILES:
+            return stored == wanted
+        return self.PROFILES.index(stored) >= self.PROFILES.index(wanted)
+
+    def get_dates(self, filepaths, profile="dates"):
+        """
+        Looks up the stored date for many files at once, from rows read with
+        `profile` or a wider one (every profile reads the date tags).
+        Returns ({filepath: (date_value, date_tag)}, [filepaths needing a read]).
+        """
+        found = {path: (date_value, date_tag)
+                 for path, (date_value, date_tag, stored) in self._get_valid(
+                     filepaths, "date_value, date_tag, profile")
+                 if self.covers(stored, profile)}
+        missing = [p for p in filepaths if p not in found]
+        return found, missing
+
+    def get_many(self, filepaths, profile=None):
+        """
+        Returns {filepath: (tags, date_value)} for the unchanged files among
+        `filepaths` read with `profile` or a wider one (any profile if None).
+        """
+        return {path: (json.loads(tags), date_value)
+                for path, (tags, date_value, stored) in self._get_valid(filepaths, "tags, date_value, profile")
+                if profile is None or self.covers(stored, profile)}
+
+    def _get_valid(self, filepaths, columns):
+        """
+        Yields (filepath, (columns...)) for the files whose row still
+        matches their size and mtime.
+        """
+        stats = {}
+        for path in filepaths:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                pass
+
+        paths = list(stats)
+        for i in range(0, len(paths), _QUERY_CHUNK):
+            chunk = paths[i:i + _QUERY_CHUNK]
+            keys = {self._key(p): p for p in chunk}
+            marks = ",".join("?" * len(keys))
+            with self._lock:
+                if self._closed:
+                    return
+                rows = self._conn.execute(
+                    f"SELECT path, file_size, mtime_ns, {columns} FROM metadata WHERE path IN ({marks})",
+                    list(keys)).fetchall()
+            for key, file_size, mtime_ns, *values in rows:
+                path = keys[key]
+                st = stats[path]
+                if file_size == st.st_size and mtime_ns == st.st_mtime_ns:
+                    yield path, tuple(values)
+
+    def put(self, filepath, tags, date_value=None, date_tag=None, profile="full"):
+        self.put_many([(filepath, tags, date_value, date_tag)], profile)
+
+    def put_many(self, entries, profile="full"):
+        """
+        Stores (filepath, tags, date_value, date_tag) tuples read with tag
+        profile `profile` in one transaction, stamped with each file's
+        current size and mtime.
+        """
+        now = time.time()
+        rows = []
+        for filepath, tags, date_value, date_tag in entries:
+            try:
+                st = os.stat(filepath)
+            except OSError:
+                continue
+            rows.append((self._key(filepath), st.st_size, st.st_mtime_ns,
+                         None if date_value is None else str(date_value), date_tag,
+                         json.dumps(tags), now, profile))
+        if not rows:
+            return
+
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata "
+                "(path, file_size, mtime_ns, date_value, date_tag, tags, indexed_at, profile) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def remove(self, filepath):
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute("DELETE FROM metadata WHERE path = ?", (self._key(filepath),))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._conn.close()
+
+    def _key(self, filepath):
+        return normalize_path(filepath)
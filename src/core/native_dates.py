@@ -0,0 +1,223 @@
+import re
+import mmap
+import struct
+from datetime import datetime, timedelta
+
+from src.core.exif_parser import TiffReader, TAG_EXIF_IFD
+from src.core.dates import parse_exif_datetime
+
+TAG_DATE_TIME_ORIGINAL = 0x9003
+# EXIF offset tag ids -> ExifTool names
+OFFSET_TAGS = {
+    0x9010: 'EXIF:OffsetTime',
+    0x9011: 'EXIF:OffsetTimeOriginal',
+    0x9012: 'EXIF:OffsetTimeDigitized',
+}
+
+# ASCII values as stored, NUL included: anything else is left to ExifTool.
+_DATE_RE = re.compile(rb"^\d{4}:\d{2}:\d{2} \d{2}:\d{2}:\d{2}\0$")
+_OFFSET_RE = re.compile(rb"^[+-]\d{2}:\d{2}\0$")
+
+# JPEG APPn segments (marker -> payload prefixes) that hold nothing that
+# could stand in for the EXIF date. APP1 is handled separately.
+_JPEG_SEGMENTS = {
+    0xE0: (b"JFIF\0", b"JFXX\0"),
+    0xE2: (b"ICC_PROFILE\0", b"MPF\0"),
+    0xED: (b"Photoshop 3.0\0",),
+    0xEE: (b"Adobe",),
+}
+_XMP_HEADERS = (b"http://ns.adobe.com/xap/1.0/\0", b"http://ns.adobe.com/xmp/extension/\0")
+# XMP (or Photoshop) properties named like the tags read here would be
+# reported by ExifTool under the same name, so their files need ExifTool.
+_CLASHING_NAMES = (b"DateTimeOriginal", b"OffsetTime")
+
+# ISO-BMFF boxes whose contents cannot hold a competing date tag. Others
+# (uuid boxes, maker atoms, XMP_) may carry EXIF or XMP dates.
+_TOP_LEVEL_BOXES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pdin"}
+# Allowed children by container; udta also takes iTunes-style '\xa9xxx'
+# atoms. Containers not listed here are not looked into.
+_CHILD_BOXES = {
+    b"moov": {b"mvhd", b"trak", b"iods", b"mvex", b"udta", b"meta", b"free", b"skip"},
+    b"trak": {b"tkhd", b"edts", b"mdia", b"tref", b"tapt", b"load", b"udta", b"meta", b"free", b"skip"},
+    # 3GPP asset boxes
+    b"udta": {b"titl", b"auth", b"dscp", b"cprt", b"perf", b"gnre", b"rtng", b"clsf",
+              b"kywd", b"loci", b"albm", b"yrrc", b"meta", b"free", b"skip"},
+    b"meta": {b"hdlr", b"keys", b"ilst", b"free"},
+}
+# Seconds from 1904 (QuickTime's epoch) to 1970. ExifTool reads smaller
+# values as Unix times; those are left to it.
+_QUICKTIME_EPOCH_OFFSET = 2082844800
+
+
+def read_date_tags(filepath):
+    """
+    Reads the tags ExifTool would report as the 'Date Taken' of a plain
+    JPEG (EXIF DateTimeOriginal and offsets) or MP4/MOV (QuickTime
+    CreateDate from 'mvhd') straight from the file's headers.
+
+    Returns a dict shaped like ExifTool's `-G -n` JSON for those tags, or
+    None when the file needs ExifTool: other formats, no date, odd values,
+    or any structure that might hold a second tag of the same name.
+    """
+    lower = filepath.lower()
+    if lower.endswith(('.jpg', '.jpeg')):
+        parse = _jpeg_tags
+    elif lower.endswith(('.mp4', '.mov')):
+        parse = _quicktime_tags
+    else:
+        return None
+
+    try:
+        with open(filepath, "rb") as f:
+            # Only the pages the header walk touches are read from disk.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                tags = parse(data)
+    except (OSError, ValueError, struct.error, OverflowError):
+        return None
+    if tags is None:
+        return None
+    return {"SourceFile": filepath, **tags}
+
+
+def _jpeg_tags(data):
+    if data[:2] != b"\xff\xd8":
+        return None
+    exif = None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # fill byte
+            continue
+        if marker in (0xDA, 0xD9):
+            break  # start of scan: the metadata segments are over
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2  # no length
+            continue
+        (length,) = struct.unpack_from(">H", data, pos + 2)
+        end = pos + 2 + length
+        if length < 2 or end > len(data):
+            return None
+        if 0xE0 <= marker <= 0xEF:
+            segment = data[pos + 4:end]
+            if marker == 0xE1 and segment[:6] == b"Exif\0\0":
+                if exif is not None:
+                    return None
+                exif = segment
+            elif (marker == 0xE1 and segment.startswith(_XMP_HEADERS)
+                  or segment.startswith(_JPEG_SEGMENTS.get(marker, ()))):
+                if any(name in segment for name in _CLASHING_NAMES):
+                    return None
+            else:
+                return None
+        pos = end
+
+    if exif is None:
+        return None
+    return _exif_tags(exif)
+
+
+def _exif_tags(exif):
+    reader = TiffReader(exif, 6)
+    ifd0, _ = reader.read_ifd(reader.ifd0_offset)
+    exif_offset = reader.get(ifd0, TAG_EXIF_IFD)
+    if not isinstance(exif_offset, int):
+        return None
+    exif_ifd, _ = reader.read_ifd(exif_offset)
+
+    # A date or offset in IFD0 as well would be a duplicate.
+    if TAG_DATE_TIME_ORIGINAL in ifd0 or any(tag in ifd0 for tag in OFFSET_TAGS):
+        return None
+    date = _ascii(reader, exif_ifd.get(TAG_DATE_TIME_ORIGINAL), _DATE_RE)
+    if date is None or parse_exif_datetime(date) is None:
+        return None
+    tags = {'EXIF:DateTimeOriginal': date}
+    for tag, name in OFFSET_TAGS.items():
+        if tag in exif_ifd:
+            offset = _ascii(reader, exif_ifd[tag], _OFFSET_RE)
+            if offset is None:
+                return None
+            tags[name] = offset
+    return tags
+
+
+def _ascii(reader, entry, pattern):
+    if entry is None or entry[0] != 2:
+        return None
+    raw = reader.raw(entry)
+    if raw is None or not pattern.match(raw):
+        return None
+    return raw[:-1].decode("ascii")
+
+
+def _boxes(data, start, end):
+    """
+    Yields (type, content start, end) for the boxes between start and end.
+    """
+    pos = start
+    while pos < end:
+        if pos + 8 > end:
+            raise ValueError("Truncated box header")
+        size, kind = struct.unpack_from(">L4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                raise ValueError("Truncated box header")
+            (size,) = struct.unpack_from(">Q", data, pos + 8)
+            header = 16
+        elif size == 0:
+            size = end - pos  # runs to the end
+        if size < header or pos + size > end:
+            raise ValueError("Bad box size")
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _plain(data, kind, start, end):
+    """
+    True if box `kind` (contents start..end) holds only allowed boxes,
+    all the way down.
+    """
+    allowed = _CHILD_BOXES.get(kind)
+    if allowed is None:
+        return True
+    # An MP4 'meta' is a full box (version and flags first); a QuickTime
+    # one starts right away with its 'hdlr'.
+    if kind == b"meta" and data[start + 4:start + 8] != b"hdlr":
+        start += 4
+    for child, child_start, child_end in _boxes(data, start, end):
+        if kind == b"udta" and child[:1] == b"\xa9":
+            continue
+        if child not in allowed or not _plain(data, child, child_start, child_end):
+            return False
+    return True
+
+
+def _quicktime_tags(data):
+    moov = None
+    for kind, start, end in _boxes(data, 0, len(data)):
+        if kind not in _TOP_LEVEL_BOXES or (kind == b"moov" and moov is not None):
+            return None
+        if kind == b"moov":
+            moov = (start, end)
+    if moov is None or not _plain(data, b"moov", *moov):
+        return None
+
+    mvhd = [start for kind, start, _ in _boxes(data, *moov) if kind == b"mvhd"]
+    if len(mvhd) != 1:
+        return None
+    mvhd = mvhd[0]
+
+    version = data[mvhd]
+    if version == 0:
+        (created,) = struct.unpack_from(">L", data, mvhd + 4)
+    elif version == 1:
+        (created,) = struct.unpack_from(">Q", data, mvhd + 4)
+    else:
+        return None
+    if created < _QUICKTIME_EPOCH_OFFSET:
+        return None
+    value = datetime(1904, 1, 1) + timedelta(seconds=created)
+    return {'QuickTime:CreateDate': value.strftime("%Y:%m:%d %H:%M:%S")}
@@ -0,0 +1,72 @@
+import os
+import sys
+import shutil
+
+APP_NAME = "ExifEditor"
+
+
+def app_cache_dir():
+    """
+    Returns (and creates) the per-user cache directory for the application.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def app_data_dir():
+    """
+    Returns (and creates) the per-user data directory for the application:
+    for state that must survive cache clean-ups.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+
+    path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def normalize_path(path):
+    """
+    Canonical key for a file path, shared by the core and the GUI.
+    Absolute, and case-folded only where the filesystem is case-insensitive.
+    """
+    return os.path.normcase(os.path.abspath(path))
+
+
+def get_exiftool_path():
+    """
+    Locates the ExifTool executable: PATH first, then the usual places
+    next to the application. Returns None if it cannot be found.
+    """
+    # 1. Check if exiftool is in the system PATH
+    img_ext = shutil.which("exiftool")
+    if img_ext:
+        return img_ext
+
+    # 2. Check local 'libs' or 'core' or current dir
+    #    (Common pattern: rename 'exiftool(-k).exe' to 'exiftool.exe')
+    potential_paths = [
+        "exiftool.exe",
+        "src/core/exiftool.exe",
+        "src/libs/exiftool.exe",
+        "libs/exiftool.exe"
+    ]
+
+    for p in potential_paths:
+        if os.path.exists(p):
+            return os.path.abspath(p)
+
+    return None
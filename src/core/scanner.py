@@ -0,0 +1,78 @@
+import os
+
+SUPPORTED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.mp4', '.mov')
+
+
+def file_signature(st):
+    """
+    What counts as 'changed' for a file: size and modification time.
+    """
+    return st.st_size, st.st_mtime_ns
+
+
+def iter_folders(root, recursive=True, extensions=SUPPORTED_EXTENSIONS, cancel_event=None):
+    """
+    Walks `root` with os.scandir, yielding (folder, files, subfolders) per
+    directory, where files is a list of (filepath, stat_result) for the
+    supported files directly inside it. The stat results come from the
+    directory scan itself, so callers never need to stat again.
+    Unreadable directories are reported and yield no files.
+    """
+    # Explicit stack instead of recursion: archive trees can be deep.
+    stack = [root]
+    while stack:
+        if cancel_event and cancel_event.is_set():
+            return
+        folder = stack.pop()
+        files, subdirs = [], []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            files.append((entry.path, entry.stat()))
+                    except OSError as e:
+                        print(f"Error reading {entry.path}: {e}")
+        except OSError as e:
+            print(f"Error reading folder {folder}: {e}")
+
+        files.sort()
+        subdirs.sort()
+        yield folder, files, subdirs
+        if recursive:
+            # Reversed so sub-folders come out in name order.
+            stack.extend(reversed(subdirs))
+
+
+def iter_media_files(paths, recursive=True, extensions=SUPPORTED_EXTENSIONS, cancel_event=None):
+    """
+    Yields (filepath, stat_result) for every supported file under `paths`
+    (files and/or directories).
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    for path in paths:
+        if cancel_event and cancel_event.is_set():
+            return
+        if os.path.isdir(path):
+            for _, files, _ in iter_folders(path, recursive, extensions, cancel_event):
+                yield from files
+        elif path.lower().endswith(extensions):
+            try:
+                yield path, os.stat(path)
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+
+
+def diff_files(old, new):
+    """
+    Compares two {filepath: signature} maps.
+    Returns (added, removed, modified) lists of paths.
+    """
+    added = [path for path in new if path not in old]
+    removed = [path for path in old if path not in new]
+    modified = [path for path, sig in new.items() if path in old and old[path] != sig]
+    return added, removed, modified
@@ -0,0 +1,295 @@
+import os
+import re
+import shlex
+import calendar
+from datetime import datetime
+
+import numpy as np
+
+from src.core.dates import parse_date_taken
+
+# Searchable text fields -> ExifTool tag names (any group). Every present
+# tag contributes, so e.g. `place:` matches city or country.
+TEXT_FIELDS = {
+    'make': ['Make'],
+    'model': ['Model'],
+    'lens': ['LensID', 'LensModel', 'Lens'],
+    'type': ['FileType'],
+    'keywords': ['Keywords', 'Subject', 'HierarchicalSubject'],
+    'title': ['Title', 'ObjectName', 'ImageDescription', 'Description', 'Caption-Abstract'],
+    'place': ['City', 'Sub-location', 'Location', 'State', 'Province-State',
+              'Country', 'Country-PrimaryLocationName'],
+}
+
+# Numeric fields -> ExifTool tag names, first present wins.
+NUMERIC_FIELDS = {
+    'iso': ['ISO'],
+    'aperture': ['FNumber', 'Aperture'],
+    'focal': ['FocalLength'],
+    'exposure': ['ExposureTime', 'ShutterSpeed'],
+    'width': ['ImageWidth'],
+    'height': ['ImageHeight'],
+    'size': ['FileSize'],
+    'rating': ['Rating'],
+    'duration': ['Duration'],
+}
+
+# 'name' (the file name) is text too; 'date' is numeric, in wall-clock
+# seconds of the Date Taken; 'gps' is a flag.
+SEARCH_FIELDS = ['name', *TEXT_FIELDS, 'date', *NUMERIC_FIELDS, 'gps']
+
+_NUMBER_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+_DATE_RE = re.compile(r"^(\d{4})(?:[-:/](\d{1,2})(?:[-:/](\d{1,2}))?)?$")
+_YES = {'yes', 'y', 'true', '1'}
+_NO = {'no', 'n', 'false', '0'}
+
+
+def extract_search_fields(filepath, meta, date_value=None):
+    """
+    Reduces an ExifTool tag dict to the compact per-file record the search
+    index stores. `date_value` is the already chosen Date Taken string.
+    """
+    by_name = {}
+    for key, value in (meta or {}).items():
+        by_name.setdefault(key.rsplit(':', 1)[-1], value)
+
+    fields = {'name': os.path.basename(filepath).lower()}
+    for field, tags in TEXT_FIELDS.items():
+        values = []
+        for tag in tags:
+            value = by_name.get(tag)
+            if isinstance(value, list):
+                values.extend(str(v) for v in value)
+            elif value is not None and value != '':
+                values.append(str(value))
+        if values:
+            fields[field] = "\n".join(values).lower()
+
+    for field, tags in NUMERIC_FIELDS.items():
+        for tag in tags:
+            number = _number(by_name.get(tag))
+            if number is not None:
+                fields[field] = number
+                break
+
+    taken = parse_date_taken(date_value)
+    if taken:
+        fields['date'] = calendar.timegm(taken.local.timetuple())
+
+    fields['gps'] = (_number(by_name.get('GPSLatitude')) is not None
+                     and _number(by_name.get('GPSLongitude')) is not None)
+    return fields
+
+
+def _number(value):
+    """
+    ExifTool's -n output is numeric already; tolerate formatted values
+    ('1/250', '50.0 mm') from files indexed without it.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    if '/' in text:
+        num, _, den = text.partition('/')
+        try:
+            return float(num) / float(den)
+        except (ValueError, ZeroDivisionError):
+            return None
+    match = _NUMBER_RE.match(text)
+    return float(match.group()) if match else None
+
+
+class SearchIndex:
+    """
+    In-memory index of the search fields of every loaded file.
+
+    Numeric fields (and the date) are stored column-wise in NumPy arrays,
+    one slot per file with NaN for missing, so a range query is a single
+    vectorised comparison. Text fields are inverted: each distinct value
+    maps to the slots holding it, and a substring query only tests the
+    distinct values (a few hundred cameras or lenses, not every file).
+    Clauses combine as boolean masks. Removed or re-added files leave a
+    dead slot behind; nothing is ever re-read from ExifTool.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._slots = {}  # key -> slot
+        self._keys = []   # slot -> key
+        self._alive = np.zeros(0, dtype=bool)
+        self._gps = np.zeros(0, dtype=bool)
+        self._numeric = {f: np.zeros(0) for f in ('date', *NUMERIC_FIELDS)}
+        self._text = {f: {} for f in ('name', *TEXT_FIELDS)} # value -> [slots]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def add_many(self, entries):
+        """
+        Indexes {key: fields} as returned by extract_search_fields,
+        replacing earlier entries for the same keys.
+        """
+        self.remove_many(entries)
+        start = len(self._keys)
+        self._reserve(start + len(entries))
+
+        for slot, (key, fields) in enumerate(entries.items(), start):
+            self._slots[key] = slot
+            self._keys.append(key)
+            self._alive[slot] = True
+            self._gps[slot] = bool(fields.get('gps'))
+            for field, column in self._numeric.items():
+                value = fields.get(field)
+                column[slot] = np.nan if value is None else value
+            for field, postings in self._text.items():
+                value = fields.get(field)
+                if value:
+                    postings.setdefault(value, []).append(slot)
+
+    def remove_many(self, keys):
+        for key in keys:
+            slot = self._slots.pop(key, None)
+            if slot is not None:
+                self._alive[slot] = False
+
+    def query(self, text):
+        """
+        Returns the set of keys matching `text`; raises ValueError for
+        malformed queries. Whitespace-separated clauses must all match:
+
+            canon                  any text field contains 'canon'
+            lens:"50mm f/1.8"      quoted values may contain spaces
+            iso:>=800  focal:..50  aperture:1.4..2.8  exposure:<1/250
+            date:2021-06  date:2020..2021-03-15  date:>2022
+            gps:yes                -model:iphone (negation)
+        """
+        n = len(self._keys)
+        mask = self._alive[:n].copy()
+        try:
+            terms = shlex.split(text)
+        except ValueError as e:
+            raise ValueError(f"Bad query: {e}")
+
+        for term in terms:
+            negate = term.startswith('-') and len(term) > 1
+            if negate:
+                term = term[1:]
+            field, sep, value = term.partition(':')
+            if not sep:
+                field, value = None, term
+            field = field.lower() if field else None
+            if field is not None and field not in SEARCH_FIELDS:
+                raise ValueError(f"Unknown field '{field}' (one of: {', '.join(SEARCH_FIELDS)})")
+
+            clause = self._clause(field, value.strip(), n)
+            mask &= ~clause if negate else clause
+        return {self._keys[slot] for slot in np.flatnonzero(mask)}
+
+    def _clause(self, field, value, n):
+        if field == 'gps':
+            if value.lower() in _YES:
+                return self._gps[:n].copy()
+            if value.lower() in _NO:
+                return ~self._gps[:n]
+            raise ValueError(f"gps: expects yes or no, not '{value}'")
+        if field == 'date':
+            low, high = _range(value, _date_bounds)
+            return _between(self._numeric['date'][:n], low, high)
+        if field in NUMERIC_FIELDS:
+            low, high = _range(value, _number_bounds)
+            return _between(self._numeric[field][:n], low, high)
+
+        # Text: substring over the distinct values of one field, or of all.
+        needle = value.lower()
+        mask = np.zeros(n, dtype=bool)
+        fields = [field] if field else list(self._text)
+        for name in fields:
+            for text, slots in self._text[name].items():
+                if needle in text:
+                    mask[slots] = True
+        return mask
+
+    def _reserve(self, size):
+        capacity = len(self._alive)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        self._alive = _grown(self._alive, capacity, False)
+        self._gps = _grown(self._gps, capacity, False)
+        for field, column in self._numeric.items():
+            self._numeric[field] = _grown(column, capacity, np.nan)
+
+
+def _grown(array, capacity, fill):
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _between(column, low, high):
+    # NaN (missing) compares False, so files without the field never match.
+    with np.errstate(invalid='ignore'):
+        mask = np.isfinite(column)
+        if low is not None:
+            mask &= column >= low
+        if high is not None:
+            mask &= column < high
+    return mask
+
+
+def _range(value, bounds):
+    """
+    Parses 'a..b', '>=a', '>a', '<=a', '<a' or 'a' into [low, high) using
+    bounds(text) -> (start, end) of the smallest unit the text names.
+    """
+    if '..' in value:
+        low, _, high = value.partition('..')
+        return (bounds(low)[0] if low else None,
+                bounds(high)[1] if high else None)
+    for op in ('>=', '<=', '>', '<'):
+        if value.startswith(op):
+            start, end = bounds(value[len(op):])
+            return {'>=': (start, None), '>': (end, None),
+                    '<=': (None, end), '<': (None, start)}[op]
+    return bounds(value)
+
+
+def _number_bounds(text):
+    number = _number(text)
+    if number is None or not _NUMBER_RE.match(text.strip()):
+        raise ValueError(f"Not a number: '{text}'")
+    # Exact match with room for float noise (1/250 stored as 0.004).
+    tolerance = 1e-6 * max(1.0, abs(number))
+    return number - tolerance, number + tolerance
+
+
+def _date_bounds(text):
+    """
+    '2021' -> that year, '2021-06' -> that month, '2021-06-03' -> that day,
+    as [start, end) wall-clock seconds.
+    """
+    match = _DATE_RE.match(text.strip())
+    if not match:
+        raise ValueError(f"Not a date (YYYY[-MM[-DD]]): '{text}'")
+    year, month, day = (int(g) if g else None for g in match.groups())
+    try:
+        if day:
+            start = datetime(year, month, day)
+            end = datetime.fromordinal(start.toordinal() + 1)
+        elif month:
+            start = datetime(year, month, 1)
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+        else:
+            start, end = datetime(year, 1, 1), datetime(year + 1, 1, 1)
+    except ValueError:
+        raise ValueError(f"Not a date: '{text}'")
+    return calendar.timegm(start.timetuple()), calendar.timegm(end.timetuple())
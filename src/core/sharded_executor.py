@@ -0,0 +1,146 @@
+import os
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+# Fewer files than this per process and starting ExifTool costs more than
+# the parallelism saves.
+MIN_FILES_PER_PROCESS = 100
+# Median file size above which ExifTool mostly waits on the disk (seeking
+# through video containers) rather than parsing, so fewer processes help.
+IO_BOUND_MEDIAN_BYTES = 32 * 1024 * 1024
+# Bytes per chunk, so a chunk of large videos doesn't hold up a process
+# for as long as hundreds of photos.
+MAX_CHUNK_BYTES = 1024 * 1024 * 1024
+# Files stat'ed to judge the size mix when sizes aren't known.
+SIZE_SAMPLE = 256
+
+
+def plan_chunks(filepaths, chunk_size=200, first_chunk=None, sizes=None, max_bytes=MAX_CHUNK_BYTES):
+    """
+    Splits `filepaths` into consecutive chunks of at most `chunk_size` files
+    and `max_bytes` bytes (a single larger file gets a chunk of its own).
+    `first_chunk` optionally caps the first one, so early results come
+    back quickly. `sizes` maps path -> bytes; missing sizes count as 0.
+    """
+    sizes = sizes or {}
+    chunks = []
+    chunk, chunk_bytes = [], 0
+    limit = first_chunk or chunk_size
+    for path in filepaths:
+        size = sizes.get(path, 0)
+        if chunk and (len(chunk) >= limit or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+            limit = chunk_size
+        chunk.append(path)
+        chunk_bytes += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def plan_processes(filepaths, sizes=None, cpu_count=None):
+    """
+    Number of ExifTool processes worth running for `filepaths`: one per
+    core for photo-sized files, half as many when large files dominate,
+    and never more than the batch keeps busy. `sizes` (path -> bytes)
+    is sampled from disk when not given.
+    """
+    cores = cpu_count or os.cpu_count() or 1
+    count = cores
+    if sizes is None:
+        # An evenly spaced sample is enough for the median.
+        step = max(1, len(filepaths) // SIZE_SAMPLE)
+        sizes = file_sizes(filepaths[::step])
+    values = sorted(sizes.values())
+    if values and values[len(values) // 2] > IO_BOUND_MEDIAN_BYTES:
+        count = max(1, cores // 2)
+    count = min(count, math.ceil(len(filepaths) / MIN_FILES_PER_PROCESS))
+    return max(1, count)
+
+
+def file_sizes(filepaths):
+    sizes = {}
+    for path in filepaths:
+        try:
+            sizes[path] = os.path.getsize(path)
+        except OSError:
+            pass
+    return sizes
+
+
+class ShardedExecutor:
+    """
+    Runs chunks of a large file list on several pooled ExifTool processes.
+
+    One thread per process calls `fn(chunk)`, which borrows its own
+    session from the pool; the pool is expanded to `processes` (plus
+    `reserve` left for interactive reads) while the executor runs. Results
+    come back in input order. At most `window` chunks are outstanding
+    (running, or finished but waiting for an earlier one), so a slow chunk
+    stalls submission instead of piling up results.
+    """
+
+    def __init__(self, pool, processes, reserve=0, window=None):
+        self.pool = pool
+        self.processes = max(1, processes)
+        self.reserve = reserve
+        self.window = window or self.processes * 2
+
+    def map(self, fn, chunks, retries=1, on_failure=None, cancel_event=None):
+        """
+        Yields (chunk, result) in the order of `chunks`.
+
+        A chunk whose fn raises is retried up to `retries` times (the pool
+        has replaced a crashed or timed-out process by then); after that
+        `on_failure(chunk, error)` supplies the result, or the error is
+        re-raised. Once `cancel_event` is set, chunks not started yet (or
+        failing) are yielded with a None result.
+        """
+        chunks = list(chunks)
+        if not chunks:
+            return
+        if len(chunks) == 1 or self.processes == 1:
+            # Nothing to overlap; stay on the caller's thread.
+            for chunk in chunks:
+                if cancel_event and cancel_event.is_set():
+                    yield chunk, None
+                else:
+                    yield chunk, self._attempt(fn, chunk, retries, on_failure, cancel_event)
+            return
+
+        with self.pool.expanded(self.processes + self.reserve), \
+                ThreadPoolExecutor(max_workers=self.processes, thread_name_prefix="exiftool-shard") as executor:
+            pending = {}  # chunk index -> future
+            next_submit = 0
+            try:
+                for index, chunk in enumerate(chunks):
+                    while (next_submit < len(chunks) and next_submit - index < self.window
+                           and not (cancel_event and cancel_event.is_set())):
+                        pending[next_submit] = executor.submit(
+                            self._attempt, fn, chunks[next_submit], retries, on_failure, cancel_event)
+                        next_submit += 1
+
+                    future = pending.pop(index, None)
+                    # Never submitted when cancelled.
+                    yield chunk, future.result() if future else None
+            finally:
+                # Consumer gone or an error: don't start what is still queued.
+                for future in pending.values():
+                    future.cancel()
+
+    def _attempt(self, fn, chunk, retries, on_failure, cancel_event):
+        if cancel_event and cancel_event.is_set():
+            return None
+        for attempt in range(retries + 1):
+            try:
+                return fn(chunk)
+            except Exception as e:
+                if cancel_event and cancel_event.is_set():
+                    return None
+                if attempt < retries:
+                    print(f"Retrying a chunk of {len(chunk)} file(s) after error: {e}")
+                    continue
+                if on_failure is None:
+                    raise
+                return on_failure(chunk, e)
@@ -0,0 +1,183 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+from src.core.paths import app_cache_dir, normalize_path
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+
+# Sampled from the head and tail of the file, so hashing a 100 MB video
+# does not cost more than decoding it would.
+_HASH_SAMPLE = 64 * 1024
+
+
+def file_digest(filepath, file_size):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(file_size).encode())
+    with open(filepath, "rb") as f:
+        h.update(f.read(_HASH_SAMPLE))
+        if file_size > 2 * _HASH_SAMPLE:
+            f.seek(-_HASH_SAMPLE, os.SEEK_END)
+            h.update(f.read(_HASH_SAMPLE))
+    return h.hexdigest()
+
+
+class ThumbnailCache:
+    """
+    Persistent thumbnail store backed by a single SQLite file.
+
+    Entries are keyed by (path, thumbnail size) and validated against the
+    file's size and mtime (plus an optional sampled content hash), so a
+    changed file simply misses and its stale entry is dropped. The total
+    blob size is kept under `max_bytes` by evicting least recently used
+    entries.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            path TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            file_size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            digest TEXT,
+            data BLOB NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (path, width, height)
+        );
+        CREATE INDEX IF NOT EXISTS idx_thumbnails_access ON thumbnails (last_access);
+    """
+
+    # Skip rewriting last_access on hits more often than this; LRU order
+    # does not need sub-minute precision.
+    _TOUCH_INTERVAL = 60.0
+
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES, hash_content=False):
+        self.db_path = db_path or os.path.join(app_cache_dir(), "thumbnails.db")
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        row = self._conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM thumbnails").fetchone()
+        self._total_bytes = row[0]
+
+    def get(self, filepath, size, stat=None):
+        """
+        Returns the encoded thumbnail bytes, or None on a miss.
+        `stat` may be passed in when the caller already has it.
+        """
+        key = self._key(filepath)
+        try:
+            st = stat or os.stat(filepath)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT file_size, mtime_ns, digest, data, last_access FROM thumbnails "
+                "WHERE path = ? AND width = ? AND height = ?",
+                (key, size[0], size[1])).fetchone()
+        if row is None:
+            return None
+
+        file_size, mtime_ns, digest, data, last_access = row
+        valid = file_size == st.st_size and mtime_ns == st.st_mtime_ns
+        if valid and self.hash_content:
+            try:
+                valid = digest == file_digest(filepath, st.st_size)
+            except OSError:
+                valid = False
+
+        with self._lock:
+            if self._closed:
+                return None
+            if not valid:
+                self._delete(key, size, len(data))
+                return None
+
+            now = time.time()
+            if now - last_access > self._TOUCH_INTERVAL:
+                self._conn.execute(
+                    "UPDATE thumbnails SET last_access = ? WHERE path = ? AND width = ? AND height = ?",
+                    (now, key, size[0], size[1]))
+                self._conn.commit()
+        return data
+
+    def put(self, filepath, size, data, stat=None):
+        """
+        Stores encoded thumbnail bytes for the file's current state.
+        """
+        key = self._key(filepath)
+        try:
+            st = stat or os.stat(filepath)
+            digest = file_digest(filepath, st.st_size) if self.hash_content else None
+        except OSError:
+            return
+
+        with self._lock:
+            if self._closed:
+                return
+            old = self._conn.execute(
+                "SELECT LENGTH(data) FROM thumbnails WHERE path = ? AND width = ? AND height = ?",
+                (key, size[0], size[1])).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbnails "
+                "(path, width, height, file_size, mtime_ns, digest, data, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, size[0], size[1], st.st_size, st.st_mtime_ns, digest,
+                 sqlite3.Binary(data), time.time()))
+            self._total_bytes += len(data) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute("DELETE FROM thumbnails")
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._conn.close()
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _key(self, filepath):
+        return normalize_path(filepath)
+
+    def _delete(self, key, size, nbytes):
+        self._conn.execute(
+            "DELETE FROM thumbnails WHERE path = ? AND width = ? AND height = ?",
+            (key, size[0], size[1]))
+        self._conn.commit()
+        self._total_bytes -= nbytes
+
+    def _evict(self):
+        # Trim to 90% of the budget so we don't evict on every insert.
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT path, width, height, LENGTH(data) FROM thumbnails ORDER BY last_access").fetchall()
+        doomed = []
+        for path, width, height, nbytes in rows:
+            if self._total_bytes <= target:
+                break
+            doomed.append((path, width, height))
+            self._total_bytes -= nbytes
+        self._conn.executemany(
+            "DELETE FROM thumbnails WHERE path = ? AND width = ? AND height = ?", doomed)
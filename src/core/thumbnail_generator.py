@@ -0,0 +1,162 @@
+import io
+
+from PIL import Image, ImageOps
+
+from src.core.exif_parser import exif_thumbnail_bytes, TAG_ORIENTATION
+from src.core.video_thumbnail import generate_video_thumbnail, embedded_video_thumbnail
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv')
+
+# Decode strategies for JPEGs, cheapest first:
+#   embedded - MPF preview image or EXIF/IFD1 thumbnail, if big enough
+#   draft    - DCT-domain downscaling (1/2, 1/4, 1/8) via Image.draft
+#   full     - full-resolution decode
+IMAGE_TIERS = ("embedded", "draft", "full")
+
+_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def generate_thumbnail(path, size=(200, 200), preview_source=None):
+    """
+    Returns a PIL image no larger than `size`, or None.
+    `preview_source(path)` may supply a video's embedded preview image.
+    """
+    img, _ = thumbnail_with_tier(path, size, preview_source)
+    return img
+
+
+def thumbnail_with_tier(path, size=(200, 200), preview_source=None):
+    """
+    generate_thumbnail, also returning how the image was made: an image
+    tier, 'video' (a decoded frame) or 'video.embedded'.
+    """
+    if is_video(path):
+        if preview_source:
+            img = embedded_video_thumbnail(path, size, preview_source)
+            if img is not None:
+                return img, "video.embedded"
+        return generate_video_thumbnail(path, size), "video"
+    return generate_image_thumbnail(path, size)
+
+
+def is_video(path):
+    return path.lower().endswith(VIDEO_EXTENSIONS)
+
+
+def generate_image_thumbnail(path, size=(200, 200), tiers=IMAGE_TIERS):
+    """
+    Returns (PIL image, tier used). Non-JPEGs always take the full decode.
+    """
+    with Image.open(path) as img:
+        if img.format in ("JPEG", "MPO"):
+            orientation = img.getexif().get(TAG_ORIENTATION, 1)
+            for tier in tiers:
+                if tier == "embedded":
+                    thumb = _embedded_preview(img, size)
+                elif tier == "draft":
+                    thumb = _draft_decode(img, size)
+                else:
+                    thumb = _full_decode(img, size)
+                if thumb is not None:
+                    # Previews and draft decodes carry no orientation of their
+                    # own; apply the main image's.
+                    method = _TRANSPOSE.get(orientation)
+                    if method is not None:
+                        thumb = thumb.transpose(method)
+                    return thumb, tier
+            return None, None
+
+        img = ImageOps.exif_transpose(img) # Handle rotation
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return img, "full"
+
+
+def _covers(candidate_size, full_size, size):
+    """
+    A preview is usable if it does not need upscaling to fill `size` and has
+    the same aspect ratio (EXIF thumbnails are often letterboxed 160x120).
+    """
+    w, h = candidate_size
+    fw, fh = full_size
+    if not w or not h or not fw or not fh:
+        return False
+    if abs(w / h - fw / fh) > 0.02 * (fw / fh):
+        return False
+    return w >= min(size[0], fw) or h >= min(size[1], fh)
+
+
+def _embedded_preview(img, size):
+    full_size = img.size
+
+    # MPF (multi-picture) JPEGs from many cameras carry a ~1920px preview.
+    frames = getattr(img, "n_frames", 1)
+    for frame in range(1, frames):
+        try:
+            img.seek(frame)
+            if _covers(img.size, full_size, size):
+                img.draft("RGB", size)
+                preview = img.convert("RGB")
+                preview.thumbnail(size, Image.Resampling.LANCZOS)
+                return preview
+        except Exception:
+            break
+        finally:
+            img.seek(0)
+
+    data = exif_thumbnail_bytes(img.info.get("exif", b""))
+    if data:
+        try:
+            with Image.open(io.BytesIO(data)) as preview:
+                if _covers(preview.size, full_size, size):
+                    preview = preview.convert("RGB")
+                    preview.thumbnail(size, Image.Resampling.LANCZOS)
+                    return preview
+        except Exception:
+            pass
+    return None
+
+
+def _draft_decode(img, size):
+    # draft() picks the largest DCT scale that still yields >= size.
+    if img.draft("RGB", size) is None:
+        return None
+    img.thumbnail(size, Image.Resampling.LANCZOS)
+    return img.copy()
+
+
+def _full_decode(img, size):
+    # thumbnail() would otherwise draft() on its own (reducing_gap).
+    img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=None)
+    return img.copy()
+
+
+def render_thumbnail(path, size=(200, 200)):
+    """
+    generate_thumbnail + encode_thumbnail in one call, for worker processes:
+    only the small encoded result crosses the process boundary.
+    Returns (bytes or None, tier).
+    """
+    img, tier = thumbnail_with_tier(path, size)
+    if img is None:
+        return None, tier
+    return encode_thumbnail(img), tier
+
+
+def encode_thumbnail(img):
+    """
+    Compact encoding for the disk cache: JPEG unless there is alpha to keep.
+    """
+    buf = io.BytesIO()
+    if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+        img.save(buf, "PNG")
+    else:
+        img.convert("RGB").save(buf, "JPEG", quality=85)
+    return buf.getvalue()
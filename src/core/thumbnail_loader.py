@@ -1,81 +1,122 @@
-
 import os
-import cv2
-from PyQt6.QtCore import QRunnable, pyqtSignal, QObject, Qt
-from PyQt6.QtGui import QImage, QPixmap
-from PIL import Image, ImageOps
+import sys
+import time
+from PyQt6.QtCore import QRunnable, pyqtSignal, QObject
+from PyQt6.QtGui import QImage
+
+from src.core.thumbnail_generator import thumbnail_with_tier, encode_thumbnail, render_thumbnail, is_video
+from src.core.video_thumbnail import embedded_video_thumbnail
+from src.core.instrumentation import instruments
 
 class WorkerSignals(QObject):
-    finished = pyqtSignal(str, QPixmap) # filepath, pixmap
+    finished = pyqtSignal(str, QImage) # filepath, image (QPixmap is GUI-thread only)
     error = pyqtSignal(str, str)
 
 class ThumbnailWorker(QRunnable):
-    def __init__(self, filepath, size=(200, 200)):
+    def __init__(self, filepath, size=(200, 200), cache=None, executor=None, preview_source=None):
         super().__init__()
         self.filepath = filepath
         self.size = size
+        self.cache = cache
+        # Optional process pool; decoding then runs outside this process.
+        self.executor = executor
+        # Optional callable(path) -> embedded video preview bytes or None.
+        self.preview_source = preview_source
         self.signals = WorkerSignals()
 
     def run(self):
         try:
-            pixmap = self.generate_thumbnail(self.filepath)
-            if pixmap:
+            image = self.load_thumbnail(self.filepath)
+            if image is not None and not image.isNull():
                 try:
-                    self.signals.finished.emit(self.filepath, pixmap)
+                    self.signals.finished.emit(self.filepath, image)
                 except RuntimeError:
                     # Handle case where receiver is gone if app closed
                     pass
             else:
+                instruments.count("thumbnail.errors")
                 self.signals.error.emit(self.filepath, "Could not generate thumbnail")
         except Exception as e:
+            instruments.count("thumbnail.errors")
             self.signals.error.emit(self.filepath, str(e))
 
-    def generate_thumbnail(self, path):
-        if path.lower().endswith(('.mp4', '.mov', '.avi', '.mkv')):
-            return self.get_video_thumbnail(path)
-        else:
-            return self.get_image_thumbnail(path)
+    def load_thumbnail(self, path):
+        """
+        Returns a QImage, served from the disk cache when the file is unchanged.
+        """
+        st = os.stat(path)
+        if self.cache:
+            data = self.cache.get(path, self.size, stat=st)
+            if data:
+                image = QImage.fromData(data)
+                if not image.isNull():
+                    instruments.count("thumbnail_cache.hit")
+                    return image
+            instruments.count("thumbnail_cache.miss")
 
-    def get_image_thumbnail(self, path):
-        try:
-            img = Image.open(path)
-            img = ImageOps.exif_transpose(img) # Handle rotation
-            img.thumbnail(self.size, Image.Resampling.LANCZOS)
-            
-            # Correct Color Conversion: Format_RGBA8888 expects R,G,B,A order in memory.
-            # PIL convert("RGBA") ensures R,G,B,A order.
-            img = img.convert("RGBA")
-            data = img.tobytes("raw", "RGBA")
-            
-            qim = QImage(data, img.width, img.height, QImage.Format.Format_RGBA8888)
-            return QPixmap.fromImage(qim)
+        if self.executor:
+            # Embedded previews are cheap to fetch; only decode in a process.
+            img = None
+            if self.preview_source and is_video(path):
+                start = time.perf_counter()
+                img = embedded_video_thumbnail(path, self.size, self.preview_source)
+                if img is not None:
+                    instruments.add_time("thumbnail.decode.video.embedded", time.perf_counter() - start, start)
+            data = encode_thumbnail(img) if img is not None else self.render_in_process(path)
+            if data is None:
+                return None
+            if self.cache:
+                self.cache.put(path, self.size, data, stat=st)
+            return QImage.fromData(data)
+
+        img = self.generate_thumbnail(path)
+        if img is None:
+            return None
 
+        if self.cache:
+            self.cache.put(path, self.size, encode_thumbnail(img), stat=st)
+        return self.to_qimage(img)
+
+    def generate_thumbnail(self, path):
+        try:
+            start = time.perf_counter()
+            img, tier = thumbnail_with_tier(path, self.size, self.preview_source)
+            instruments.add_time(f"thumbnail.decode.{tier}", time.perf_counter() - start, start)
+            return img
         except Exception as e:
-            print(f"Error loading image thumbnail {path}: {e}")
+            print(f"Error loading thumbnail {path}: {e}")
             return None
 
-    def get_video_thumbnail(self, path):
+    def render_in_process(self, path):
         try:
-            cap = cv2.VideoCapture(path)
-            ret, frame = cap.read()
-            cap.release()
-            
-            if not ret:
-                return None
-                
-            # OpenCV is BGR. Convert to RGB.
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            qimg = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            # Scale it down
-            pixmap = QPixmap.fromImage(qimg)
-            # Fix: Use correct positional/keyword arguments for Qt6
-            # scaled(w, h, aspectRatioMode)
-            return pixmap.scaled(self.size[0], self.size[1], Qt.AspectRatioMode.KeepAspectRatio)
-            
+            # Timed from here, so includes the wait for a free process.
+            start = time.perf_counter()
+            data, tier = self.executor.submit(render_thumbnail, path, self.size).result()
+            instruments.add_time(f"thumbnail.decode.{tier}", time.perf_counter() - start, start)
+            return data
         except Exception as e:
-            print(f"Error loading video thumbnail {path}: {e}")
+            print(f"Error loading thumbnail {path}: {e}")
             return None
+
+    def to_qimage(self, img):
+        """
+        Copies a PIL image straight into a QImage that owns its pixels.
+
+        RGB32/ARGB32 are what QPixmap uses natively, so the GUI thread
+        uploads without converting, and at 4 bytes per pixel scanlines are
+        never padded: one copy out of Pillow, one into the QImage.
+        """
+        little = sys.byteorder == "little"
+        if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+            img = img.convert("RGBA")
+            fmt, raw = QImage.Format.Format_ARGB32, ("BGRA" if little else "ARGB")
+        else:
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            fmt, raw = QImage.Format.Format_RGB32, ("BGRX" if little else "XRGB")
+
+        qim = QImage(img.width, img.height, fmt)
+        bits = qim.bits()
+        bits.setsize(qim.sizeInBytes())
+        bits[:] = img.tobytes("raw", raw)
+        return qim
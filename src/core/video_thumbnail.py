@@ -0,0 +1,110 @@
+import io
+import time
+
+import cv2
+from PIL import Image
+
+# Where to grab a frame, as a fraction of the clip: far enough in to skip
+# black fade-ins and slates. Tried in order until one is not near-black.
+SEEK_POSITIONS = (0.03, 0.10)
+
+# FFmpeg otherwise starts one decoder thread per core for every clip, which
+# oversubscribes the CPU when several thumbnails are decoded in parallel.
+DECODER_THREADS = 2
+
+# Per-file budget, so a corrupt or stalled file cannot pin a worker. FFmpeg
+# aborts an open or a single read that runs past it; between reads the
+# overall deadline is checked, so a file costs at most about twice this.
+TIMEOUT = 10.0
+
+# Mean pixel value (0-255) below which a frame counts as black.
+DARK_FRAME_MEAN = 16
+
+
+def generate_video_thumbnail(path, size=(200, 200), timeout=TIMEOUT):
+    """
+    Returns a PIL image no larger than `size`, or None, decoded from a
+    single frame a few percent into the clip. Callers try
+    embedded_video_thumbnail first.
+    """
+    frame = _grab_frame(path, size, timeout)
+    if frame is None:
+        return None
+    # OpenCV is BGR. Convert to RGB (after downscaling: far fewer pixels).
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+
+def embedded_video_thumbnail(path, size, preview_source):
+    """
+    Decodes the container's cover art/preview image if it is big enough.
+    """
+    try:
+        data = preview_source(path)
+    except Exception as e:
+        print(f"Error reading preview of {path}: {e}")
+        return None
+    if not data:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.width < size[0] and img.height < size[1]:
+                return None # would need upscaling; a real frame looks better
+            img.draft("RGB", size)
+            img = img.convert("RGB")
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+            return img
+    except Exception:
+        return None
+
+
+def _grab_frame(path, size, timeout):
+    """
+    Returns a BGR frame already shrunk to fit `size`, or None.
+    """
+    deadline = time.monotonic() + timeout
+    timeout_ms = int(timeout * 1000)
+    # FFmpeg's interrupt callback enforces these on the open and on each
+    # seek/read; the deadline below bounds the sequence of them.
+    params = [
+        cv2.CAP_PROP_N_THREADS, DECODER_THREADS,
+        cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+        cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms,
+    ]
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, params)
+    if not cap.isOpened():
+        return None
+    try:
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        duration_ms = frames / fps * 1000 if frames > 0 and fps > 0 else 0
+
+        # The seek lands on the preceding keyframe and decodes forward from
+        # there, so it costs at most one GOP, not the clip up to that point.
+        positions = [duration_ms * f for f in SEEK_POSITIONS] if duration_ms else []
+        fallback = None
+        for position in positions + [0]:
+            if time.monotonic() > deadline:
+                print(f"Video thumbnail timed out: {path}")
+                break
+            cap.set(cv2.CAP_PROP_POS_MSEC, position)
+            ok, frame = cap.read()
+            if not ok or frame is None:
+                continue
+            frame = _shrink(frame, size)
+            if frame.mean() >= DARK_FRAME_MEAN:
+                return frame
+            if fallback is None:
+                fallback = frame
+        return fallback
+    finally:
+        cap.release()
+
+
+def _shrink(frame, size):
+    h, w = frame.shape[:2]
+    scale = min(size[0] / w, size[1] / h)
+    if scale >= 1:
+        return frame
+    new_size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from src.core.paths import app_data_dir
+
+
+class WriteJournal:
+    """
+    Persistent undo log for metadata writes.
+
+    Every write job is a batch. Before ExifTool touches a chunk of files,
+    the original values of the tags it may change are appended for the
+    whole chunk in one transaction (a single fsync, not one per file); the
+    per-file outcome is recorded after the write. A batch left 'open' by a
+    crash is reported as 'interrupted' and can be rolled back like any
+    other.
+    """
+
+    # Batch states
+    OPEN = "open"
+    DONE = "done"
+    INTERRUPTED = "interrupted"
+    ROLLED_BACK = "rolled_back"
+
+    # Entry states: journaled before the write, then written or failed;
+    # restored once rolled back. A failed restore keeps the entry written
+    # (with its error), so the rollback can be retried.
+    JOURNALED = "journaled"
+    WRITTEN = "written"
+    FAILED = "failed"
+    RESTORED = "restored"
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            state TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entries (
+            batch_id INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+            path TEXT NOT NULL,
+            original TEXT NOT NULL,
+            state TEXT NOT NULL,
+            error TEXT,
+            PRIMARY KEY (batch_id, path)
+        );
+    """
+
+    def __init__(self, db_path=None, keep_batches=100):
+        self.db_path = db_path or os.path.join(app_data_dir(), "write_journal.db")
+        self.keep_batches = keep_batches
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Originals must be on disk before the file is rewritten.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self._SCHEMA)
+
+    def begin(self, description):
+        """
+        Opens a batch and returns its id.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO batches (description, state, created_at) VALUES (?, ?, ?)",
+                (description, self.OPEN, time.time()))
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def record(self, batch_id, originals):
+        """
+        Appends {filepath: {tag: original value}} for files about to be
+        written, in one transaction.
+        """
+        if not originals:
+            return
+        rows = [(batch_id, path, json.dumps(tags, ensure_ascii=False), self.JOURNALED)
+                for path, tags in originals.items()]
+        with self._lock:
+            # A file written twice in one batch keeps its first original.
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entries (batch_id, path, original, state) VALUES (?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def mark(self, batch_id, results, success_state=WRITTEN, failure_state=FAILED):
+        """
+        Records {filepath: None or error message} for journaled files.
+        With `failure_state` None, failed files keep their state and only
+        the error is recorded.
+        """
+        if not results:
+            return
+        rows = [(success_state if error is None else failure_state, error, batch_id, path)
+                for path, error in results.items()]
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE entries SET state = COALESCE(?, state), error = ? WHERE batch_id = ? AND path = ?", rows)
+            self._conn.commit()
+
+    def finish(self, batch_id, state=DONE):
+        """
+        Closes a batch and drops the oldest beyond `keep_batches`.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE batches SET state = ? WHERE id = ?", (state, batch_id))
+            self._conn.execute(
+                "DELETE FROM batches WHERE id NOT IN (SELECT id FROM batches ORDER BY id DESC LIMIT ?)",
+                (self.keep_batches,))
+            self._conn.commit()
+
+    def recover(self):
+        """
+        Marks batches a previous run left open as interrupted.
+        Returns their ids.
+        """
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM batches WHERE state = ?", (self.OPEN,))]
+            if ids:
+                self._conn.execute("UPDATE batches SET state = ? WHERE state = ?",
+                                   (self.INTERRUPTED, self.OPEN))
+                self._conn.commit()
+        return ids
+
+    def batches(self, limit=20):
+        """
+        Most recent batches first, as dicts with id, description, state,
+        created_at and the number of files written (or possibly written).
+        """
+        return self._batches("ORDER BY b.id DESC LIMIT ?", (limit,))
+
+    def batch(self, batch_id):
+        found = self._batches("WHERE b.id = ?", (batch_id,))
+        return found[0] if found else None
+
+    def _batches(self, clause, params):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT b.id, b.description, b.state, b.created_at, "
+                "       (SELECT COUNT(*) FROM entries e WHERE e.batch_id = b.id AND e.state IN (?, ?)) "
+                f"FROM batches b {clause}",
+                (self.JOURNALED, self.WRITTEN, *params)).fetchall()
+        return [dict(id=id_, description=description, state=state, created_at=created_at, files=files)
+                for id_, description, state, created_at, files in rows]
+
+    def originals(self, batch_id):
+        """
+        {filepath: {tag: original value}} for the batch's files that were
+        (or, after a crash, may have been) written.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, original FROM entries WHERE batch_id = ? AND state IN (?, ?)",
+                (batch_id, self.JOURNALED, self.WRITTEN)).fetchall()
+        return {path: json.loads(original) for path, original in rows}
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._conn.close()
@@ -0,0 +1,34 @@
+import threading
+
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+
+class BatchWriteSignals(QObject):
+    progress = pyqtSignal(int, int) # done, total
+    finished = pyqtSignal(dict) # {filepath: None or error message}
+
+
+class BatchWriteWorker(QRunnable):
+    """
+    Runs a metadata write job off the GUI thread.
+
+    `job` is called as job(progress_callback, cancel_event) and returns
+    {filepath: None or error message}, e.g. a bound ExifHandler.update_dates.
+    """
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.cancel_event = threading.Event()
+        self.signals = BatchWriteSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            results = self.job(self.signals.progress.emit, self.cancel_event)
+        except Exception as e:
+            print(f"Batch write error: {e}")
+            results = {}
+        self.signals.finished.emit(results)
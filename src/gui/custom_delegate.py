@@ -1,35 +1,58 @@
 
 from PyQt6.QtWidgets import QStyledItemDelegate, QStyle
 from PyQt6.QtCore import Qt, QRect, QSize
-from PyQt6.QtGui import QPen, QColor, QBrush, QFontMetrics
+from PyQt6.QtGui import QPen, QColor, QBrush, QFontMetrics, QPainter
+
+from src.gui.thumbnail_model import ThumbnailModel
 
 class ThumbnailDelegate(QStyledItemDelegate):
-    def __init__(self, parent=None):
+    # Band above every cell while a timeline is grouped; the first file of
+    # a group draws its header there, the others leave it blank.
+    HEADER_HEIGHT = 24
+
+    def __init__(self, parent=None, icon_size=180):
         super().__init__(parent)
         self.padding = 4 # Reduced padding
+        self.icon_size = icon_size
+        self.header_height = 0
 
     def paint(self, painter, option, index):
         painter.save()
-        
+
+        # Timeline header on the first file of each group, above the cell
+        header = index.data(ThumbnailModel.GroupHeaderRole) if self.header_height else None
+        if header:
+            self.paint_group_header(painter, QRect(option.rect.left() + self.padding, option.rect.top() + 2,
+                                                   option.rect.width() - 2 * self.padding,
+                                                   self.header_height - 4), header)
+        rect = option.rect.adjusted(0, self.header_height, 0, 0)
+
         # 1. Draw Selection Background
         if option.state & QStyle.StateFlag.State_Selected:
             painter.setBrush(QBrush(QColor("#45475a"))) 
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(option.rect, 6, 6)
+            painter.drawRoundedRect(rect, 6, 6)
         
         # 2. Get Data
-        icon = index.data(Qt.ItemDataRole.DecorationRole)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
         text = index.data(Qt.ItemDataRole.DisplayRole)
         
-        rect = option.rect
-        icon_size = 180
+        icon_size = self.icon_size
+        icon_rect = QRect(rect.left() + (rect.width() - icon_size) // 2, 
+                          rect.top() + self.padding, 
+                          icon_size, icon_size)
         
-        # 3. Draw Icon
-        if icon and not icon.isNull():
-            icon_rect = QRect(rect.left() + (rect.width() - icon_size) // 2, 
-                              rect.top() + self.padding, 
-                              icon_size, icon_size)
-            icon.paint(painter, icon_rect, Qt.AlignmentFlag.AlignCenter)
+        # 3. Draw Thumbnail (placeholder while it is being fetched)
+        if pixmap and not pixmap.isNull():
+            size = pixmap.size().scaled(icon_rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRect(0, 0, size.width(), size.height())
+            target.moveCenter(icon_rect.center())
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(target, pixmap)
+        else:
+            painter.setBrush(QBrush(QColor("#313244")))
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.drawRoundedRect(icon_rect.adjusted(20, 20, -20, -20), 6, 6)
         
         # 4. Draw Text
         if text:
@@ -71,6 +94,23 @@ class ThumbnailDelegate(QStyledItemDelegate):
 
         painter.restore()
 
+    @staticmethod
+    def paint_group_header(painter, rect, text):
+        """
+        Draws a timeline group label; also used for the view's sticky header.
+        """
+        painter.save()
+        painter.setBrush(QBrush(QColor("#89b4fa")))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(rect, 4, 4)
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#1e1e2e"))
+        elided = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, rect.width() - 8)
+        painter.drawText(rect.adjusted(4, 0, -4, 0), Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, elided)
+        painter.restore()
+
     def sizeHint(self, option, index):
-        # Tighter size: 200w x 240h
-        return QSize(200, 240)
+        # Tighter size: 200w x 240h at the default zoom
+        return QSize(self.icon_size + 20, self.icon_size + 60 + self.header_height)
@@ -0,0 +1,87 @@
+import os
+import threading
+
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+from src.core.scanner import iter_folders, file_signature
+
+
+class ScanSignals(QObject):
+    batch = pyqtSignal(list, dict) # new file paths in scan order, {filepath: size}
+    finished = pyqtSignal(dict, list) # {folder: {filepath: signature}}, folders that are gone
+
+
+class FolderScanWorker(QRunnable):
+    """
+    Scans a folder tree off the GUI thread.
+
+    Files are streamed in batches as they are found so the grid fills while
+    the walk goes on. `finished` carries a per-folder snapshot of every
+    file's signature, which FolderWatcher diffs later rescans against.
+    """
+
+    def __init__(self, root, recursive=True, batch_size=500):
+        super().__init__()
+        self.root = root
+        self.recursive = recursive
+        self.batch_size = batch_size
+        self.cancel_event = threading.Event()
+        self.signals = ScanSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        snapshot = {}
+        pending, sizes = [], {}
+        try:
+            for folder, files, _ in iter_folders(self.root, self.recursive, cancel_event=self.cancel_event):
+                snapshot[folder] = {path: file_signature(st) for path, st in files}
+                pending.extend(path for path, _ in files)
+                sizes.update((path, st.st_size) for path, st in files)
+                if len(pending) >= self.batch_size:
+                    self.signals.batch.emit(pending, sizes)
+                    pending, sizes = [], {}
+        except Exception as e:
+            print(f"Error scanning {self.root}: {e}")
+
+        if self.cancel_event.is_set():
+            return
+        if pending:
+            self.signals.batch.emit(pending, sizes)
+        self.signals.finished.emit(snapshot, [])
+
+
+class FolderRescanWorker(QRunnable):
+    """
+    Re-lists only the folders the watcher reported as changed.
+
+    Each folder is listed non-recursively; sub-folders not seen before
+    (created or moved in) are walked in full. Folders that no longer exist
+    are reported as gone.
+    """
+
+    def __init__(self, folders, known_folders):
+        super().__init__()
+        self.folders = folders
+        self.known_folders = known_folders
+        self.signals = ScanSignals()
+
+    def run(self):
+        snapshot = {}
+        gone = []
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                gone.append(folder)
+                continue
+            for found, files, subdirs in iter_folders(folder, recursive=False):
+                snapshot[found] = {path: file_signature(st) for path, st in files}
+                for subdir in subdirs:
+                    if subdir not in self.known_folders and subdir not in snapshot:
+                        for sub, sub_files, _ in iter_folders(subdir):
+                            snapshot[sub] = {path: file_signature(st) for path, st in sub_files}
+                # Sub-folders renamed or moved away only show up here.
+                present = set(subdirs)
+                gone.extend(known for known in self.known_folders
+                            if os.path.dirname(known) == folder and known not in present)
+        self.signals.finished.emit(snapshot, gone)
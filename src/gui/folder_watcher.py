@@ -0,0 +1,109 @@
+import os
+from functools import partial
+
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from src.core.scanner import diff_files
+from src.gui.folder_scanner import FolderRescanWorker
+from src.gui.task_scheduler import TaskScheduler
+
+
+class FolderWatcher(QObject):
+    """
+    Keeps the file list of a scanned tree current.
+
+    Every folder of the tree is watched (inotify/FSEvents/ReadDirectoryChanges
+    via QFileSystemWatcher). Change notifications are coalesced, only the
+    folders that fired are re-listed off the GUI thread, and the result is
+    diffed against the last snapshot, so a new file costs one directory
+    listing instead of a full reload.
+    """
+
+    changed = pyqtSignal(list, list, list) # added, removed, modified paths
+
+    def __init__(self, scheduler, interval_ms=300, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        self._files = {} # folder -> {filepath: signature}
+        self._dirty = set()
+        self._worker = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._rescan)
+
+    def start(self, snapshot):
+        """
+        Starts watching the folders of a FolderScanWorker snapshot.
+        """
+        self.stop()
+        self._files = dict(snapshot)
+        self._watch(list(self._files))
+
+    def stop(self):
+        self._timer.stop()
+        self._dirty.clear()
+        self._worker = None
+        self._files = {}
+        watched = self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _watch(self, folders):
+        failed = self._watcher.addPaths(folders) if folders else []
+        if failed:
+            print(f"Cannot watch {len(failed)} folder(s); changes there will not show up until reload")
+
+    def _unwatch(self, folders):
+        watched = set(self._watcher.directories())
+        folders = [f for f in folders if f in watched]
+        if folders:
+            self._watcher.removePaths(folders)
+
+    def _on_directory_changed(self, folder):
+        self._dirty.add(folder)
+        # Fixed window rather than restart-on-event, so a steady stream of
+        # arrivals still gets picked up.
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _rescan(self):
+        if self._worker or not self._dirty:
+            return
+        folders, self._dirty = sorted(self._dirty), set()
+        worker = FolderRescanWorker(folders, set(self._files))
+        worker.signals.finished.connect(partial(self._on_rescanned, worker))
+        self._worker = worker
+        self.scheduler.submit(worker, TaskScheduler.INDEX)
+
+    def _on_rescanned(self, worker, snapshot, gone):
+        if worker is not self._worker:
+            return
+        self._worker = None
+
+        old, new = {}, {}
+        for folder in gone:
+            prefix = folder + os.sep
+            stale = [known for known in self._files if known == folder or known.startswith(prefix)]
+            for known in stale:
+                old.update(self._files.pop(known))
+            self._unwatch(stale)
+
+        for folder, files in snapshot.items():
+            if folder in self._files:
+                old.update(self._files[folder])
+            else:
+                self._watch([folder])
+            new.update(files)
+            self._files[folder] = files
+
+        added, removed, modified = diff_files(old, new)
+        if added or removed or modified:
+            self.changed.emit(added, removed, modified)
+
+        # Changes that arrived while this rescan ran.
+        if self._dirty and not self._timer.isActive():
+            self._timer.start()
@@ -1,44 +1,130 @@
 
 import os
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QListWidget, 
-                             QListWidgetItem, QSplitter, QFileDialog, QToolBar, QMessageBox,
-                             QAbstractItemView)
-from PyQt6.QtCore import Qt, QSize, QThreadPool, QSettings, QRunnable, pyqtSignal, QObject
-from PyQt6.QtGui import QAction, QIcon, QPixmap, QColor
+import threading
+from functools import partial
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QListView,
+                             QSplitter, QFileDialog, QToolBar, QMessageBox,
+                             QAbstractItemView, QProgressDialog, QLabel, QComboBox,
+                             QLineEdit)
+from PyQt6.QtCore import Qt, QSize, QSettings, QRunnable, pyqtSignal, QObject, QTimer
+from PyQt6.QtGui import QAction
 
 from src.gui.metadata_panel import MetadataPanel
 from src.gui.custom_delegate import ThumbnailDelegate
-from src.core.exif_handler import ExifHandler
+from src.gui.thumbnail_model import ThumbnailModel, SORT_ORDERS, GROUPINGS
+from src.gui.thumbnail_view import ThumbnailListView
+from src.gui.update_batcher import UpdateBatcher
+from src.gui.batch_write_worker import BatchWriteWorker
+from src.gui.time_shift_dialog import TimeShiftDialog
+from src.gui.folder_scanner import FolderScanWorker
+from src.gui.folder_watcher import FolderWatcher
+from src.gui.task_scheduler import TaskScheduler
+from src.gui.metadata_loader import MetadataLoader
+from src.gui.search_worker import SearchIndexWorker
+from src.core.exif_handler import ExifHandler, PANEL
 from src.core.thumbnail_loader import ThumbnailWorker
+from src.core.thumbnail_cache import ThumbnailCache
+from src.core.metadata_index import MetadataIndex
+from src.core.write_journal import WriteJournal
+from src.core.search_index import SearchIndex
+from src.core.paths import normalize_path
+from src.core.dates import parse_date_taken
+from src.core.instrumentation import instruments
+from src.gui.stats_overlay import StatsOverlay
 
 class DateWorkerSignals(QObject):
-    finished = pyqtSignal(dict) # {filepath: date_str}
+    results = pyqtSignal(dict, dict) # {key: date_str or None}, {key: error}
+    progress = pyqtSignal(int, int) # done, total
+    finished = pyqtSignal()
 
 class DateLoaderWorker(QRunnable):
-    def __init__(self, filepaths, exif_handler):
+    def __init__(self, filepaths, exif_handler, chunk_size=200):
         super().__init__()
         self.filepaths = filepaths
         self.exif_handler = exif_handler
+        self.chunk_size = chunk_size
+        self.cancel_event = threading.Event()
         self.signals = DateWorkerSignals()
 
+    def cancel(self):
+        self.cancel_event.set()
+
     def run(self):
+        total = len(self.filepaths)
+        done = 0
         try:
-            results = self.exif_handler.get_batch_date_info(self.filepaths)
-            self.signals.finished.emit(results)
+            # Files the native date reader cannot handle get the panel tags
+            # from the same ExifTool pass, for search and the panel.
+            for dates, errors in self.exif_handler.iter_batch_date_info(
+                    self.filepaths, chunk_size=self.chunk_size, cancel_event=self.cancel_event,
+                    exiftool_profile=PANEL):
+                if self.cancel_event.is_set():
+                    break
+                for key, message in errors.items():
+                    print(f"Date loader error for {key}: {message}")
+                done += len(dates) + len(errors)
+                self.signals.results.emit(dates, errors)
+                self.signals.progress.emit(done, total)
         except Exception as e:
             print(f"Date loader error: {e}")
-            self.signals.finished.emit({})
+        self.signals.finished.emit()
 
 class MainWindow(QMainWindow):
+    # Rows beyond the visible range (each side) that are fetched ahead of scrolling
+    PREFETCH_ROWS = 40
+    # Files each side of the selection whose tags are read ahead for the panel
+    PANEL_PREFETCH = 2
+    # Zoom levels: label -> thumbnail edge in pixels
+    THUMBNAIL_SIZES = {"Small": 120, "Medium": 200, "Large": 320}
+    # Sort and timeline grouping choices: label -> ThumbnailModel value
+    SORT_LABELS = dict(zip(["Path", "Name", "Date Taken", "Size", "Camera"], SORT_ORDERS))
+    GROUP_LABELS = {"No Grouping": None, **dict(zip(["By Year", "By Month", "By Day"], GROUPINGS))}
+
     def __init__(self, exiftool_path=None):
         super().__init__()
         self.setWindowTitle("EXIF Editor")
         self.settings = QSettings("MyCompany", "ExifEditor")
         
         # Init Core
-        self.exif_handler = ExifHandler(exiftool_path)
-        self.thread_pool = QThreadPool()
+        try:
+            self.metadata_index = MetadataIndex()
+        except Exception as e:
+            print(f"Metadata index disabled: {e}")
+            self.metadata_index = None
+        try:
+            self.write_journal = WriteJournal()
+            interrupted = self.write_journal.recover()
+            if interrupted:
+                print(f"Interrupted write batches (can be undone): {interrupted}")
+        except Exception as e:
+            print(f"Write journal disabled: {e}")
+            self.write_journal = None
+        self.exif_handler = ExifHandler(exiftool_path, index=self.metadata_index, journal=self.write_journal,
+                                        quicktime_utc=self.settings.value("quickTimeUTC", False, type=bool))
+        # 0 decodes thumbnails on threads; N > 0 uses N worker processes.
+        process_workers = int(self.settings.value("thumbnailProcesses", 0))
+        self.scheduler = TaskScheduler(process_workers=process_workers)
+        self.thread_pool = self.scheduler.thread_pool
+        try:
+            cache_mb = int(self.settings.value("thumbnailCacheMB", 1024))
+            self.thumbnail_cache = ThumbnailCache(max_bytes=cache_mb * 1024 * 1024)
+        except Exception as e:
+            print(f"Thumbnail cache disabled: {e}")
+            self.thumbnail_cache = None
         print(f"Multithreading with maximum {self.thread_pool.maxThreadCount()} threads")
+        # Thumbnail tasks queued or running, keyed by (normalized path, size)
+        self.pending_thumbnails = {}
+        self.failed_thumbnails = set()
+        self.date_workers = set()
+        self.date_progress = {} # date worker -> (done, total), summed for the status bar
+        self.scan_worker = None
+        self.write_worker = None
+        self.folder_watcher = FolderWatcher(self.scheduler, parent=self)
+        self.folder_watcher.changed.connect(self.on_files_changed)
+        self.metadata_loader = MetadataLoader(self.exif_handler, self.scheduler, parent=self)
+        self.metadata_loader.loaded.connect(self.on_metadata_loaded)
+        self.search_index = SearchIndex()
+        self.search_workers = set()
 
         self.init_ui()
         self.restore_state()
@@ -51,31 +137,113 @@ class MainWindow(QMainWindow):
         action_open.triggered.connect(self.open_folder)
         toolbar.addAction(action_open)
 
+        action_shift = QAction("Shift Dates...", self)
+        action_shift.triggered.connect(self.shift_dates)
+        toolbar.addAction(action_shift)
+
+        action_undo = QAction("Undo Last Write", self)
+        action_undo.triggered.connect(self.undo_last_write)
+        action_undo.setEnabled(self.write_journal is not None)
+        toolbar.addAction(action_undo)
+
+        action_utc = QAction("QuickTime UTC", self)
+        action_utc.setCheckable(True)
+        action_utc.setChecked(self.exif_handler.quicktime_utc)
+        action_utc.setToolTip("Treat MP4/MOV dates as UTC and show them in local time, as phones store them.\n"
+                              "Leave off for cameras that record local time.")
+        action_utc.toggled.connect(self.toggle_quicktime_utc)
+        toolbar.addAction(action_utc)
+
+        self.action_stats = QAction("Stats", self)
+        self.action_stats.setCheckable(True)
+        self.action_stats.setToolTip("Show live timings, queue depths and cache hit rates")
+        self.action_stats.toggled.connect(self.toggle_stats)
+        toolbar.addAction(self.action_stats)
+
+        action_trace = QAction("Export Trace...", self)
+        action_trace.triggered.connect(self.export_trace)
+        toolbar.addAction(action_trace)
+
+        toolbar.addSeparator()
+        self.zoom_combo = QComboBox()
+        self.zoom_combo.addItems(list(self.THUMBNAIL_SIZES))
+        toolbar.addWidget(self.zoom_combo)
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(list(self.SORT_LABELS))
+        toolbar.addWidget(self.sort_combo)
+        self.group_combo = QComboBox()
+        self.group_combo.addItems(list(self.GROUP_LABELS))
+        toolbar.addWidget(self.group_combo)
+
+        toolbar.addSeparator()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter: canon iso:>=800 date:2021-06 gps:yes")
+        self.filter_edit.setToolTip(SearchIndex.query.__doc__)
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMaximumWidth(360)
+        toolbar.addWidget(self.filter_edit)
+        # Re-filters once typing pauses, and as newly indexed files stream in.
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+
         central_widget = QWidget()
         main_layout = QHBoxLayout()
         
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
         
-        self.list_widget = QListWidget()
-        self.list_widget.setIconSize(QSize(180, 180))
-        self.list_widget.setViewMode(QListWidget.ViewMode.IconMode)
-        self.list_widget.setResizeMode(QListWidget.ResizeMode.Adjust)
-        self.list_widget.setGridSize(QSize(200, 240)) 
-        self.list_widget.setSpacing(5)
-        self.list_widget.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.list_widget.itemClicked.connect(self.on_item_clicked)
-        self.list_widget.setAcceptDrops(True)
-        self.list_widget.setDragEnabled(False)
+        cache_mb = int(self.settings.value("pixmapCacheMB", 256))
+        self.model = ThumbnailModel(self, cache_bytes=cache_mb * 1024 * 1024)
+        # Worker results are applied to the model in coalesced batches.
+        self.thumbnail_batcher = UpdateBatcher(parent=self, name="gui.thumbnail_batch")
+        self.thumbnail_batcher.flushed.connect(self.model.set_thumbnails)
+        self.thumbnail_batcher.flushed.connect(self.update_memory_status)
+        # Dates too: with the grid sorted by date, each batch is one re-layout.
+        self.date_batcher = UpdateBatcher(interval_ms=250, parent=self, name="gui.date_batch")
+        self.date_batcher.flushed.connect(self.model.set_dates)
+
+        self.list_view = ThumbnailListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setViewMode(QListView.ViewMode.IconMode)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.list_view.setSpacing(5)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        # Fires for clicks and keyboard navigation alike.
+        self.list_view.selectionModel().currentChanged.connect(self.on_current_changed)
+        self.list_view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.list_view.visible_range_changed.connect(self.on_visible_range_changed)
+        self.list_view.setAcceptDrops(True)
+        self.list_view.setDragEnabled(False)
         
         # Use Custom Delegate using setItemDelegate
         # We need to hold a reference to it
         self.delegate = ThumbnailDelegate()
-        self.list_widget.setItemDelegate(self.delegate)
+        self.list_view.setItemDelegate(self.delegate)
+
+        size = int(self.settings.value("thumbnailSize", 200))
+        labels = [label for label, px in self.THUMBNAIL_SIZES.items() if px == size]
+        self.zoom_combo.setCurrentText(labels[0] if labels else "Medium")
+        self.set_thumbnail_size(self.THUMBNAIL_SIZES[self.zoom_combo.currentText()])
+        self.zoom_combo.currentTextChanged.connect(
+            lambda label: self.set_thumbnail_size(self.THUMBNAIL_SIZES[label]))
+
+        sort_by = self.settings.value("sortBy", "path")
+        group_by = self.settings.value("groupBy", "") or None
+        self.sort_combo.setCurrentText(next((l for l, v in self.SORT_LABELS.items() if v == sort_by), "Path"))
+        self.group_combo.setCurrentText(next((l for l, v in self.GROUP_LABELS.items() if v == group_by), "No Grouping"))
+        self.set_sort(self.sort_combo.currentText())
+        self.set_grouping(self.group_combo.currentText())
+        self.sort_combo.currentTextChanged.connect(self.set_sort)
+        self.group_combo.currentTextChanged.connect(self.set_grouping)
 
         self.metadata_panel = MetadataPanel()
         self.metadata_panel.save_clicked.connect(self.update_metadata)
 
-        self.splitter.addWidget(self.list_widget)
+        self.splitter.addWidget(self.list_view)
         self.splitter.addWidget(self.metadata_panel)
         self.splitter.setStretchFactor(0, 3)
         self.splitter.setStretchFactor(1, 1)
@@ -84,6 +252,13 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
+        self.memory_label = QLabel()
+        self.statusBar().addPermanentWidget(self.memory_label)
+
+        self.stats_overlay = StatsOverlay(self.list_view, sample=self.sample_stats)
+        if instruments.enabled:
+            self.action_stats.setChecked(True)
+
     def restore_state(self):
         geometry = self.settings.value("geometry")
         if geometry:
@@ -103,6 +278,26 @@ class MainWindow(QMainWindow):
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.setValue("splitterState", self.splitter.saveState())
         self.settings.setValue("lastFolder", self.last_folder)
+        self.settings.setValue("thumbnailSize", self.model.thumbnail_size)
+        self.settings.setValue("sortBy", self.model.sort_by)
+        self.settings.setValue("groupBy", self.model.group_by or "")
+
+        # Drop queued jobs, then stop the ExifTool processes so no
+        # stay-open children outlive the window.
+        self.scheduler.clear()
+        self.folder_watcher.stop()
+        if self.scan_worker:
+            self.scan_worker.cancel()
+        for worker in self.date_workers | self.search_workers:
+            worker.cancel()
+        self.exif_handler.close()
+        self.scheduler.shutdown(2000)
+        if self.thumbnail_cache:
+            self.thumbnail_cache.close()
+        if self.metadata_index:
+            self.metadata_index.close()
+        if self.write_journal:
+            self.write_journal.close()
         super().closeEvent(event)
 
     def open_folder(self):
@@ -113,98 +308,445 @@ class MainWindow(QMainWindow):
             self.load_files(folder)
 
     def load_files(self, folder):
-        self.list_widget.clear()
-        
-        supported_ext = ('.jpg', '.jpeg', '.png', '.mp4', '.mov')
-        
-        try:
-            files_to_load = []
-            for f in os.listdir(folder):
-                if f.lower().endswith(supported_ext):
-                    files_to_load.append(os.path.join(folder, f))
-        except Exception as e:
-            print(f"Error reading folder {folder}: {e}")
+        self.cancel_thumbnails()
+        self.folder_watcher.stop()
+        if self.scan_worker:
+            self.scan_worker.cancel()
+        for worker in self.date_workers:
+            worker.cancel()
+        self.date_workers.clear()
+        self.date_progress.clear()
+        for worker in self.search_workers:
+            worker.cancel()
+        self.search_workers.clear()
+        self.search_index.clear()
+        self.thumbnail_batcher.clear()
+        self.date_batcher.clear()
+        self.failed_thumbnails.clear()
+        self.metadata_loader.clear()
+        self.metadata_panel.clear()
+
+        # The filter held the old folder's keys; it is re-applied as search
+        # records for the new one stream in.
+        self.model.set_filter(None)
+        # Rows stream in as the tree is walked; thumbnails are requested by
+        # the view once rows become visible.
+        self.model.set_files([])
+        worker = FolderScanWorker(folder)
+        worker.signals.batch.connect(partial(self.on_scan_batch, worker))
+        worker.signals.finished.connect(partial(self.on_scan_finished, worker))
+        self.scan_worker = worker
+        self.scheduler.submit(worker, TaskScheduler.INDEX)
+        self.statusBar().showMessage("Scanning...")
+
+    @instruments.timed("gui.scan_batch")
+    def on_scan_batch(self, worker, filepaths, sizes):
+        if worker is not self.scan_worker:
             return
-        
-        for f in files_to_load:
-            basename = os.path.basename(f)
-            # Initial text: Filename \n status
-            item = QListWidgetItem(f"{basename}\nLoading...")
-            item.setData(Qt.ItemDataRole.UserRole, f)
-            # Default empty icon
-            item.setIcon(QIcon(QPixmap(100, 100))) 
-            self.list_widget.addItem(item)
-            
-            worker = ThumbnailWorker(f)
-            worker.signals.finished.connect(self.on_thumbnail_ready)
-            self.thread_pool.start(worker)
-
-        if files_to_load:
-            date_worker = DateLoaderWorker(files_to_load, self.exif_handler)
-            date_worker.signals.finished.connect(self.on_dates_loaded)
-            self.thread_pool.start(date_worker)
-
-    def on_thumbnail_ready(self, filepath, pixmap):
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            try:
-                if item.data(Qt.ItemDataRole.UserRole) == filepath:
-                    item.setIcon(QIcon(pixmap))
-                    break
-            except RuntimeError:
-                pass
+        self.model.append_files(filepaths, sizes)
+        self.statusBar().showMessage(f"Scanning... {self.model.rowCount()} files")
+        # Dates stream in per batch, so the first screen gets them while
+        # the rest of the tree is still being walked.
+        self.load_dates(filepaths)
 
-    def on_dates_loaded(self, results):
-        # results = {norm_abs_path_lower: date_str}
-        
-        # Create a fallback map based on basenames (lowercase) for easier matching
-        # key = basename.lower(), value = date_str
-        basename_map = {}
-        for k, v in results.items():
-            # k is full path lower
-            basename = os.path.basename(k)
-            basename_map[basename] = v
-        
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
+    def on_scan_finished(self, worker, snapshot, gone):
+        if worker is not self.scan_worker:
+            return
+        self.scan_worker = None
+        self.folder_watcher.start(snapshot)
+        if not self.date_workers:
+            self.statusBar().clearMessage()
+
+    def toggle_quicktime_utc(self, enabled):
+        """
+        Switches how QuickTime dates are read and written, and re-derives
+        every file's Date Taken (from the index, not ExifTool).
+        """
+        self.exif_handler.quicktime_utc = enabled
+        self.settings.setValue("quickTimeUTC", enabled)
+        self.load_dates(self.model.all_files())
+        if self.metadata_panel.current_file:
+            self.show_metadata(self.metadata_panel.current_file)
+
+    def load_dates(self, filepaths):
+        if not filepaths:
+            return
+        worker = DateLoaderWorker(filepaths, self.exif_handler)
+        worker.signals.results.connect(self.on_dates_loaded)
+        worker.signals.progress.connect(partial(self.on_dates_progress, worker))
+        worker.signals.finished.connect(partial(self.on_dates_finished, worker))
+        self.date_workers.add(worker)
+        self.date_progress[worker] = (0, len(filepaths))
+        self.scheduler.submit(worker, TaskScheduler.INDEX)
+
+    @instruments.timed("gui.files_changed")
+    def on_files_changed(self, added, removed, modified):
+        """
+        Applies a FolderWatcher diff without reloading the folder.
+        """
+        self.metadata_loader.invalidate(removed + modified)
+        if removed:
+            self.model.remove_files(removed)
+            self.search_index.remove_many(map(normalize_path, removed))
+            for path in removed:
+                key = normalize_path(path)
+                self.failed_thumbnails.discard(key)
+                if self.metadata_index:
+                    self.metadata_index.remove(path)
+        sizes = {}
+        for path in added + modified:
             try:
-                filepath = item.data(Qt.ItemDataRole.UserRole)
-                # 1. Try Full Path Match
-                abs_norm_key = os.path.abspath(filepath).lower()
-                date_val = results.get(abs_norm_key)
-                
-                # 2. Try Basename Match (Fallback)
-                if not date_val:
-                    name = os.path.basename(filepath).lower()
-                    date_val = basename_map.get(name)
-                
-                basename = os.path.basename(filepath)
-                if date_val:
-                    # Clean up date display
-                    display_date = date_val.replace(":", "-", 2)
-                    item.setText(f"{basename}\n{display_date}")
-                else:
-                    item.setText(f"{basename}\n-")
-                    
-            except RuntimeError:
+                sizes[path] = os.path.getsize(path)
+            except OSError:
                 pass
+        if modified:
+            self.model.invalidate(modified)
+            self.model.set_sizes({normalize_path(p): size for p, size in sizes.items()})
+            for path in modified:
+                self.failed_thumbnails.discard(normalize_path(path))
+        self.model.append_files(added, sizes)
+
+        # The view re-requests missing thumbnails for what is on screen.
+        self.list_view.schedule_visible_range()
+        self.load_dates(added + modified)
+
+        current = self.metadata_panel.current_file
+        if current in removed:
+            self.metadata_panel.clear()
+        elif current in modified:
+            self.show_metadata(current)
+
+    @instruments.timed("gui.visible_range_changed")
+    def on_visible_range_changed(self, first, last):
+        count = self.model.rowCount()
+        start = max(0, first - self.PREFETCH_ROWS)
+        end = min(count - 1, last + self.PREFETCH_ROWS)
+
+        # Visible rows first, then the prefetch margin below and above.
+        wanted = list(range(first, last + 1))
+        wanted += range(last + 1, end + 1)
+        wanted += range(first - 1, start - 1, -1)
+        wanted_keys = set()
+
+        size = self.model.thumbnail_size
+        for row in wanted:
+            key = self.model.file_key(row)
+            wanted_keys.add((key, size))
+            priority = TaskScheduler.VISIBLE if first <= row <= last else TaskScheduler.PREFETCH
+            task = self.pending_thumbnails.get((key, size))
+            if task:
+                # Prefetched rows that scrolled into view jump the queue.
+                self.scheduler.reprioritize(task, priority)
+                continue
+            if key in self.failed_thumbnails or self.model.has_thumbnail(row):
+                continue
+            worker = ThumbnailWorker(self.model.file_path(row), size=(size, size),
+                                     cache=self.thumbnail_cache,
+                                     executor=self.scheduler.process_pool,
+                                     preview_source=self.exif_handler.get_embedded_preview)
+            worker.signals.finished.connect(partial(self.on_thumbnail_ready, size))
+            worker.signals.error.connect(partial(self.on_thumbnail_failed, size))
+            self.pending_thumbnails[(key, size)] = self.scheduler.submit(worker, priority)
+
+        # Scrolled away (or zoomed) before they started: drop them from the queue.
+        for pending in [p for p in self.pending_thumbnails if p not in wanted_keys]:
+            if self.pending_thumbnails[pending].cancel():
+                del self.pending_thumbnails[pending]
+
+    def cancel_thumbnails(self):
+        for key, task in list(self.pending_thumbnails.items()):
+            if task.cancel():
+                del self.pending_thumbnails[key]
+
+    def set_thumbnail_size(self, size):
+        self.model.set_thumbnail_size(size)
+        self.delegate.icon_size = size - 20
+        self.list_view.setIconSize(QSize(size - 20, size - 20))
+        self.update_grid()
+
+    def update_grid(self):
+        """
+        Sizes the grid cells: thumbnail and two text lines, plus a band for
+        the timeline headers while grouped, so they never cover a thumbnail.
+        """
+        size = self.model.thumbnail_size
+        self.delegate.header_height = ThumbnailDelegate.HEADER_HEIGHT if self.model.group_by else 0
+        self.list_view.setGridSize(QSize(size, size + 40 + self.delegate.header_height))
+        self.list_view.schedule_visible_range()
 
-    def on_item_clicked(self, item):
-        filepath = item.data(Qt.ItemDataRole.UserRole)
-        self.metadata_panel.load_file(filepath, None, self.exif_handler)
+    def set_sort(self, label):
+        sort_by = self.SORT_LABELS[label]
+        self.model.set_sort(sort_by)
+        # A timeline only makes sense in date order.
+        if sort_by != "date" and self.model.group_by:
+            self._set_combo_text(self.group_combo, "No Grouping")
+            self.model.set_group_by(None)
+            self.update_grid()
+
+    def set_grouping(self, label):
+        group_by = self.GROUP_LABELS[label]
+        if group_by and self.model.sort_by != "date":
+            self._set_combo_text(self.sort_combo, "Date Taken")
+            self.model.set_sort("date")
+        self.model.set_group_by(group_by)
+        self.update_grid()
+
+    @staticmethod
+    def _set_combo_text(combo, text):
+        combo.blockSignals(True)
+        combo.setCurrentText(text)
+        combo.blockSignals(False)
+
+    @instruments.timed("gui.thumbnail_ready")
+    def on_thumbnail_ready(self, size, filepath, image):
+        key = normalize_path(filepath)
+        self.pending_thumbnails.pop((key, size), None)
+        self.thumbnail_batcher.add((key, size), image)
+
+    def update_memory_status(self, *args):
+        stats = self.model.pixmaps.stats()
+        mb = 1024 * 1024
+        self.memory_label.setText(
+            f"Thumbnails in memory: {stats['entries']} ({stats['bytes'] / mb:.1f}/{stats['max_bytes'] / mb:.0f} MB)"
+            f" | hits {stats['hits']}, misses {stats['misses']}, evicted {stats['evictions']}")
+
+    def toggle_stats(self, checked):
+        if checked:
+            if not instruments.enabled:
+                instruments.reset()
+                instruments.enable(trace=True)
+            self.stats_overlay.start()
+        else:
+            self.stats_overlay.stop()
+            instruments.disable()
+
+    def sample_stats(self):
+        """
+        GUI-side levels for the stats overlay, read on each refresh.
+        """
+        stats = self.model.pixmaps.stats()
+        return {
+            "thumbnails.pending": len(self.pending_thumbnails),
+            "pixmap_cache.mb": round(stats["bytes"] / (1024 * 1024), 1),
+        }
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Trace", "exifeditor-trace.json",
+                                              "Trace files (*.json)")
+        if not path:
+            return
+        if not instruments.enabled:
+            QMessageBox.information(self, "Export Trace",
+                                    "Nothing recorded yet: turn on Stats (or start with EXIFEDITOR_TRACE=1) first.")
+            return
+        try:
+            instruments.export(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Export Trace", f"Could not write {path}: {e}")
+            return
+        self.statusBar().showMessage(f"Trace written to {path} (open in ui.perfetto.dev)", 5000)
+
+    def on_thumbnail_failed(self, size, filepath, message):
+        key = normalize_path(filepath)
+        self.pending_thumbnails.pop((key, size), None)
+        self.failed_thumbnails.add(key)
+
+    @instruments.timed("gui.dates_loaded")
+    def on_dates_loaded(self, results, errors):
+        # results = {normalize_path(filepath): date_str or None}; parsed
+        # here once, the model sorts, groups and displays the typed value.
+        dates = {key: parse_date_taken(date_val) for key, date_val in results.items()}
+        dates.update((key, None) for key in errors)
+        self.date_batcher.add_many(dates)
+        # Searchable tags follow at index priority.
+        self.index_for_search(list(results) + list(errors))
+
+    def index_for_search(self, filepaths):
+        worker = SearchIndexWorker(filepaths, self.exif_handler)
+        worker.signals.indexed.connect(partial(self.on_search_indexed, worker))
+        worker.signals.finished.connect(partial(self.search_workers.discard, worker))
+        self.search_workers.add(worker)
+        self.scheduler.submit(worker, TaskScheduler.INDEX)
+
+    @instruments.timed("gui.search_indexed")
+    def on_search_indexed(self, worker, fields):
+        if worker not in self.search_workers:
+            return # from a folder no longer open
+        self.search_index.add_many(fields)
+        self.model.set_cameras({key: f"{f.get('make', '')} {f.get('model', '')}".strip()
+                                for key, f in fields.items()})
+        if self.filter_edit.text().strip() and not self.filter_timer.isActive():
+            self.filter_timer.start()
+
+    @instruments.timed("gui.apply_filter")
+    def apply_filter(self):
+        text = self.filter_edit.text().strip()
+        if not text:
+            self.filter_edit.setStyleSheet("")
+            self.model.set_filter(None)
+            self.list_view.schedule_visible_range()
+            self.statusBar().clearMessage()
+            return
+        try:
+            keys = self.search_index.query(text)
+        except ValueError as e:
+            self.filter_edit.setStyleSheet("border: 1px solid #c0392b;")
+            self.statusBar().showMessage(str(e), 5000)
+            return
+        self.filter_edit.setStyleSheet("")
+        self.model.set_filter(keys)
+        self.list_view.schedule_visible_range()
+        self.statusBar().showMessage(
+            f"Showing {self.model.rowCount()} of {self.model.file_count()} files", 5000)
+
+    def on_dates_progress(self, worker, done, total):
+        if worker not in self.date_workers:
+            return
+        # One loader per scan batch; report them as one job.
+        self.date_progress[worker] = (done, total)
+        done = sum(d for d, _ in self.date_progress.values())
+        total = sum(t for _, t in self.date_progress.values())
+        self.statusBar().showMessage(f"Reading dates... {done}/{total}")
+
+    def on_dates_finished(self, worker):
+        if worker not in self.date_workers:
+            return
+        self.date_workers.discard(worker)
+        if not self.date_workers:
+            self.date_progress.clear()
+            self.date_batcher.flush()
+            self.model.mark_dates_missing()
+            if not self.scan_worker:
+                self.statusBar().clearMessage()
+
+    @instruments.timed("gui.current_changed")
+    def on_current_changed(self, current, previous):
+        if current.isValid():
+            self.show_metadata(current.data(ThumbnailModel.FilePathRole))
+
+    def show_metadata(self, filepath):
+        """
+        Points the panel at `filepath` at once; tags arrive from the loader,
+        cached ones first if there are any.
+        """
+        self.metadata_panel.show_loading(filepath)
+        row = self.model.row_of(filepath)
+        neighbours = []
+        if row is not None:
+            for offset in range(1, self.PANEL_PREFETCH + 1):
+                for r in (row + offset, row - offset):
+                    if 0 <= r < self.model.rowCount():
+                        neighbours.append(self.model.file_path(r))
+        self.metadata_loader.request(filepath, neighbours)
+
+    @instruments.timed("gui.metadata_loaded")
+    def on_metadata_loaded(self, filepath, meta, confirmed):
+        panel = self.metadata_panel
+        if filepath != panel.current_file:
+            return # the user has moved on
+        if confirmed and meta is not None and meta == panel.current_meta:
+            return # cached values held; don't disturb an edit in progress
+        date_str, source_tag = self.exif_handler.extract_date_info(meta) if meta else (None, None)
+        panel.show_metadata(filepath, meta, date_str, source_tag)
+
+    def selected_paths(self):
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedIndexes())
+        return [self.model.file_path(row) for row in rows]
+
+    def on_selection_changed(self, selected, deselected):
+        self.metadata_panel.set_selection_count(len(self.list_view.selectionModel().selectedIndexes()))
 
     def update_metadata(self, filepath, new_date_str):
-        success = self.exif_handler.update_date(filepath, new_date_str)
-        if success:
+        if self.write_worker:
+            return
+        paths = self.selected_paths()
+        if filepath not in paths:
+            paths = [filepath]
+        self.start_write(partial(self.exif_handler.update_dates, {p: new_date_str for p in paths}),
+                         len(paths), "Updating dates...")
+
+    def shift_dates(self):
+        """
+        Time-shifts the selected files (or the whole folder if none are selected).
+        """
+        if self.write_worker:
+            return
+        paths = self.selected_paths() or [self.model.file_path(row) for row in range(self.model.rowCount())]
+        if not paths:
+            return
+
+        dialog = TimeShiftDialog(paths, self.exif_handler, self.scheduler, self)
+        if dialog.exec():
+            self.start_write(partial(self.exif_handler.shift_dates, paths, dialog.delta(), dialog.offset()),
+                             len(paths), "Shifting dates...")
+
+    def undo_last_write(self):
+        """
+        Rolls back the most recent journaled write batch not undone yet.
+        """
+        if self.write_worker or not self.write_journal:
+            return
+        undoable = (WriteJournal.DONE, WriteJournal.INTERRUPTED)
+        batch = next((b for b in self.write_journal.batches() if b["state"] in undoable and b["files"]), None)
+        if batch is None:
+            QMessageBox.information(self, "Undo Last Write", "Nothing to undo.")
+            return
+
+        note = " It was interrupted, so some files may not have been written." \
+            if batch["state"] == WriteJournal.INTERRUPTED else ""
+        answer = QMessageBox.question(
+            self, "Undo Last Write",
+            f"Restore the original values changed by \"{batch['description']}\"?{note}")
+        if answer == QMessageBox.StandardButton.Yes:
+            self.start_write(partial(self.exif_handler.rollback, batch["id"]), batch["files"], "Undoing...",
+                             undo=True)
+
+    def start_write(self, job, count, label, undo=False):
+        """
+        Runs a write job in the background behind a cancellable progress dialog.
+        `undo` marks a rollback, which is reported as restoring files.
+        """
+        worker = BatchWriteWorker(job)
+        self.write_worker = worker
+
+        self.write_progress = QProgressDialog(label, "Cancel", 0, count, self)
+        self.write_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.write_progress.setMinimumDuration(300)
+        self.write_progress.canceled.connect(worker.cancel)
+
+        worker.signals.progress.connect(self.on_write_progress)
+        worker.signals.finished.connect(partial(self.on_write_finished, undo))
+        self.scheduler.submit(worker, TaskScheduler.WRITE)
+
+    def on_write_progress(self, done, total):
+        self.write_progress.setMaximum(total)
+        self.write_progress.setValue(done)
+
+    def on_write_finished(self, undo, results):
+        self.write_worker = None
+        self.write_progress.reset()
+
+        updated = [p for p, error in results.items() if error is None]
+        failed = {p: error for p, error in results.items() if error is not None}
+
+        # Re-read dates for what changed in the background; the index
+        # already holds the new values.
+        self.load_dates(updated)
+        self.metadata_loader.invalidate(updated)
+        current = self.metadata_panel.current_file
+        if current in updated:
+            self.show_metadata(current)
+
+        if failed:
+            lines = [f"{os.path.basename(p)}: {error}" for p, error in list(failed.items())[:20]]
+            if len(failed) > 20:
+                lines.append(f"... and {len(failed) - 20} more")
+            title, verb = ("Undo Finished", "Restored") if undo else ("Update Finished", "Updated")
+            QMessageBox.warning(self, title,
+                                f"{verb} {len(updated)} file(s), {len(failed)} failed:\n\n" + "\n".join(lines))
+        elif undo:
+            QMessageBox.information(self, "Success", f"Restored {len(updated)} file(s).")
+        elif len(updated) == 1:
             QMessageBox.information(self, "Success", "Date updated successfully!")
-            self.metadata_panel.load_file(filepath, None, self.exif_handler)
-            
-            for i in range(self.list_widget.count()):
-                item = self.list_widget.item(i)
-                if item.data(Qt.ItemDataRole.UserRole) == filepath:
-                    basename = os.path.basename(filepath)
-                    display_date = new_date_str.replace(":", "-", 2)
-                    item.setText(f"{basename}\n{display_date}")
-                    break
         else:
-            QMessageBox.critical(self, "Error", "Failed to update date.")
+            QMessageBox.information(self, "Success", f"Updated {len(updated)} files.")
@@ -0,0 +1,171 @@
+import threading
+from functools import partial
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+from src.gui.task_scheduler import TaskScheduler, Task
+from src.core.exif_handler import PANEL
+
+
+class MetadataSignals(QObject):
+    loaded = pyqtSignal(str, object, bool) # filepath, tag dict or None, confirmed
+    finished = pyqtSignal()
+
+
+class MetadataLoadWorker(QRunnable):
+    """
+    Reads one file's tags off the GUI thread.
+
+    With confirm=True the indexed tags (if any) are reported first and then
+    re-read from the file; otherwise whatever get_metadata() returns is
+    reported once, unconfirmed. Only the panel profile's tags are read.
+    """
+
+    def __init__(self, filepath, exif_handler, confirm=True):
+        super().__init__()
+        self.filepath = filepath
+        self.exif_handler = exif_handler
+        self.confirm = confirm
+        self.signals = MetadataSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            self._read()
+        except Exception as e:
+            print(f"Error reading metadata for {self.filepath}: {e}")
+        finally:
+            self.signals.finished.emit()
+
+    def _read(self):
+        if not self.confirm:
+            meta = self.exif_handler.get_metadata(self.filepath, profile=PANEL)
+            if not self._cancel.is_set():
+                self.signals.loaded.emit(self.filepath, meta, False)
+            return
+
+        index = self.exif_handler.index
+        cached = index.get(self.filepath, PANEL) if index else None
+        if cached is not None:
+            self.signals.loaded.emit(self.filepath, cached, False)
+        if self._cancel.is_set():
+            return
+        meta = self.exif_handler.get_metadata(self.filepath, use_index=False, profile=PANEL)
+        self.signals.loaded.emit(self.filepath, meta, True)
+
+
+class MetadataLoader(QObject):
+    """
+    Feeds the metadata panel while the selection moves.
+
+    Keeps at most one read of the selected file in flight: a newer request
+    replaces the pending one instead of queueing behind it, so holding an
+    arrow key costs one ExifTool round trip per result, not one per row.
+    Tags seen recently are kept in memory and shown at once (unconfirmed),
+    then re-read; once the selection settles its neighbours are prefetched.
+    """
+
+    # filepath, tags (None if unreadable), confirmed by a fresh read
+    loaded = pyqtSignal(str, object, bool)
+
+    def __init__(self, exif_handler, scheduler, cache_size=512, parent=None):
+        super().__init__(parent)
+        self.exif_handler = exif_handler
+        self.scheduler = scheduler
+        self.cache_size = cache_size
+        self._cache = OrderedDict() # filepath -> tags, most recent last
+        self._current = None
+        self._neighbours = []
+        self._pending = None        # newest request waiting for the in-flight one
+        self._task = None           # in-flight read of a selected file
+        self._prefetch = {}         # filepath -> Task
+
+    def request(self, filepath, neighbours=()):
+        """
+        Makes `filepath` the file of interest. Emits cached tags right away
+        when there are any; fresh ones follow.
+        """
+        self._current = filepath
+        self._neighbours = [p for p in neighbours if p != filepath]
+        self._cancel_prefetch()
+
+        cached = self._cache.get(filepath)
+        if cached is not None:
+            self._cache.move_to_end(filepath)
+            self.loaded.emit(filepath, cached, False)
+
+        # A task dropped by scheduler.clear() never finishes; don't wait on it.
+        if self._task is None or self._task.state == Task.DONE:
+            self._start(filepath)
+        else:
+            self._pending = filepath
+
+    def invalidate(self, filepaths):
+        """
+        Forgets cached tags, e.g. after the files were written or changed.
+        """
+        for path in filepaths:
+            self._cache.pop(path, None)
+
+    def clear(self):
+        self._current = None
+        self._pending = None
+        self._neighbours = []
+        self._cancel_prefetch()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._cache.clear()
+
+    def _start(self, filepath):
+        worker = MetadataLoadWorker(filepath, self.exif_handler)
+        worker.signals.loaded.connect(self._on_loaded)
+        worker.signals.finished.connect(partial(self._on_finished, worker))
+        self._pending = None
+        self._task = self.scheduler.submit(worker, TaskScheduler.VISIBLE)
+
+    def _on_loaded(self, filepath, meta, confirmed):
+        self._remember(filepath, meta)
+        if filepath == self._current:
+            self.loaded.emit(filepath, meta, confirmed)
+        elif not confirmed and self._task and self._task.runnable.filepath == filepath:
+            # Moved on while the indexed tags were shown; skip the re-read.
+            self._task.cancel()
+
+    def _on_finished(self, worker):
+        if not self._task or self._task.runnable is not worker:
+            return
+        self._task = None
+        if self._pending:
+            self._start(self._pending)
+        elif worker.filepath == self._current:
+            self._prefetch_neighbours()
+
+    def _on_prefetched(self, filepath, meta, confirmed):
+        self._prefetch.pop(filepath, None)
+        self._remember(filepath, meta)
+
+    def _prefetch_neighbours(self):
+        for path in self._neighbours:
+            if path in self._cache or path in self._prefetch:
+                continue
+            worker = MetadataLoadWorker(path, self.exif_handler, confirm=False)
+            worker.signals.loaded.connect(self._on_prefetched)
+            self._prefetch[path] = self.scheduler.submit(worker, TaskScheduler.PREFETCH)
+
+    def _cancel_prefetch(self):
+        wanted = set(self._neighbours)
+        for path in [p for p in self._prefetch if p not in wanted]:
+            self._prefetch.pop(path).cancel()
+
+    def _remember(self, filepath, meta):
+        if meta is None:
+            return
+        self._cache[filepath] = meta
+        self._cache.move_to_end(filepath)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
@@ -4,12 +4,31 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QDateTimeEdit,
                              QPushButton, QFormLayout, QGroupBox, QMessageBox, QScrollArea)
 from PyQt6.QtCore import Qt, QDateTime, pyqtSignal
 
+from src.core.dates import parse_date_taken
+
 class MetadataPanel(QWidget):
     save_clicked = pyqtSignal(str, str) 
 
+    # Tags shown in the info box: (tag name in any group, label)
+    INTERESTING_KEYS = [
+        ('Make', 'Camera Make'),
+        ('Model', 'Camera Model'),
+        ('LensID', 'Lens'),
+        ('LensModel', 'Lens Model'),
+        ('ISO', 'ISO'),
+        ('FNumber', 'Aperture'),
+        ('ExposureTime', 'Shutter Speed'),
+        ('FocalLength', 'Focal Length'),
+        ('ImageWidth', 'Width'),
+        ('ImageHeight', 'Height'),
+        ('GPSPosition', 'GPS'),
+        ('MIMEType', 'Type')
+    ]
+
     def __init__(self):
         super().__init__()
         self.current_file = None
+        self.current_meta = None # tag dict on display
         self.init_ui()
 
     def init_ui(self):
@@ -21,6 +40,17 @@ class MetadataPanel(QWidget):
         self.scroll_content = QWidget()
         self.info_layout = QFormLayout()
         self.scroll_content.setLayout(self.info_layout)
+
+        # One row per tag, created once and updated in place per file.
+        self.lbl_filename = QLabel("-")
+        self.info_layout.addRow("Filename:", self.lbl_filename)
+        self.tag_labels = {}
+        for key, label in self.INTERESTING_KEYS:
+            value_label = QLabel()
+            value_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            self.info_layout.addRow(f"{label}:", value_label)
+            self.tag_labels[key] = value_label
+        self.hide_tags()
         self.scroll.setWidget(self.scroll_content)
         
         self.info_group = QGroupBox("Detailed Info")
@@ -73,80 +103,83 @@ class MetadataPanel(QWidget):
         
         self.setLayout(layout)
 
-    def load_file(self, filepath, metadata_dummy, exif_handler):
+    def clear(self):
+        """
+        Shows nothing, e.g. when the displayed file is deleted.
+        """
+        self.current_file = None
+        self.current_meta = None
+        self.lbl_filename.setText("-")
+        self.hide_tags()
+        self.lbl_date_source.setText("Source: -")
+        self.date_edit.setEnabled(False)
+        self.btn_save.setEnabled(False)
+
+    def hide_tags(self):
+        for label in self.tag_labels.values():
+            self.info_layout.setRowVisible(label, False)
+
+    def show_loading(self, filepath):
+        """
+        Switches to `filepath` right away; tags follow via show_metadata().
+        """
         self.current_file = filepath
-        
-        # Clear previous info
-        while self.info_layout.count():
-            item = self.info_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        
-        # Basic Info
-        self.info_layout.addRow("Filename:", QLabel(os.path.basename(filepath)))
-        
-        # Get Full Metadata
-        full_meta = exif_handler.get_metadata(filepath)
-        if full_meta:
-            # Selected relevant tags to display
-            # We filter for nice common names
-            interesting_keys = [
-                ('Make', 'Camera Make'),
-                ('Model', 'Camera Model'),
-                ('LensID', 'Lens'),
-                ('LensModel', 'Lens Model'),
-                ('ISO', 'ISO'),
-                ('FNumber', 'Aperture'),
-                ('ExposureTime', 'Shutter Speed'),
-                ('FocalLength', 'Focal Length'),
-                ('ImageWidth', 'Width'),
-                ('ImageHeight', 'Height'),
-                ('GPSPosition', 'GPS'),
-                ('MIMEType', 'Type')
-            ]
-            
-            # Simple fuzzy match attempt or direct lookup
-            # ExifTool keys might be 'EXIF:Model' or just 'Model' depending on options.
-            # We iterate to find matching suffix.
-            
-            for key, label in interesting_keys:
-                # Find key ending with this name
-                found_val = None
-                for meta_key, meta_val in full_meta.items():
-                    if meta_key == key or meta_key.endswith(f":{key}"):
-                        found_val = meta_val
-                        break
-                
-                if found_val:
-                    self.info_layout.addRow(f"{label}:", QLabel(str(found_val)))
-        
-        # Date Info
-        date_str, source_tag = exif_handler.get_date_info(filepath)
-        
+        self.current_meta = None
+        self.lbl_filename.setText(os.path.basename(filepath))
+        self.lbl_date_source.setText("Source: Loading...")
+        self.date_edit.setEnabled(False)
+        self.btn_save.setEnabled(False)
+
+    def show_metadata(self, filepath, full_meta, date_str, source_tag):
+        """
+        Fills the fixed rows in place from an already-read tag dict.
+        """
+        self.current_file = filepath
+        self.current_meta = full_meta
+        self.lbl_filename.setText(os.path.basename(filepath))
+
+        # ExifTool keys might be 'EXIF:Model' or just 'Model' depending on
+        # options; index them by tag name once (first occurrence wins).
+        by_name = {}
+        for meta_key, meta_val in (full_meta or {}).items():
+            by_name.setdefault(meta_key.rsplit(":", 1)[-1], meta_val)
+
+        for key, label in self.tag_labels.items():
+            value = by_name.get(key)
+            if value:
+                label.setText(str(value))
+            self.info_layout.setRowVisible(label, bool(value))
+
+        # The same wall-clock time the grid shows: UTC values (QuickTime)
+        # in local time. Writes store it back as UTC for those tags.
+        taken = parse_date_taken(date_str) if date_str else None
         if date_str:
-            self.lbl_date_source.setText(f"Source: {source_tag}")
-            try:
-                parts = str(date_str).split(" ") # Ensure string
-                if len(parts) >= 2:
-                    ymd = parts[0].split(":")
-                    hms = parts[1].split(":")
-                    dt = QDateTime(int(ymd[0]), int(ymd[1]), int(ymd[2]), 
-                                   int(hms[0]), int(hms[1]), int(hms[2]))
-                    self.date_edit.setDateTime(dt)
-                else:
-                    self.date_edit.setDateTime(QDateTime.currentDateTime())    
-            except Exception as e:
-                 # fallback
-                 print(f"Date parse error: {e}")
-                 self.date_edit.setDateTime(QDateTime.currentDateTime())
+            utc = " (UTC, shown as local time)" if date_str.endswith("Z") else ""
+            self.lbl_date_source.setText(f"Source: {source_tag}{utc}")
         else:
             self.lbl_date_source.setText("Source: Not Found")
+        if taken:
+            v = taken.local
+            self.date_edit.setDateTime(QDateTime(v.year, v.month, v.day, v.hour, v.minute, v.second))
+        else:
+            if date_str:
+                print(f"Date parse error: {date_str}")
             self.date_edit.setDateTime(QDateTime.currentDateTime())
 
         self.date_edit.setEnabled(True)
         self.btn_save.setEnabled(True)
 
+    def set_selection_count(self, count):
+        """
+        Reflects how many files 'Apply Change' will write to.
+        """
+        if count > 1:
+            self.date_group.setTitle(f"Date & Time ({count} files selected)")
+            self.btn_save.setText(f"Apply to {count} Files")
+        else:
+            self.date_group.setTitle("Date & Time")
+            self.btn_save.setText("Apply Change")
+
     def on_save(self):
         if self.current_file:
             dt = self.date_edit.dateTime()
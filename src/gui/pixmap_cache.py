@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+from src.core.instrumentation import instruments
+
+
+class PixmapCache:
+    """
+    In-memory thumbnails, bounded by bytes rather than by count.
+
+    Entries are keyed by (file key, thumbnail size), so zoom levels are
+    cached side by side and an old size can stand in while the new one
+    loads; whatever was used least recently goes first. Evicted thumbnails
+    are simply requested again, which the disk cache makes cheap.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict() # (key, size) -> (QPixmap, bytes), oldest first
+        self._sizes = {} # key -> set of sizes held
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key, size):
+        """
+        Whether (key, size) is cached; counted as a hit or a miss.
+        """
+        entry = self._entries.get((key, size))
+        if entry is None:
+            self.misses += 1
+            instruments.count("pixmap_cache.miss")
+            return False
+        self.hits += 1
+        instruments.count("pixmap_cache.hit")
+        self._entries.move_to_end((key, size))
+        return True
+
+    def pixmap(self, key, size):
+        """
+        The pixmap to paint for `key`: the requested size if cached, else
+        the nearest other size, else None. Not counted.
+        """
+        sizes = self._sizes.get(key)
+        if not sizes:
+            return None
+        best = size if size in sizes else min(sizes, key=lambda s: abs(s - size))
+        self._entries.move_to_end((key, best))
+        return self._entries[(key, best)][0]
+
+    def put(self, key, size, pixmap):
+        self._remove((key, size))
+        footprint = pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        self._entries[(key, size)] = (pixmap, footprint)
+        self._sizes.setdefault(key, set()).add(size)
+        self.total_bytes += footprint
+
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def remove(self, key):
+        """
+        Drops every size of `key`.
+        """
+        for size in list(self._sizes.get(key, ())):
+            self._remove((key, size))
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry[1]
+        key, size = entry_key
+        sizes = self._sizes[key]
+        sizes.discard(size)
+        if not sizes:
+            del self._sizes[key]
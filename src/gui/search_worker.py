@@ -0,0 +1,64 @@
+import threading
+
+from PyQt6.QtCore import QRunnable, QObject, pyqtSignal
+
+from src.core.paths import normalize_path
+from src.core.search_index import extract_search_fields
+from src.core.exif_handler import PANEL
+
+
+class SearchSignals(QObject):
+    indexed = pyqtSignal(dict) # {key: search fields}
+    finished = pyqtSignal()
+
+
+class SearchIndexWorker(QRunnable):
+    """
+    Builds search records from the panel-profile tags in the
+    MetadataIndex. Files the index only has dates for (those the date
+    loader read from their headers) are read with ExifTool first, in
+    batches; files that still have no tags get a name-only record.
+    """
+
+    def __init__(self, filepaths, exif_handler, chunk_size=2000):
+        super().__init__()
+        self.filepaths = filepaths
+        self.exif_handler = exif_handler
+        self.chunk_size = chunk_size
+        self.cancel_event = threading.Event()
+        self.signals = SearchSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            self._index()
+        finally:
+            self.signals.finished.emit()
+
+    def _index(self):
+        index = self.exif_handler.index
+        for i in range(0, len(self.filepaths), self.chunk_size):
+            if self.cancel_event.is_set():
+                return
+            chunk = self.filepaths[i:i + self.chunk_size]
+            try:
+                stored = index.get_many(chunk, PANEL) if index else {}
+                missing = [path for path in chunk if path not in stored]
+                if missing and index:
+                    # Reads and indexes the tags; the dates are known already.
+                    for _ in self.exif_handler.iter_batch_date_info(
+                            missing, cancel_event=self.cancel_event, profile=PANEL):
+                        pass
+                    if self.cancel_event.is_set():
+                        return
+                    stored.update(index.get_many(missing, PANEL))
+            except Exception as e:
+                print(f"Search index error: {e}")
+                stored = {}
+            fields = {}
+            for path in chunk:
+                tags, date_value = stored.get(path, (None, None))
+                fields[normalize_path(path)] = extract_search_fields(path, tags, date_value)
+            self.signals.indexed.emit(fields)
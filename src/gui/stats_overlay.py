@@ -0,0 +1,74 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+
+from src.core.instrumentation import instruments
+
+
+class StatsOverlay(QLabel):
+    """
+    Translucent panel over the top-right corner of a view showing the
+    instrumentation figures: timers (calls, mean, p95, max), queue depths
+    and cache hit rates, refreshed twice a second while shown.
+
+    `sample()` may return extra {name: value} levels read on each refresh
+    (things the GUI knows but nothing records as they change).
+    """
+
+    INTERVAL_MS = 500
+    MARGIN = 8
+
+    def __init__(self, parent, sample=None):
+        super().__init__(parent)
+        self.sample = sample
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.setStyleSheet("background: rgba(0, 0, 0, 170); color: #e0e0e0; padding: 6px; border-radius: 4px;")
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        # Clicks and scrolls reach the view underneath.
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def start(self):
+        self.refresh()
+        self.show()
+        self.raise_()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self.hide()
+
+    def refresh(self):
+        report = instruments.snapshot()
+        lines = [f"{'timer':<34}{'calls':>7}{'mean':>9}{'p95':>9}{'max':>9}  ms"]
+        for name, t in report["timers"].items():
+            lines.append(f"{name:<34}{t['count']:>7}{t['mean_ms']:>9.2f}{t['p95_ms']:>9.2f}{t['max_ms']:>9.1f}")
+
+        levels = dict(report["gauges"])
+        if self.sample:
+            levels.update(self.sample())
+        if levels:
+            lines.append("")
+            lines.extend(f"{name:<34}{value:>7}" for name, value in sorted(levels.items()))
+        if report["hit_rates"]:
+            lines.append("")
+            lines.extend(f"{name + ' hit rate':<34}{rate:>7.0%}" for name, rate in sorted(report["hit_rates"].items()))
+        others = {name: value for name, value in report["counters"].items()
+                  if not name.endswith((".hit", ".miss"))}
+        if others:
+            lines.append("")
+            lines.extend(f"{name:<34}{value:>7}" for name, value in sorted(others.items()))
+
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self._place()
+
+    def _place(self):
+        # Top-right of the parent's viewport, clear of its scroll bar.
+        parent = self.parentWidget()
+        area = parent.viewport().geometry() if hasattr(parent, "viewport") else parent.rect()
+        self.move(max(area.left(), area.right() - self.width() - self.MARGIN), area.top() + self.MARGIN)
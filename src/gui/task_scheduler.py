@@ -0,0 +1,210 @@
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from PyQt6.QtCore import QRunnable, QThreadPool, QThread
+
+from src.core.instrumentation import instruments
+
+
+class Task:
+    """
+    Handle for a submitted job, doubling as its cancellation token.
+    """
+
+    QUEUED, RUNNING, DONE = range(3)
+
+    def __init__(self, scheduler, runnable, priority):
+        self.runnable = runnable
+        self.priority = priority
+        self.state = Task.QUEUED
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self):
+        """
+        Drops the job if it has not started (returns True); a running job is
+        asked to stop via its own cancel(), if it has one.
+        """
+        return self._scheduler.cancel(self)
+
+
+class _Runner(QRunnable):
+    def __init__(self, scheduler, task):
+        super().__init__()
+        self.scheduler = scheduler
+        self.task = task
+
+    def run(self):
+        try:
+            self.task.runnable.run()
+        except Exception as e:
+            print(f"Task error: {e}")
+        finally:
+            self.scheduler._finished(self.task)
+
+
+class TaskScheduler:
+    """
+    Runs QRunnables on a QThreadPool by priority class instead of FIFO.
+
+    Jobs wait in one queue per class and are only handed to the pool when
+    a thread is free, so a job submitted for an on-screen thumbnail starts
+    ahead of thousands of queued off-screen ones. Each class has its own
+    concurrency limit: long-running index and write jobs cannot occupy
+    every thread, and prefetching always leaves room for visible rows.
+    Visible and prefetch jobs together are also held to `decode_threads`,
+    so index and write jobs always find their own threads free.
+
+    Decode-heavy thumbnail work can optionally be sent to `process_pool`,
+    which sidesteps the GIL on many-core machines.
+    """
+
+    # Priority classes, most urgent first.
+    VISIBLE = 0   # thumbnails on screen
+    PREFETCH = 1  # thumbnails just off screen
+    INDEX = 2     # folder scans and date extraction
+    WRITE = 3     # metadata writes
+    CLASSES = (VISIBLE, PREFETCH, INDEX, WRITE)
+    NAMES = {VISIBLE: "visible", PREFETCH: "prefetch", INDEX: "index", WRITE: "write"}
+    # Classes sharing the decode_threads budget.
+    DECODE_CLASSES = (VISIBLE, PREFETCH)
+
+    def __init__(self, limits=None, process_workers=0):
+        cpu = max(1, QThread.idealThreadCount())
+        self.limits = {
+            self.VISIBLE: cpu,
+            self.PREFETCH: max(1, cpu - 1),
+            self.INDEX: 2,
+            self.WRITE: 1,
+        }
+        self.limits.update(limits or {})
+        self.decode_threads = self.limits[self.VISIBLE]
+
+        self.thread_pool = QThreadPool()
+        # Decoding gets the cores; index/write jobs mostly wait on ExifTool
+        # and get threads of their own on top.
+        self.thread_pool.setMaxThreadCount(
+            self.decode_threads + self.limits[self.INDEX] + self.limits[self.WRITE])
+
+        self._lock = threading.Lock()
+        self._queues = {priority: deque() for priority in self.CLASSES}
+        self._running = {priority: 0 for priority in self.CLASSES}
+        self._total = 0
+
+        self.process_workers = process_workers
+        self._process_pool = None
+
+    @property
+    def process_pool(self):
+        """
+        ProcessPoolExecutor for CPU-bound work, or None when disabled.
+        Created on first use.
+        """
+        if not self.process_workers:
+            return None
+        with self._lock:
+            if self._process_pool is None:
+                # spawn: forking a process that runs Qt threads is unsafe.
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"))
+            return self._process_pool
+
+    def submit(self, runnable, priority):
+        task = Task(self, runnable, priority)
+        with self._lock:
+            self._queues[priority].append(task)
+        self._dispatch()
+        return task
+
+    def reprioritize(self, task, priority):
+        """
+        Moves a queued job to another class, e.g. a prefetched thumbnail
+        that scrolled into view.
+        """
+        with self._lock:
+            if task.state != Task.QUEUED or task.priority == priority:
+                return
+            self._queues[task.priority].remove(task)
+            task.priority = priority
+            self._queues[priority].append(task)
+        self._dispatch()
+
+    def cancel(self, task):
+        with self._lock:
+            task.cancelled = True
+            removed = task.state == Task.QUEUED
+            if removed:
+                self._queues[task.priority].remove(task)
+                task.state = Task.DONE
+
+        if not removed and task.state == Task.RUNNING:
+            cancel = getattr(task.runnable, "cancel", None)
+            if cancel:
+                cancel()
+        return removed
+
+    def clear(self, priority=None):
+        """
+        Drops every queued job (of one class, if given). Running ones finish.
+        """
+        with self._lock:
+            for p in self.CLASSES if priority is None else (priority,):
+                for task in self._queues[p]:
+                    task.cancelled = True
+                    task.state = Task.DONE
+                self._queues[p].clear()
+        self._report()
+
+    def queued(self, priority):
+        with self._lock:
+            return len(self._queues[priority])
+
+    def shutdown(self, msecs=2000):
+        self.clear()
+        if self._process_pool:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        self.thread_pool.waitForDone(msecs)
+
+    def _dispatch(self):
+        started = []
+        with self._lock:
+            capacity = self.thread_pool.maxThreadCount()
+            for priority in self.CLASSES:
+                queue = self._queues[priority]
+                while (queue and self._total < capacity
+                       and self._running[priority] < self.limits[priority]
+                       and (priority not in self.DECODE_CLASSES or self._decoding() < self.decode_threads)):
+                    task = queue.popleft()
+                    task.state = Task.RUNNING
+                    self._running[priority] += 1
+                    self._total += 1
+                    started.append(task)
+
+        for task in started:
+            self.thread_pool.start(_Runner(self, task))
+        self._report()
+
+    def _report(self):
+        if not instruments.enabled:
+            return
+        with self._lock:
+            depths = {priority: (len(self._queues[priority]), self._running[priority])
+                      for priority in self.CLASSES}
+        for priority, (queued, running) in depths.items():
+            name = self.NAMES[priority]
+            instruments.gauge(f"scheduler.queued.{name}", queued)
+            instruments.gauge(f"scheduler.running.{name}", running)
+
+    def _decoding(self):
+        # Called with the lock held.
+        return sum(self._running[priority] for priority in self.DECODE_CLASSES)
+
+    def _finished(self, task):
+        with self._lock:
+            task.state = Task.DONE
+            self._running[task.priority] -= 1
+            self._total -= 1
+        self._dispatch()
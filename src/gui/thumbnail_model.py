@@ -0,0 +1,539 @@
+import os
+import bisect
+from collections import Counter
+from datetime import date
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QPixmap
+
+from src.core.paths import normalize_path
+from src.gui.pixmap_cache import PixmapCache
+
+# Sort orders, and the per-file attribute each depends on besides the path.
+SORT_ORDERS = ('path', 'name', 'date', 'size', 'camera')
+# Timeline grouping (only meaningful when sorted by date).
+GROUPINGS = ('year', 'month', 'day')
+
+
+class ThumbnailModel(QAbstractListModel):
+    """
+    Flat list of media files for the thumbnail grid.
+
+    Rows are plain paths; thumbnails live in a byte-bounded PixmapCache so
+    memory stays flat no matter how large the folder is. Rows whose pixmap
+    has been evicted simply report no decoration (or another zoom level's)
+    and get re-requested by the view.
+
+    Per-file state is keyed by `normalize_path`, the same key ExifHandler
+    returns results under, so delivering a result is a dict lookup.
+
+    Every listed file has a precomputed sort key, and both the full list
+    and the shown (filtered) rows are kept in that order, so a row is found
+    by binary search and a new file or changed date is placed without
+    re-sorting. Changes reach the view as row insertions, removals and
+    moves, so selection and scroll position survive results streaming in.
+    """
+
+    FilePathRole = Qt.ItemDataRole.UserRole
+    # Timeline header text on the first row of each group, else None.
+    GroupHeaderRole = Qt.ItemDataRole.UserRole + 1
+    # Beyond this many separate runs of inserted/removed rows a reset is cheaper.
+    MAX_ROW_RUNS = 1024
+    # Beyond this many files changing place, one layout change is cheaper
+    # than moving rows one by one.
+    MAX_ROW_MOVES = 256
+
+    def __init__(self, parent=None, cache_bytes=256 * 1024 * 1024, thumbnail_size=200):
+        super().__init__(parent)
+        self.pixmaps = PixmapCache(cache_bytes)
+        self.thumbnail_size = thumbnail_size
+        self.sort_by = 'path'
+        self.group_by = None
+        self._paths = {}  # key -> path, for every listed file
+        self._order = []  # every listed key, in sort order
+        self._sort_keys = {}  # key -> sort key under sort_by
+        self._filter = None  # keys to show; None shows all
+        self._keys = []  # shown rows, in sort order
+        self._dates = {}  # key -> DateTaken, None when the file has none; absent while loading
+        self._sizes = {}  # key -> bytes
+        self._cameras = {}  # key -> "make model", lower case
+        self._group_counts = None  # group -> shown files, built on demand
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            key = self._keys[row]
+            if key in self._dates:
+                taken = self._dates[key]
+                date_text = taken.text if taken else "-"
+            else:
+                date_text = "Loading..."
+            return f"{os.path.basename(self._paths[key])}\n{date_text}"
+
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.pixmaps.pixmap(self._keys[row], self.thumbnail_size)
+
+        if role == self.FilePathRole:
+            return self._paths[self._keys[row]]
+
+        if role == self.GroupHeaderRole:
+            return self.group_header(row)
+
+        return None
+
+    def set_files(self, filepaths):
+        self._paths = {}
+        for path in filepaths:
+            self._paths.setdefault(normalize_path(path), path)
+        self._dates = {}
+        self._sizes = {}
+        self._cameras = {}
+        self._sort_keys = {key: self._sort_key(key) for key in self._paths}
+        self._order = sorted(self._paths, key=self._sort_keys.__getitem__)
+        self._reset_rows()
+
+    def append_files(self, filepaths, sizes=None):
+        """
+        Adds files at their sorted position, skipping paths already listed.
+        `sizes` optionally maps path -> bytes (for sorting by size).
+        """
+        new = []
+        for path in filepaths:
+            key = normalize_path(path)
+            if key in self._paths:
+                continue
+            self._paths[key] = path
+            if sizes and path in sizes:
+                self._sizes[key] = sizes[path]
+            new.append(key)
+        if not new:
+            return
+
+        sort_keys = self._sort_keys
+        for key in new:
+            sort_keys[key] = self._sort_key(key)
+        if len(new) > self.MAX_ROW_MOVES:
+            self._order = self._merged(self._order, sorted(new, key=sort_keys.__getitem__))
+        else:
+            for key in new:
+                bisect.insort(self._order, key, key=sort_keys.__getitem__)
+        self._insert_rows([key for key in new if self._shown(key)])
+
+    def remove_files(self, filepaths):
+        """
+        Forgets `filepaths` and removes their rows, one notification per
+        contiguous run.
+        """
+        gone = {key for key in map(normalize_path, filepaths) if key in self._paths}
+        if not gone:
+            return
+        self._remove_rows(gone)
+        if len(gone) > self.MAX_ROW_MOVES:
+            self._order = [key for key in self._order if key not in gone]
+        else:
+            for key in gone:
+                del self._order[self._position(self._order, key)]
+        for key in gone:
+            del self._paths[key]
+            del self._sort_keys[key]
+            self._dates.pop(key, None)
+            self._sizes.pop(key, None)
+            self._cameras.pop(key, None)
+            self.pixmaps.remove(key)
+
+    def set_filter(self, keys):
+        """
+        Shows only the files whose key is in `keys` (None shows all).
+        """
+        new = None if keys is None else set(keys)
+        shown = set(self._keys)
+        if new is None:
+            hidden = []
+            revealed = [key for key in self._order if key not in shown]
+        else:
+            hidden = shown - new
+            revealed = [key for key in new if key in self._paths and key not in shown]
+        if len(hidden) + len(revealed) > self.MAX_ROW_RUNS:
+            self._filter = new
+            self._reset_rows()
+            return
+
+        # Rows are located under the old filter, so hide them first.
+        self._remove_rows(hidden)
+        self._filter = new
+        self._insert_rows(revealed)
+
+    def set_sort(self, sort_by):
+        """
+        Re-sorts every file by one of SORT_ORDERS. Later arrivals are placed
+        incrementally.
+        """
+        if sort_by not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort_by}")
+        self.sort_by = sort_by
+        self._sort_keys = {key: self._sort_key(key) for key in self._order}
+        self._order.sort(key=self._sort_keys.__getitem__)
+        self._relayout()
+
+    def set_group_by(self, group_by):
+        """
+        Groups the timeline by one of GROUPINGS, or not at all (None).
+        """
+        if group_by is not None and group_by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping: {group_by}")
+        self.group_by = group_by
+        self._group_counts = None
+        self._emit_all_changed()
+
+    def file_count(self):
+        """
+        Number of listed files, shown or not.
+        """
+        return len(self._order)
+
+    def all_files(self):
+        return [self._paths[key] for key in self._order]
+
+    def invalidate(self, filepaths):
+        """
+        Forgets the thumbnail of changed files so it is loaded again. Their
+        date stays (and keeps them in place) until the new one arrives.
+        """
+        rows = []
+        for key in map(normalize_path, filepaths):
+            self.pixmaps.remove(key)
+            row = self._row(key)
+            if row is not None:
+                rows.append(row)
+        self._emit_rows_changed(rows, Qt.ItemDataRole.DecorationRole)
+
+    def file_path(self, row):
+        return self._paths[self._keys[row]]
+
+    def file_key(self, row):
+        return self._keys[row]
+
+    def row_of(self, filepath):
+        return self._row(normalize_path(filepath))
+
+    def has_thumbnail(self, row):
+        """
+        Whether the row's thumbnail at the current size is in memory
+        (counted as a cache hit or miss).
+        """
+        return self.pixmaps.lookup(self._keys[row], self.thumbnail_size)
+
+    def set_thumbnail_size(self, size):
+        """
+        Switches the zoom level; cached pixmaps of other sizes keep being
+        shown until the new ones arrive.
+        """
+        if size == self.thumbnail_size:
+            return
+        self.thumbnail_size = size
+        if self._keys:
+            self._emit_rows_changed([0, len(self._keys) - 1], Qt.ItemDataRole.DecorationRole)
+
+    def set_thumbnail(self, filepath, size, image):
+        self.set_thumbnails({(normalize_path(filepath), size): image})
+
+    def set_thumbnails(self, images):
+        """
+        Applies {(key, size): QImage} in one go. The pixmap upload happens
+        here, on the GUI thread, once per batch.
+        """
+        rows = []
+        for (key, size), image in images.items():
+            row = self._row(key)
+            if row is None:
+                continue
+            self.pixmaps.put(key, size, QPixmap.fromImage(image))
+            rows.append(row)
+        self._emit_rows_changed(rows, Qt.ItemDataRole.DecorationRole)
+
+    def date_taken(self, filepath):
+        """
+        The file's DateTaken, or None if it has none or is still loading.
+        """
+        return self._dates.get(normalize_path(filepath))
+
+    def set_dates(self, dates):
+        """
+        Applies {key: DateTaken or None} in one go; None shows as '-'.
+        """
+        self._update(self._dates, dates, ('date', 'camera'), Qt.ItemDataRole.DisplayRole)
+
+    def set_sizes(self, sizes):
+        """
+        Applies {key: file size in bytes}.
+        """
+        self._update(self._sizes, sizes, ('size',))
+
+    def set_cameras(self, cameras):
+        """
+        Applies {key: camera name}.
+        """
+        self._update(self._cameras, cameras, ('camera',))
+
+    def mark_dates_missing(self):
+        """
+        Rows still 'Loading...' once date extraction has finished get '-'.
+        """
+        self.set_dates({key: None for key in self._order if key not in self._dates})
+
+    def group_header(self, row):
+        """
+        Header text if `row` starts a timeline group, else None.
+        """
+        if not self.group_by:
+            return None
+        group = self._group_of(self._keys[row])
+        if row > 0 and self._group_of(self._keys[row - 1]) == group:
+            return None
+        return self.group_label(row)
+
+    def group_label(self, row):
+        """
+        Text naming the timeline group `row` belongs to, with its size.
+        """
+        if not self.group_by:
+            return None
+        if self._group_counts is None:
+            self._group_counts = Counter(map(self._group_of, self._keys))
+        group = self._group_of(self._keys[row])
+        return f"{_format_group(group)} ({self._group_counts[group]})"
+
+    def _group_of(self, key):
+        taken = self._dates.get(key)
+        if taken is None:
+            return None
+        day = taken.local
+        if self.group_by == 'year':
+            return (day.year,)
+        if self.group_by == 'month':
+            return (day.year, day.month)
+        return (day.year, day.month, day.day)
+
+    def _count_groups(self, keys, delta):
+        if self._group_counts is not None:
+            for key in keys:
+                self._group_counts[self._group_of(key)] += delta
+
+    def _sort_key(self, key):
+        # Files lacking the attribute sort after those that have it; the
+        # key itself breaks ties, so every sort key is unique.
+        by = self.sort_by
+        if by == 'name':
+            return (os.path.basename(self._paths[key]).casefold(), key)
+        if by == 'date':
+            taken = self._dates.get(key)
+            return (0, taken.timestamp, key) if taken else (1, 0, key)
+        if by == 'size':
+            size = self._sizes.get(key)
+            return (0, size, key) if size is not None else (1, 0, key)
+        if by == 'camera':
+            camera = self._cameras.get(key)
+            taken = self._dates.get(key)
+            return (0 if camera else 1, camera or "", taken.timestamp if taken else 0, key)
+        return (key,)
+
+    def _position(self, keys, key):
+        """
+        Index of `key` in the sorted list `keys` (which must contain it).
+        """
+        return bisect.bisect_left(keys, self._sort_keys[key], key=self._sort_keys.__getitem__)
+
+    def _row(self, key):
+        if key not in self._sort_keys or not self._shown(key):
+            return None
+        row = self._position(self._keys, key)
+        return row if row < len(self._keys) and self._keys[row] == key else None
+
+    def _shown(self, key):
+        return self._filter is None or key in self._filter
+
+    def _update(self, store, values, sort_orders, role=None):
+        """
+        Stores per-file values and moves the files whose sort key changed.
+        """
+        changed = [key for key in values if key in self._paths]
+        if not changed:
+            return
+        dates = store is self._dates and self.group_by
+        if dates:
+            self._count_groups([key for key in changed if self._shown(key)], -1)
+        for key in changed:
+            store[key] = values[key]
+        if dates:
+            self._count_groups([key for key in changed if self._shown(key)], 1)
+
+        if self.sort_by in sort_orders:
+            self._resort(changed)
+        if dates:
+            # Headers and counts may change anywhere; only on-screen rows repaint.
+            self._emit_all_changed()
+        elif role is not None:
+            self._emit_rows_changed([row for row in map(self._row, changed) if row is not None], role)
+
+    def _resort(self, keys):
+        """
+        Moves `keys` to where their current sort key belongs.
+        """
+        sort_keys = self._sort_keys
+        moved = []
+        for key in keys:
+            new = self._sort_key(key)
+            if new != sort_keys[key]:
+                moved.append((key, new))
+        if not moved:
+            return
+
+        if len(moved) > self.MAX_ROW_MOVES:
+            moved_keys = {key for key, _ in moved}
+            rest = [key for key in self._order if key not in moved_keys]
+            sort_keys.update(moved)
+            self._order = self._merged(rest, sorted(moved_keys, key=sort_keys.__getitem__))
+            self._relayout()
+            return
+
+        for key, new in moved:
+            del self._order[self._position(self._order, key)]
+            row = self._row(key)
+            if row is not None:
+                del self._keys[row]
+            sort_keys[key] = new
+            bisect.insort(self._order, key, key=sort_keys.__getitem__)
+            if row is None:
+                continue
+
+            target = self._position(self._keys, key) if self._keys else 0
+            self._keys.insert(row, key) # back, until Qt has been told
+            if target == row:
+                continue
+            # Qt counts the destination before the source row is taken out.
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target if target < row else target + 1)
+            del self._keys[row]
+            self._keys.insert(target, key)
+            self.endMoveRows()
+
+    def _merged(self, keys, extra):
+        """
+        The sorted list `keys` with the sorted `extra` keys merged in; a
+        binary search per extra key instead of comparing every pair.
+        """
+        sort_keys = self._sort_keys
+        merged = []
+        start = 0
+        for key in extra:
+            position = bisect.bisect_left(keys, sort_keys[key], lo=start, key=sort_keys.__getitem__)
+            merged.extend(keys[start:position])
+            merged.append(key)
+            start = position
+        merged.extend(keys[start:])
+        return merged
+
+    def _shown_keys(self):
+        if self._filter is None:
+            return list(self._order)
+        return [key for key in self._order if key in self._filter]
+
+    def _insert_rows(self, keys):
+        """
+        Inserts rows for `keys` (already in _order) at their sorted places,
+        one notification per contiguous run.
+        """
+        if not keys:
+            return
+        sort_keys = self._sort_keys
+        keys = sorted(keys, key=sort_keys.__getitem__)
+        runs = [] # [position in the current rows, keys], ascending
+        for key in keys:
+            position = bisect.bisect_left(self._keys, sort_keys[key], key=sort_keys.__getitem__)
+            if runs and runs[-1][0] == position:
+                runs[-1][1].append(key)
+            else:
+                runs.append((position, [key]))
+        if len(runs) > self.MAX_ROW_RUNS or len(keys) > len(self._keys):
+            self._reset_rows()
+            return
+
+        self._count_groups(keys, 1)
+        inserted = 0
+        for position, run in runs:
+            row = position + inserted
+            self.beginInsertRows(QModelIndex(), row, row + len(run) - 1)
+            self._keys[row:row] = run
+            self.endInsertRows()
+            inserted += len(run)
+
+    def _remove_rows(self, keys):
+        """
+        Removes the rows of `keys`, last runs first so earlier rows stay valid.
+        """
+        rows = sorted(row for row in map(self._row, keys) if row is not None)
+        if not rows:
+            return
+        runs = []
+        for row in reversed(rows):
+            if runs and row == runs[-1][0] - 1:
+                runs[-1][0] = row
+            else:
+                runs.append([row, row])
+        if len(runs) > self.MAX_ROW_RUNS:
+            gone = set(keys)
+            self._keys = [key for key in self._keys if key not in gone]
+            self._reset_rows(self._keys)
+            return
+
+        self._count_groups([self._keys[row] for row in rows], -1)
+        for start, end in runs:
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._keys[start:end + 1]
+            self.endRemoveRows()
+
+    def _reset_rows(self, keys=None):
+        self.beginResetModel()
+        self._keys = self._shown_keys() if keys is None else keys
+        self._group_counts = None
+        self.endResetModel()
+
+    def _relayout(self):
+        """
+        Re-reads the shown rows from _order after a re-sort, as one layout
+        change that carries selection and current index along.
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        persistent_keys = [self._keys[index.row()] for index in persistent]
+        self._keys = self._shown_keys()
+        self.changePersistentIndexList(
+            persistent, [self.index(self._row(key)) for key in persistent_keys])
+        self.layoutChanged.emit()
+
+    def _emit_all_changed(self):
+        if self._keys:
+            self.dataChanged.emit(self.index(0), self.index(len(self._keys) - 1))
+
+    def _emit_rows_changed(self, rows, role):
+        # One notification spanning the touched rows; the view only
+        # repaints what is actually on screen.
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [role])
+
+
+def _format_group(group):
+    if group is None:
+        return "No date"
+    if len(group) == 1:
+        return str(group[0])
+    if len(group) == 2:
+        return date(group[0], group[1], 1).strftime("%B %Y")
+    return date(*group).strftime("%a %d %B %Y")
@@ -0,0 +1,103 @@
+from PyQt6.QtWidgets import QListView
+from PyQt6.QtCore import QPoint, QRect, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter
+
+from src.gui.custom_delegate import ThumbnailDelegate
+from src.core.instrumentation import instruments
+
+
+class ThumbnailListView(QListView):
+    """
+    Icon-mode list view that reports which rows are on screen, so thumbnails
+    are only requested for what the user can actually see. When the model
+    groups a timeline, the group of the top row stays pinned as a header.
+    """
+
+    visible_range_changed = pyqtSignal(int, int)  # first row, last row
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Coalesce scroll/resize bursts into one range update.
+        self._range_timer = QTimer(self)
+        self._range_timer.setSingleShot(True)
+        self._range_timer.setInterval(30)
+        self._range_timer.timeout.connect(self._emit_visible_range)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_visible_range)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.modelReset.connect(self.schedule_visible_range)
+        model.rowsInserted.connect(self.schedule_visible_range)
+        model.rowsRemoved.connect(self.schedule_visible_range)
+        model.layoutChanged.connect(self.schedule_visible_range)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_visible_range()
+
+    @instruments.timed("gui.paint")
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        model = self.model()
+        if model is None or not getattr(model, "group_by", None):
+            return
+        index = self._top_index()
+        # A top row that starts its group shows the header itself.
+        if index is None or model.group_header(index.row()):
+            return
+        label = model.group_label(index.row())
+        if label:
+            rect = self.viewport().rect()
+            width = self.gridSize().width() if self.gridSize().isValid() else 200
+            painter = QPainter(self.viewport())
+            ThumbnailDelegate.paint_group_header(
+                painter, QRect(rect.left() + 4, rect.top() + 2, min(rect.width(), width) - 8, 20), label)
+            painter.end()
+
+    def _top_index(self):
+        rect = self.viewport().rect()
+        grid = self.gridSize()
+        step = max(8, grid.width() // 2) if grid.isValid() else 50
+        for y in (rect.top() + 1, rect.top() + step):
+            for x in range(rect.left() + 1, rect.right(), step):
+                index = self.indexAt(QPoint(x, y))
+                if index.isValid():
+                    return index
+        return None
+
+    def schedule_visible_range(self, *args):
+        self._range_timer.start()
+
+    def visible_range(self):
+        """
+        Returns (first_row, last_row) currently in the viewport, or None.
+        """
+        model = self.model()
+        if model is None or model.rowCount() == 0:
+            return None
+
+        # Probe on a half-cell lattice; cheaper and more robust than
+        # reimplementing the icon-mode layout arithmetic.
+        rect = self.viewport().rect()
+        grid = self.gridSize()
+        step_x = max(8, grid.width() // 2) if grid.isValid() else 50
+        step_y = max(8, grid.height() // 2) if grid.isValid() else 50
+
+        first = last = None
+        for y in range(rect.top() + 1, rect.bottom() + step_y, step_y):
+            y = min(y, rect.bottom() - 1)
+            for x in range(rect.left() + 1, rect.right() + step_x, step_x):
+                index = self.indexAt(QPoint(min(x, rect.right() - 1), y))
+                if index.isValid():
+                    row = index.row()
+                    first = row if first is None else min(first, row)
+                    last = row if last is None else max(last, row)
+
+        if first is None:
+            return None
+        return first, last
+
+    def _emit_visible_range(self):
+        visible = self.visible_range()
+        if visible:
+            self.visible_range_changed.emit(*visible)
@@ -0,0 +1,181 @@
+import os
+import threading
+from datetime import timedelta
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox,
+                             QSpinBox, QCheckBox, QLineEdit, QPushButton, QLabel,
+                             QTableWidget, QTableWidgetItem, QDialogButtonBox, QHeaderView)
+from PyQt6.QtCore import QRegularExpression, QRunnable, QObject, pyqtSignal
+from PyQt6.QtGui import QRegularExpressionValidator
+
+from src.core.dates import parse_offset, format_offset
+from src.gui.task_scheduler import TaskScheduler
+
+
+class PreviewSignals(QObject):
+    finished = pyqtSignal(object) # list of (filepath, tag, old, new), or None if cancelled
+
+
+class ShiftPreviewWorker(QRunnable):
+    """
+    Computes a time-shift preview off the GUI thread; files not indexed
+    yet need an ExifTool read.
+    """
+
+    def __init__(self, filepaths, exif_handler, delta, offset):
+        super().__init__()
+        self.filepaths = filepaths
+        self.exif_handler = exif_handler
+        self.delta = delta
+        self.offset = offset
+        self.cancel_event = threading.Event()
+        self.signals = PreviewSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        rows = None
+        try:
+            rows = self.exif_handler.preview_shift(self.filepaths, self.delta, self.offset, self.cancel_event)
+        except Exception as e:
+            print(f"Error building the shift preview: {e}")
+        try:
+            self.signals.finished.emit(rows)
+        except RuntimeError:
+            pass # dialog gone
+
+
+class TimeShiftDialog(QDialog):
+    """
+    Asks for a clock offset (and optionally a new timezone) to apply to a
+    set of files, with a dry-run preview built in the background from
+    cached metadata.
+    """
+
+    # Preview rows beyond this are counted but not listed.
+    MAX_PREVIEW_ROWS = 500
+
+    def __init__(self, filepaths, exif_handler, scheduler, parent=None):
+        super().__init__(parent)
+        self.filepaths = filepaths
+        self.exif_handler = exif_handler
+        self.scheduler = scheduler
+        self._preview_task = None
+        self._preview_worker = None
+        self.setWindowTitle("Shift Dates")
+        self.resize(720, 520)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Shift all date/time tags of {len(self.filepaths)} file(s)."))
+
+        form = QFormLayout()
+        self.direction = QComboBox()
+        self.direction.addItems(["Later (+)", "Earlier (-)"])
+        form.addRow("Direction:", self.direction)
+
+        amount = QHBoxLayout()
+        self.days = self._spin(0, 36500, " d")
+        self.hours = self._spin(0, 23, " h")
+        self.minutes = self._spin(0, 59, " m")
+        self.seconds = self._spin(0, 59, " s")
+        for spin in (self.days, self.hours, self.minutes, self.seconds):
+            amount.addWidget(spin)
+        form.addRow("Amount:", amount)
+
+        offset_row = QHBoxLayout()
+        self.set_offset = QCheckBox("Also set timezone (OffsetTime*) to")
+        self.offset_edit = QLineEdit("+00:00")
+        self.offset_edit.setValidator(QRegularExpressionValidator(
+            QRegularExpression(r"Z|[+-]\d{2}:\d{2}")))
+        self.offset_edit.setEnabled(False)
+        self.set_offset.toggled.connect(self.offset_edit.setEnabled)
+        offset_row.addWidget(self.set_offset)
+        offset_row.addWidget(self.offset_edit)
+        form.addRow("", offset_row)
+        layout.addLayout(form)
+
+        self.btn_preview = QPushButton("Preview")
+        self.btn_preview.clicked.connect(self.update_preview)
+        layout.addWidget(self.btn_preview)
+
+        self.preview = QTableWidget(0, 4)
+        self.preview.setHorizontalHeaderLabels(["File", "Tag", "Current", "New"])
+        self.preview.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview.verticalHeader().setVisible(False)
+        layout.addWidget(self.preview)
+        self.lbl_summary = QLabel("")
+        layout.addWidget(self.lbl_summary)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.button(QDialogButtonBox.StandardButton.Ok).setText("Apply Shift")
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def _spin(self, low, high, suffix):
+        spin = QSpinBox()
+        spin.setRange(low, high)
+        spin.setSuffix(suffix)
+        return spin
+
+    def delta(self):
+        delta = timedelta(days=self.days.value(), hours=self.hours.value(),
+                          minutes=self.minutes.value(), seconds=self.seconds.value())
+        return -delta if self.direction.currentIndex() == 1 else delta
+
+    def offset(self):
+        """
+        The OffsetTime* value to write, or None.
+        """
+        if not self.set_offset.isChecked():
+            return None
+        tz = parse_offset(self.offset_edit.text())
+        return format_offset(tz) if tz else None
+
+    def update_preview(self):
+        self.cancel_preview()
+        worker = ShiftPreviewWorker(self.filepaths, self.exif_handler, self.delta(), self.offset())
+        worker.signals.finished.connect(lambda rows: self.show_preview(worker, rows))
+        self._preview_worker = worker
+        self._preview_task = self.scheduler.submit(worker, TaskScheduler.VISIBLE)
+        self.lbl_summary.setText(f"Reading tags of {len(self.filepaths)} file(s)...")
+
+    def cancel_preview(self):
+        if self._preview_task is not None:
+            self.scheduler.cancel(self._preview_task)
+        self._preview_task = self._preview_worker = None
+
+    def show_preview(self, worker, rows):
+        if worker is not self._preview_worker:
+            return # superseded or cancelled
+        self._preview_task = self._preview_worker = None
+        if rows is None:
+            self.lbl_summary.setText("Could not build the preview.")
+            return
+        shown = rows[:self.MAX_PREVIEW_ROWS]
+
+        self.preview.setRowCount(len(shown))
+        for i, (path, tag, old, new) in enumerate(shown):
+            for col, text in enumerate((os.path.basename(path), tag, old, new)):
+                self.preview.setItem(i, col, QTableWidgetItem("" if text is None else str(text)))
+
+        files = len({row[0] for row in rows})
+        summary = f"{len(rows)} tag change(s) in {files} file(s)."
+        if len(rows) > len(shown):
+            summary += f" Showing the first {len(shown)}."
+        self.lbl_summary.setText(summary)
+
+    def accept(self):
+        if not self.delta() and not self.offset():
+            self.lbl_summary.setText("Nothing to change: set an amount or a timezone.")
+            return
+        self.cancel_preview()
+        super().accept()
+
+    def reject(self):
+        self.cancel_preview()
+        super().reject()
@@ -0,0 +1,47 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from src.core.instrumentation import instruments
+
+
+class UpdateBatcher(QObject):
+    """
+    Collects per-file results arriving from workers and hands them to the
+    GUI in one dict per interval, so hundreds of updates cost one model
+    change notification and one repaint instead of one each.
+    """
+
+    flushed = pyqtSignal(dict)  # {normalized path: value}
+
+    def __init__(self, interval_ms=50, parent=None, name="batcher"):
+        super().__init__(parent)
+        self.name = name
+        self._pending = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def add(self, key, value):
+        self._pending[key] = value
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def add_many(self, values):
+        if not values:
+            return
+        self._pending.update(values)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self):
+        self._timer.stop()
+        self._pending = {}
+
+    def flush(self):
+        self._timer.stop()
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            instruments.count(f"{self.name}.items", len(batch))
+            # Covers the slots connected to `flushed`: they run synchronously.
+            with instruments.timer(f"{self.name}.flush"):
+                self.flushed.emit(batch)
@@ -0,0 +1,107 @@
+"""
+Parsing of time shifts, EXIF offsets and ExifTool date values.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.dates import (parse_shift, format_shift, parse_offset, format_offset, parse_exif_datetime,
+                            parse_date_taken, to_utc)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("+1:30", timedelta(hours=1, minutes=30)),
+    ("1:30", timedelta(hours=1, minutes=30)),
+    ("-1:30", -timedelta(hours=1, minutes=30)),
+    ("-2 03:00:00", -timedelta(days=2, hours=3)),
+    ("+0 0:0:45", timedelta(seconds=45)),
+    ("  +10:05:07  ", timedelta(hours=10, minutes=5, seconds=7)),
+])
+def test_parse_shift(text, expected):
+    assert parse_shift(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", None, "1", "+1h", "1:30:00:00", "+-1:00", "1 :30", "a:b"])
+def test_parse_shift_rejects(text):
+    assert parse_shift(text) is None
+
+
+@pytest.mark.parametrize("delta, expected", [
+    (timedelta(hours=1, minutes=30), ("+=", "0:0:0 1:30:0")),
+    (-timedelta(days=2, hours=3, seconds=5), ("-=", "0:0:2 3:0:5")),
+])
+def test_format_shift(delta, expected):
+    assert format_shift(delta) == expected
+
+
+@pytest.mark.parametrize("text, minutes", [
+    ("+09:00", 9 * 60),
+    ("-0530", -(5 * 60 + 30)),
+    (" +14:00 ", 14 * 60),
+    ("Z", 0),
+])
+def test_parse_offset(text, minutes):
+    tz = parse_offset(text)
+    assert tz.utcoffset(None) == timedelta(minutes=minutes)
+
+
+@pytest.mark.parametrize("text", ["", None, "+9", "+14:01", "09:00", "+09:0", "UTC"])
+def test_parse_offset_rejects(text):
+    assert parse_offset(text) is None
+
+
+def test_format_offset_round_trips():
+    for text in ("+09:00", "-05:30", "+00:00"):
+        assert format_offset(parse_offset(text)) == text
+    assert format_offset(timezone.utc) == "+00:00"
+
+
+@pytest.mark.parametrize("value", [
+    "2021:05:06 07:08:09",
+    "2021:05:06 07:08:09.123+02:00",
+    "2021:05:06 07:08:09Z",
+    "2021:05:06",
+    "07:08:09-05:00",
+])
+def test_exif_datetime_round_trips(value):
+    assert parse_exif_datetime(value).format() == value
+
+
+@pytest.mark.parametrize("value", ["0000:00:00 00:00:00", "2021:13:01 00:00:00", "yesterday", "", None, 20210506])
+def test_exif_datetime_rejects(value):
+    assert parse_exif_datetime(value) is None
+
+
+def test_shift_date_only_value_by_whole_days():
+    parsed = parse_exif_datetime("2021:05:06")
+    assert parsed.shifted(timedelta(hours=30)).format() == "2021:05:07"
+    assert parsed.shifted(-timedelta(hours=30)).format() == "2021:05:05"
+    assert parse_exif_datetime("2021:05:06 23:30:00").shifted(timedelta(hours=1)).value == datetime(2021, 5, 7, 0, 30)
+
+
+@pytest.fixture
+def tokyo(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Asia/Tokyo")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_utc_dates_round_trip_through_local_time(tokyo):
+    # What the grid and the panel show for a UTC QuickTime date, and what
+    # an unchanged edit writes back.
+    taken = parse_date_taken("2021:01:01 00:00:00Z")
+    assert taken.local == datetime(2021, 1, 1, 9, 0)
+    assert to_utc(taken.local.strftime("%Y:%m:%d %H:%M:%S")) == "2021:01:01 00:00:00"
+    assert to_utc("2021:01:01 09:00:00+05:00") == "2021:01:01 04:00:00"
+    assert to_utc("2021:01:01") == "2021:01:01"
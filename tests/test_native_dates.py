@@ -0,0 +1,195 @@
+"""
+Accept and fallback rules of the native date reader, on small files built
+here: PIL JPEGs with chosen EXIF/XMP/APP segments and hand-assembled
+ISO-BMFF box trees.
+
+When ExifTool can be found (see src/core/paths.get_exiftool_path), every
+fixture the reader accepts is also checked against ExifTool's own output.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import struct
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.native_dates import read_date_tags
+from src.core.exif_handler import ExifHandler, DATES
+from src.core.paths import get_exiftool_path
+
+TAG_MAKE = 0x010F
+TAG_EXIF_IFD = 0x8769
+TAG_ISO = 0x8827
+TAG_DATE_TIME_ORIGINAL = 0x9003
+TAG_OFFSET_TIME = 0x9010
+TAG_OFFSET_TIME_ORIGINAL = 0x9011
+
+DATE = "2021:05:06 07:08:09"
+QUICKTIME_EPOCH_OFFSET = 2082844800
+# 2021-01-01 00:00:00 in QuickTime seconds
+CREATED = QUICKTIME_EPOCH_OFFSET + 1609459200
+
+
+def make_jpeg(path, ifd0=None, exif=None, xmp=None, segment=None):
+    """
+    Writes a small JPEG with the given IFD0 and EXIF IFD tags, optional
+    XMP packet and an optional extra (marker, payload) APPn segment right
+    after SOI.
+    """
+    image = Image.new("RGB", (64, 48), (10, 20, 30))
+    options = {}
+    if ifd0 or exif:
+        tags = Image.Exif()
+        for tag, value in (ifd0 or {}).items():
+            tags[tag] = value
+        if exif:
+            exif_ifd = tags.get_ifd(TAG_EXIF_IFD)
+            for tag, value in exif.items():
+                exif_ifd[tag] = value
+        options["exif"] = tags
+    if xmp:
+        options["xmp"] = xmp
+    image.save(path, "JPEG", **options)
+    if segment:
+        marker, payload = segment
+        with open(path, "rb") as f:
+            data = f.read()
+        app = b"\xff" + bytes([marker]) + struct.pack(">H", len(payload) + 2) + payload
+        with open(path, "wb") as f:
+            f.write(data[:2] + app + data[2:])
+    return str(path)
+
+
+def box(kind, payload):
+    return struct.pack(">L4s", 8 + len(payload), kind) + payload
+
+
+def mvhd(created, version=0):
+    if version == 0:
+        body = b"\0\0\0\0" + struct.pack(">LL", created, created) + b"\0" * 88
+    else:
+        body = b"\1\0\0\0" + struct.pack(">QQ", created, created) + b"\0" * 88
+    return box(b"mvhd", body)
+
+
+TRAK = box(b"trak", box(b"tkhd", b"\0" * 84) + box(b"mdia", box(b"mdhd", b"\0" * 24)))
+
+
+def make_movie(path, moov_children, mdat_first=False, trailer=b""):
+    """
+    Writes ftyp, moov (with `moov_children`) and mdat boxes, then `trailer`.
+    """
+    moov = box(b"moov", b"".join(moov_children))
+    mdat = box(b"mdat", b"\0" * 1000)
+    body = mdat + moov if mdat_first else moov + mdat
+    with open(path, "wb") as f:
+        f.write(box(b"ftyp", b"isom\0\0\0\0isom") + body + trailer)
+    return str(path)
+
+
+# Each fixture: name -> (builder(tmp_path) -> path, expected tags or None)
+def _jpeg(name, **kwargs):
+    return lambda tmp_path: make_jpeg(tmp_path / name, **kwargs)
+
+
+def _movie(name, *args, **kwargs):
+    return lambda tmp_path: make_movie(tmp_path / name, *args, **kwargs)
+
+
+ACCEPTED = {
+    "jpeg": (_jpeg("plain.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_DATE_TIME_ORIGINAL: DATE}),
+             {"EXIF:DateTimeOriginal": DATE}),
+    "jpeg offsets": (_jpeg("offsets.jpg", ifd0={TAG_MAKE: "Cam"},
+                           exif={TAG_DATE_TIME_ORIGINAL: DATE, TAG_OFFSET_TIME_ORIGINAL: "+09:00",
+                                 TAG_OFFSET_TIME: "-02:30"}),
+                     {"EXIF:DateTimeOriginal": DATE, "EXIF:OffsetTimeOriginal": "+09:00",
+                      "EXIF:OffsetTime": "-02:30"}),
+    "jpeg unrelated xmp": (_jpeg("xmp.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_DATE_TIME_ORIGINAL: DATE},
+                                 xmp=b'<x:xmpmeta><rdf:Description xmp:Rating="3"/></x:xmpmeta>'),
+                           {"EXIF:DateTimeOriginal": DATE}),
+    "jpeg photoshop": (_jpeg("photoshop.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_DATE_TIME_ORIGINAL: DATE},
+                             segment=(0xED, b"Photoshop 3.0\0" + b"8BIM" + b"\0" * 12)),
+                       {"EXIF:DateTimeOriginal": DATE}),
+    "mvhd v0": (_movie("v0.mp4", [mvhd(CREATED), TRAK]),
+                {"QuickTime:CreateDate": "2021:01:01 00:00:00"}),
+    "mvhd v1, mdat first": (_movie("v1.mp4", [mvhd(CREATED, version=1), TRAK], mdat_first=True),
+                            {"QuickTime:CreateDate": "2021:01:01 00:00:00"}),
+    "udta itunes atoms": (_movie("itunes.mp4", [mvhd(CREATED), TRAK, box(b"udta", box(
+                              b"meta", b"\0\0\0\0" + box(b"hdlr", b"\0" * 25) + box(b"ilst", box(b"\xa9too", b"x")))
+                              + box(b"\xa9xyz", b"+35+139/"))]),
+                          {"QuickTime:CreateDate": "2021:01:01 00:00:00"}),
+    "quicktime meta": (_movie("keys.mov", [mvhd(CREATED), TRAK, box(b"meta", box(b"hdlr", b"\0" * 25)
+                                                                       + box(b"keys", b"\0" * 8))]),
+                       {"QuickTime:CreateDate": "2021:01:01 00:00:00"}),
+}
+
+FALLBACK = {
+    "jpeg without exif": _jpeg("none.jpg"),
+    "jpeg without date": _jpeg("nodate.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_ISO: 100}),
+    "jpeg date in ifd0 too": _jpeg("ifd0.jpg", ifd0={TAG_DATE_TIME_ORIGINAL: DATE},
+                                   exif={TAG_DATE_TIME_ORIGINAL: DATE}),
+    "jpeg zero date": _jpeg("zero.jpg", ifd0={TAG_MAKE: "Cam"},
+                            exif={TAG_DATE_TIME_ORIGINAL: "0000:00:00 00:00:00"}),
+    "jpeg odd date": _jpeg("odd.jpg", ifd0={TAG_MAKE: "Cam"},
+                           exif={TAG_DATE_TIME_ORIGINAL: "2021:05:06 07:08:0 "}),
+    "jpeg odd offset": _jpeg("oddoffset.jpg", ifd0={TAG_MAKE: "Cam"},
+                             exif={TAG_DATE_TIME_ORIGINAL: DATE, TAG_OFFSET_TIME_ORIGINAL: "+9"}),
+    "jpeg xmp clash": _jpeg("xmpclash.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_DATE_TIME_ORIGINAL: DATE},
+                            xmp=b'<x:xmpmeta><rdf:Description exif:DateTimeOriginal="2020"/></x:xmpmeta>'),
+    "jpeg unknown app segment": _jpeg("app5.jpg", ifd0={TAG_MAKE: "Cam"}, exif={TAG_DATE_TIME_ORIGINAL: DATE},
+                                      segment=(0xE5, b"XYZ\0data")),
+    "mvhd zero": _movie("zero.mp4", [mvhd(0), TRAK]),
+    "mvhd unix time": _movie("unix.mp4", [mvhd(1609459200), TRAK]),
+    "no mvhd": _movie("nomvhd.mp4", [TRAK]),
+    "udta xmp": _movie("xmp.mp4", [mvhd(CREATED), TRAK, box(b"udta", box(b"XMP_", b"<x/>"))]),
+    "top-level uuid": _movie("uuid.mp4", [mvhd(CREATED), TRAK], trailer=box(b"uuid", b"\0" * 20)),
+    "truncated box": _movie("truncated.mp4", [mvhd(CREATED), TRAK], trailer=b"\0\0\0"),
+}
+
+
+@pytest.mark.parametrize("name", ACCEPTED)
+def test_accepted(tmp_path, name):
+    build, expected = ACCEPTED[name]
+    path = build(tmp_path)
+    assert read_date_tags(path) == {"SourceFile": path, **expected}
+
+
+@pytest.mark.parametrize("name", FALLBACK)
+def test_fallback(tmp_path, name):
+    assert read_date_tags(FALLBACK[name](tmp_path)) is None
+
+
+def test_other_files(tmp_path):
+    empty = tmp_path / "empty.jpg"
+    empty.write_bytes(b"")
+    Image.new("RGB", (8, 8)).save(tmp_path / "image.png")
+    assert read_date_tags(str(empty)) is None
+    assert read_date_tags(str(tmp_path / "image.png")) is None
+    assert read_date_tags(str(tmp_path / "missing.jpg")) is None
+
+
+@pytest.fixture(scope="module")
+def exif_handler():
+    exiftool = get_exiftool_path()
+    if not exiftool:
+        pytest.skip("ExifTool not found")
+    handler = ExifHandler(exiftool, pool_size=1, native_dates=False)
+    yield handler
+    handler.close()
+
+
+@pytest.mark.parametrize("name", list(ACCEPTED) + list(FALLBACK))
+def test_matches_exiftool(tmp_path, exif_handler, name):
+    build = ACCEPTED[name][0] if name in ACCEPTED else FALLBACK[name]
+    path = build(tmp_path)
+    native = read_date_tags(path)
+    # The handler reads with native_dates=False, so this is ExifTool's answer.
+    reference = exif_handler.get_metadata(path, use_index=False, profile=DATES) or {}
+    if native is not None:
+        assert {tag: reference.get(tag) for tag in native} == native
+    # Whichever reader answers, Date Taken must come out the same.
+    assert exif_handler.extract_date_info(native or reference) == exif_handler.extract_date_info(reference)
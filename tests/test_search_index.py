@@ -0,0 +1,86 @@
+"""
+The grid filter's query language, answered by SearchIndex over a few
+hand-written ExifTool tag dicts.
+
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.search_index import SearchIndex, extract_search_fields
+
+FILES = {
+    "canon.jpg": ({"IFD0:Make": "Canon", "IFD0:Model": "Canon EOS R5", "Composite:LensID": "RF50mm F1.8 STM",
+                   "ExifIFD:ISO": 800, "ExifIFD:FNumber": 1.8, "ExifIFD:FocalLength": 50.0,
+                   "ExifIFD:ExposureTime": "1/250", "Composite:GPSLatitude": 35.6, "Composite:GPSLongitude": 139.7,
+                   "IPTC:Keywords": ["Tokyo", "Night"]},
+                  "2021:06:03 21:00:00"),
+    "iphone.heic": ({"IFD0:Make": "Apple", "IFD0:Model": "iPhone 12", "ExifIFD:ISO": 32, "ExifIFD:FNumber": 1.6,
+                     "ExifIFD:FocalLength": "4.2 mm", "ExifIFD:ExposureTime": 0.01, "XMP-photoshop:City": "Paris"},
+                    "2022:01:15 10:00:00+01:00"),
+    "scan.png": ({"File:FileType": "PNG"}, None),
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    index = SearchIndex()
+    index.add_many({name: extract_search_fields(name, meta, date) for name, (meta, date) in FILES.items()})
+    return index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", {"canon.jpg", "iphone.heic", "scan.png"}),
+    ("canon", {"canon.jpg"}),
+    ("CANON", {"canon.jpg"}),
+    ("-model:iphone", {"canon.jpg", "scan.png"}),
+    ('lens:"50mm f1.8"', {"canon.jpg"}),
+    ("keywords:tokyo", {"canon.jpg"}),
+    ("place:paris", {"iphone.heic"}),
+    ("name:.png", {"scan.png"}),
+    ("type:png", {"scan.png"}),
+    ("iso:>=800", {"canon.jpg"}),
+    ("iso:800", {"canon.jpg"}),
+    ("iso:<800", {"iphone.heic"}),
+    ("aperture:1.4..1.7", {"iphone.heic"}),
+    ("focal:..50", {"iphone.heic", "canon.jpg"}),
+    ("focal:<50", {"iphone.heic"}),
+    ("exposure:1/250", {"canon.jpg"}),
+    ("date:2021", {"canon.jpg"}),
+    ("date:2021-06-03", {"canon.jpg"}),
+    ("date:2021-07..", {"iphone.heic"}),
+    ("date:>2021", {"iphone.heic"}),
+    ("date:2020..2021-06-02", set()),
+    ("gps:yes", {"canon.jpg"}),
+    ("gps:no", {"iphone.heic", "scan.png"}),
+    ("-gps:yes iso:>=10", {"iphone.heic"}),
+])
+def test_query(index, query, expected):
+    assert index.query(query) == expected
+
+
+@pytest.mark.parametrize("query, message", [
+    ('lens:"50mm', "Bad query"),
+    ("colour:red", "Unknown field 'colour'"),
+    ("gps:maybe", "gps: expects yes or no"),
+    ("iso:lots", "Not a number"),
+    ("date:June", "Not a date"),
+    ("date:2021-13", "Not a date"),
+])
+def test_bad_query(index, query, message):
+    with pytest.raises(ValueError, match=message):
+        index.query(query)
+
+
+def test_readded_file_replaces_its_entry():
+    index = SearchIndex()
+    index.add_many({"a.jpg": extract_search_fields("a.jpg", {"IFD0:Make": "Canon"})})
+    index.add_many({"a.jpg": extract_search_fields("a.jpg", {"IFD0:Make": "Nikon"})})
+    assert index.query("canon") == set()
+    assert index.query("nikon") == {"a.jpg"}
+    index.remove_many(["a.jpg"])
+    assert index.query("") == set() and len(index) == 0
@@ -0,0 +1,135 @@
+"""
+WriteJournal bookkeeping and ExifHandler.rollback, without ExifTool: the
+handler's pool is replaced by one whose "process" keeps each file's tags
+in a dict and applies -json= imports and -TAG= deletions to it.
+
+    python -m pytest tests
+"""
+import os
+import sys
+import json
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.write_journal import WriteJournal
+from src.core.exif_handler import ExifHandler
+
+ORIGINAL = {"ExifIFD:DateTimeOriginal": "2020:01:02 03:04:05", "ExifIFD:OffsetTimeOriginal": "+01:00"}
+SHIFTED = {"ExifIFD:DateTimeOriginal": "2020:01:02 04:04:05", "ExifIFD:OffsetTimeOriginal": "+02:00"}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+def test_recover_interrupted_batch(journal):
+    batch = journal.begin("Shift")
+    journal.record(batch, {"a.jpg": ORIGINAL, "b.jpg": ORIGINAL})
+    # The run dies after writing a.jpg and before b.jpg's outcome is known.
+    journal.mark(batch, {"a.jpg": None})
+    journal.close()
+
+    reopened = WriteJournal(journal.db_path)
+    try:
+        assert reopened.recover() == [batch]
+        assert reopened.batch(batch)["state"] == WriteJournal.INTERRUPTED
+        assert reopened.batch(batch)["files"] == 2
+        # b.jpg may have been written: it is rolled back too.
+        assert reopened.originals(batch) == {"a.jpg": ORIGINAL, "b.jpg": ORIGINAL}
+        assert reopened.recover() == []
+    finally:
+        reopened.close()
+
+
+def test_originals_skip_failed(journal):
+    batch = journal.begin("Set date")
+    journal.record(batch, {"a.jpg": ORIGINAL, "b.jpg": ORIGINAL})
+    journal.record(batch, {"a.jpg": SHIFTED})  # written twice: the first original stays
+    journal.mark(batch, {"a.jpg": None, "b.jpg": "Error writing file"})
+    journal.finish(batch)
+
+    assert journal.originals(batch) == {"a.jpg": ORIGINAL}
+    assert journal.batch(batch)["state"] == WriteJournal.DONE
+    assert journal.batch(batch)["files"] == 1
+
+
+class FakeExifTool:
+    """
+    Answers the journal read (-a -G1 with -json output) and the restore
+    write (-json= file, -TAG= deletions, -@ argument file).
+    """
+
+    def __init__(self, files):
+        self.files = files
+        self.writes = []
+
+    def execute_json(self, *params):
+        return [dict(SourceFile=path, **self.files[path]) for path in params if path in self.files]
+
+    def execute(self, *params):
+        params = list(params)
+        with open(params[params.index("-@") + 1], encoding="utf-8") as f:
+            paths = f.read().splitlines()
+        values = {}
+        for param in params:
+            if param.startswith("-json="):
+                with open(param[len("-json="):], encoding="utf-8") as f:
+                    values = {entry.pop("SourceFile"): entry for entry in json.load(f)}
+        deleted = [param[1:-1] for param in params if param.endswith("=") and param.startswith("-")
+                   and not param.startswith("-json=")]
+        self.writes.append((paths, deleted))
+        for path in paths:
+            for tag in deleted:
+                self.files[path].pop(tag, None)
+            self.files[path].update(values.get(path, {}))
+        return ""
+
+
+class FakePool:
+    timeout = 10.0
+
+    def __init__(self, et):
+        self.et = et
+
+    @contextmanager
+    def session(self, timeout=None):
+        yield self.et
+
+    @contextmanager
+    def expanded(self, size):
+        yield self
+
+    def close(self):
+        pass
+
+
+def test_rollback_restores_values_and_deletes_created_tags(tmp_path, journal):
+    changed, untouched = str(tmp_path / "changed.jpg"), str(tmp_path / "untouched.jpg")
+    for path in (changed, untouched):
+        open(path, "wb").close()
+
+    batch = journal.begin("Set date")
+    journal.record(batch, {changed: ORIGINAL, untouched: ORIGINAL})
+    journal.mark(batch, {changed: None, untouched: None})
+    journal.finish(batch)
+
+    # The write changed both values of `changed` and added an XMP date it
+    # did not have; `untouched` still holds its originals.
+    et = FakeExifTool({
+        changed: dict(SHIFTED, **{"XMP-exif:DateTimeOriginal": "2020:01:02 04:04:05"}),
+        untouched: dict(ORIGINAL),
+    })
+    handler = ExifHandler(journal=journal, native_dates=False)
+    handler.pool = FakePool(et)
+
+    assert handler.rollback(batch) == {changed: None, untouched: None}
+    assert et.files == {changed: ORIGINAL, untouched: ORIGINAL}
+    assert et.writes == [([changed], ["XMP-exif:DateTimeOriginal"])]
+    assert journal.batch(batch)["state"] == WriteJournal.ROLLED_BACK
+    assert journal.originals(batch) == {}